@@ -2,3 +2,4 @@ from .client import *
 from .constants import *
 from .endpoints import *
 from .models import *
+from .response_cache import *
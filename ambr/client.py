@@ -1,13 +1,19 @@
+import asyncio
+import hashlib
 import json
 import os
-from typing import Dict, List, Optional
+import shutil
+import tempfile
+from typing import Dict, List, Optional, Tuple
 
+import aiofiles
 import aiohttp
 
 import ambr.models as models
 
 from .constants import EVENTS_URL, LANGS, WEEKDAYS
 from .endpoints import BASE, ENDPOINTS, STATIC_ENDPOINTS
+from .response_cache import detail_cache
 
 
 def get_decorator(func):
@@ -20,6 +26,19 @@ def get_decorator(func):
     return wrapper
 
 
+CACHE_DIR = "ambr/cache"
+MANIFEST_PATH = f"{CACHE_DIR}/manifest.json"
+
+_update_lock = asyncio.Lock()
+"""Held while the cache files are updated, so updates don't overwrite each other's files"""
+
+_memory_cache: Dict[str, Dict[str, Dict]] = {}
+"""Parsed cache files shared by every client, keyed by language or "static"
+
+Models are built from copies of the entries, the cache itself must not be modified.
+"""
+
+
 class AmbrTopAPI:
     def __init__(self, session: aiohttp.ClientSession, lang: str = "en"):
         self.session = session
@@ -28,26 +47,23 @@ class AmbrTopAPI:
             raise ValueError(
                 f"Invalid language: {self.lang}, valid values are: {LANGS.keys()}"
             )
-        self.cache = self.load_cache()
 
-    def load_cache(self) -> Dict:
-        """Load cache from files.
+    def load_cache(self, static: bool = False) -> Dict[str, Dict]:
+        """Load the cache of the client's language from files.
+
+        Args:
+            static (bool, optional): Load the cache of static endpoints instead. Defaults to False.
 
         Returns:
-            Dict: Cache.
+            Dict[str, Dict]: Endpoint name to endpoint data.
         """
-        cache = {}
-        for lang in list(LANGS.keys()):
-            if lang not in cache:
-                cache[lang] = {}
-            for endpoint in list(ENDPOINTS.keys()):
-                cache[lang][endpoint] = self.request_from_cache(endpoint)
-        for static_endpoint in list(STATIC_ENDPOINTS.keys()):
-            cache[static_endpoint] = self.request_from_cache(
-                static_endpoint, static=True
-            )
+        endpoints = STATIC_ENDPOINTS if static else ENDPOINTS
+        return {e: self.request_from_cache(e, static=static) for e in endpoints}
 
-        return cache
+    @staticmethod
+    def reload_cache() -> None:
+        """Drop the cache loaded in memory so clients read the updated files."""
+        _memory_cache.clear()
 
     def get_cache(self, endpoint: str, static: bool = False) -> Dict:
         """Get the cache of an endpoint.
@@ -59,9 +75,10 @@ class AmbrTopAPI:
         Returns:
             Dict: The cache of the endpoint.
         """
-        if static:
-            return self.cache[endpoint]
-        return self.cache[self.lang][endpoint]
+        key = "static" if static else self.lang
+        if key not in _memory_cache:
+            _memory_cache[key] = self.load_cache(static=static)
+        return _memory_cache[key][endpoint]
 
     async def request_from_endpoint(
         self,
@@ -91,6 +108,7 @@ class AmbrTopAPI:
             endpoint_url = f"{BASE}{lang}/{ENDPOINTS.get(endpoint)}"
             if id:
                 endpoint_url += f"/{id}"
+                return await detail_cache.get(self.session, endpoint_url)
         async with self.session.get(endpoint_url) as r:
             endpoint_data = await r.json()
         if "code" in endpoint_data:
@@ -110,7 +128,7 @@ class AmbrTopAPI:
         if static:
             try:
                 with open(
-                    f"ambr/cache/static/{STATIC_ENDPOINTS.get(endpoint)}.json",
+                    f"{CACHE_DIR}/static/{STATIC_ENDPOINTS.get(endpoint)}.json",
                     "r",
                     encoding="utf-8",
                 ) as f:
@@ -120,7 +138,7 @@ class AmbrTopAPI:
         else:
             try:
                 with open(
-                    f"ambr/cache/{self.lang}/{ENDPOINTS.get(endpoint)}.json",
+                    f"{CACHE_DIR}/{self.lang}/{ENDPOINTS.get(endpoint)}.json",
                     "r",
                     encoding="utf-8",
                 ) as f:
@@ -135,13 +153,21 @@ class AmbrTopAPI:
         all_lang: bool = False,
         endpoint: str = "",
         static: bool = False,
+        max_concurrency: int = 8,
     ) -> None:
         """Update the cache of the API by sending requests to the API through an aiohttp session.
 
+        Endpoints are downloaded concurrently and only changed ones are written. The new files
+        are staged in a directory of their own and only moved into place once every download
+        succeeded, so a failed update leaves the cache untouched. Each file is replaced
+        atomically, but readers may see some files updated before others while they are moved.
+        Updates run one at a time and reload the in-memory cache when they are done.
+
         Args:
             all_lang (bool, optional): To update the cache of all languages. Defaults to False.
             endpoint (Optional[str], optional): To update a specific endpoint. Defaults to None.
             static (bool, optional): To update static endpoints. Defaults to False.
+            max_concurrency (int, optional): Maximum number of concurrent requests. Defaults to 8.
         """
         if all_lang:
             langs = list(LANGS.keys())
@@ -155,28 +181,101 @@ class AmbrTopAPI:
         else:
             endpoints = [endpoint]
 
+        targets: List[Tuple[str, str]] = []
         if static:
             for e in endpoints:
-                data = await self.request_from_endpoint(e, static=True)
-                with open(
-                    f"ambr/cache/static/{STATIC_ENDPOINTS.get(e)}.json",
-                    "w+",
-                    encoding="utf-8",
-                ) as f:
-                    json.dump(data, f, ensure_ascii=False, indent=4)
+                targets.append(
+                    (
+                        f"{BASE}static/{STATIC_ENDPOINTS.get(e)}",
+                        f"{CACHE_DIR}/static/{STATIC_ENDPOINTS.get(e)}.json",
+                    )
+                )
         else:
             for lang in langs:
                 for e in endpoints:
-                    data = await self.request_from_endpoint(e, lang)
-                    path = f"ambr/cache/{lang}"
-                    if not os.path.exists(path):
-                        os.makedirs(path)
-                    with open(
-                        f"ambr/cache/{lang}/{ENDPOINTS.get(e)}.json",
-                        "w+",
-                        encoding="utf-8",
-                    ) as f:
-                        json.dump(data, f, ensure_ascii=False, indent=4)
+                    targets.append(
+                        (
+                            f"{BASE}{lang}/{ENDPOINTS.get(e)}",
+                            f"{CACHE_DIR}/{lang}/{ENDPOINTS.get(e)}.json",
+                        )
+                    )
+
+        async with _update_lock:
+            manifest = self._read_manifest()
+            semaphore = asyncio.Semaphore(max_concurrency)
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            staging_dir = tempfile.mkdtemp(prefix=".staging-", dir=CACHE_DIR)
+            try:
+                results = await asyncio.gather(
+                    *(
+                        self._download_to_staging(
+                            url, path, manifest, semaphore, staging_dir
+                        )
+                        for url, path in targets
+                    )
+                )
+                changed = [r for r in results if r is not None]
+                for staged, path in changed:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    os.replace(staged, path)
+            finally:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+
+            with open(f"{MANIFEST_PATH}.tmp", "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            os.replace(f"{MANIFEST_PATH}.tmp", MANIFEST_PATH)
+
+            if changed:
+                self.reload_cache()
+
+    async def _download_to_staging(
+        self,
+        url: str,
+        path: str,
+        manifest: Dict[str, Dict[str, Optional[str]]],
+        semaphore: asyncio.Semaphore,
+        staging_dir: str,
+    ) -> Optional[Tuple[str, str]]:
+        """Download an endpoint into the staging directory of the update.
+
+        Returns:
+            Optional[Tuple[str, str]]: The staged file and its destination, None if the endpoint did not change.
+        """
+        entry = manifest.get(path, {})
+        exists = os.path.exists(path)
+        headers = {}
+        if exists and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]  # type: ignore
+
+        async with semaphore:
+            async with self.session.get(url, headers=headers) as r:
+                if r.status == 304:
+                    return None
+                body = await r.read()
+                etag = r.headers.get("ETag")
+
+        data = json.loads(body)
+        if "code" in data:
+            raise ValueError(f"Invalid endpoint | URL = {url}")
+
+        digest = hashlib.sha256(body).hexdigest()
+        manifest[path] = {"hash": digest, "etag": etag}
+        if exists and entry.get("hash") == digest:
+            return None
+
+        staged = f"{staging_dir}/{os.path.relpath(path, CACHE_DIR)}"
+        os.makedirs(os.path.dirname(staged), exist_ok=True)
+        async with aiofiles.open(staged, "w", encoding="utf-8") as f:
+            await f.write(json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+        return staged, path
+
+    @staticmethod
+    def _read_manifest() -> Dict[str, Dict[str, Optional[str]]]:
+        try:
+            with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
 
     async def get_character_detail(self, id: str) -> Optional[models.CharacterDetail]:
         """Get the detail of a character.
@@ -518,19 +617,31 @@ class AmbrTopAPI:
         data = self.get_cache("upgrade", static=True)
         if character_id is not None:
             upgrade_info = data["data"]["avatar"][character_id]
-            upgrade_info["character_id"] = character_id
-            upgrade_info["item_list"] = [
+            item_list = [
                 (await self.get_material(id=int(material_id)))
                 for material_id in upgrade_info["items"]
             ]
-            return models.CharacterUpgrade(**upgrade_info)
+            return models.CharacterUpgrade(
+                **{
+                    **upgrade_info,
+                    "character_id": character_id,
+                    "item_list": item_list,
+                }
+            )
         for upgrade_id, upgrade_info in data["data"]["avatar"].items():
-            upgrade_info["item_list"] = [
+            item_list = [
                 (await self.get_material(id=int(material_id)))
                 for material_id in upgrade_info["items"]
             ]
-            upgrade_info["character_id"] = upgrade_id
-            result.append(models.CharacterUpgrade(**upgrade_info))
+            result.append(
+                models.CharacterUpgrade(
+                    **{
+                        **upgrade_info,
+                        "character_id": upgrade_id,
+                        "item_list": item_list,
+                    }
+                )
+            )
 
         return result
 
@@ -549,20 +660,24 @@ class AmbrTopAPI:
         data = self.get_cache("upgrade", static=True)
         if weapon_id is not None:
             upgrade_info = data["data"]["weapon"][str(weapon_id)]
-            upgrade_info["weapon_id"] = weapon_id
-            upgrade_info["item_list"] = [
+            item_list = [
                 (await self.get_material(id=int(material_id)))
                 for material_id in upgrade_info["items"]
             ]
-            return models.WeaponUpgrade(**upgrade_info)
+            return models.WeaponUpgrade(
+                **{**upgrade_info, "weapon_id": weapon_id, "item_list": item_list}
+            )
         result = []
         for upgrade_id, upgrade_info in data["data"]["weapon"].items():
-            upgrade_info["weapon_id"] = upgrade_id
-            upgrade_info["item_list"] = [
+            item_list = [
                 (await self.get_material(id=int(material_id)))
                 for material_id in upgrade_info["items"]
             ]
-            result.append(models.WeaponUpgrade(**upgrade_info))
+            result.append(
+                models.WeaponUpgrade(
+                    **{**upgrade_info, "weapon_id": upgrade_id, "item_list": item_list}
+                )
+            )
 
         return result
 
@@ -586,10 +701,16 @@ class AmbrTopAPI:
                         continue
                     rewards.append(material)
 
-                domain_info["city"] = city
-                domain_info["weekday"] = weekday_int
-                domain_info["reward"] = rewards
-                result.append(models.Domain(**domain_info))
+                result.append(
+                    models.Domain(
+                        **{
+                            **domain_info,
+                            "city": city,
+                            "weekday": weekday_int,
+                            "reward": rewards,
+                        }
+                    )
+                )
 
         return result
 
@@ -607,10 +728,9 @@ class AmbrTopAPI:
         return result
 
     async def get_book_story(self, story_id: str) -> str:
-        async with self.session.get(
-            f"https://api.ambr.top/v2/{self.lang}/readable/models.Book{story_id}"
-        ) as resp:
-            story = await resp.json()
+        story = await detail_cache.get(
+            self.session, f"{BASE}{self.lang}/readable/models.Book{story_id}"
+        )
         return story["data"]
 
     async def get_weapon_curve(self, curve_type: str, level: int) -> float:
@@ -359,6 +359,8 @@ class CharacterTalentUpgrade(BaseModel):
         alias="costItems", default=None
     )
     mora_cost: Optional[int] = Field(alias="coinCost", default=None)
+    descriptions: List[str] = Field(alias="description", default=[])
+    params: List[float] = []
 
     @validator("cost_items", pre=True, allow_reuse=True)
     def get_cost_items(cls, v):
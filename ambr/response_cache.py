@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+import re
+import time
+from typing import Any, Dict, Optional
+
+import aiofiles
+import aiohttp
+import cachetools
+
+from .endpoints import BASE
+
+DETAIL_CACHE_DIR = "ambr/cache/detail"
+
+
+class DetailCache:
+    """Cache of ambr.top detail responses.
+
+    Responses are kept in an in-memory LRU cache in front of JSON files in ``ambr/cache/detail``.
+    An entry older than ``ttl`` seconds, or fetched before the last :meth:`invalidate`,
+    is revalidated with its ETag, and concurrent lookups of the same URL share one request.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3 * 24 * 60 * 60) -> None:
+        self.ttl = ttl
+        self._memory: cachetools.LRUCache = cachetools.LRUCache(maxsize=maxsize)
+        self._requests: Dict[str, asyncio.Task] = {}
+        self._stale_before = self._read_stale_before()
+
+    async def get(self, session: aiohttp.ClientSession, url: str) -> Dict[str, Any]:
+        """Get the response of a detail endpoint.
+
+        Args:
+            session (aiohttp.ClientSession): The session to request with.
+            url (str): URL of the endpoint.
+
+        Raises:
+            ValueError: If the endpoint returns an error.
+
+        Returns:
+            Dict[str, Any]: The response data.
+        """
+        entry = self._memory.get(url)
+        if entry is not None and self._is_fresh(entry):
+            return entry["data"]
+
+        task = self._requests.get(url)
+        if task is None:
+            task = asyncio.create_task(self._load(session, url, entry))
+            self._requests[url] = task
+            task.add_done_callback(lambda _: self._requests.pop(url, None))
+        return await asyncio.shield(task)
+
+    def invalidate(self) -> None:
+        """Mark every cached response as stale, called after the ambr cache is updated."""
+        self._memory.clear()
+        self._stale_before = time.time()
+        os.makedirs(DETAIL_CACHE_DIR, exist_ok=True)
+        with open(f"{DETAIL_CACHE_DIR}/stale_before", "w", encoding="utf-8") as f:
+            f.write(str(self._stale_before))
+
+    async def _load(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        entry: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        path = self._get_path(url)
+        if entry is None:
+            entry = await self._read(path)
+            if entry is not None and self._is_fresh(entry):
+                self._memory[url] = entry
+                return entry["data"]
+
+        headers = {}
+        if entry is not None and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+
+        async with session.get(url, headers=headers) as r:
+            if r.status == 304 and entry is not None:
+                entry["fetched_at"] = time.time()
+            else:
+                data = await r.json()
+                if "code" in data:
+                    raise ValueError(f"Invalid endpoint | URL = {url}")
+                entry = {
+                    "etag": r.headers.get("ETag"),
+                    "fetched_at": time.time(),
+                    "data": data,
+                }
+
+        self._memory[url] = entry
+        await self._write(path, entry)
+        return entry["data"]
+
+    def _is_fresh(self, entry: Dict[str, Any]) -> bool:
+        fetched_at = entry["fetched_at"]
+        return fetched_at > self._stale_before and time.time() - fetched_at < self.ttl
+
+    @staticmethod
+    def _get_path(url: str) -> str:
+        name = re.sub(r"[^\w/-]", "_", url.removeprefix(BASE))
+        return f"{DETAIL_CACHE_DIR}/{name}.json"
+
+    @staticmethod
+    async def _read(path: str) -> Optional[Dict[str, Any]]:
+        try:
+            async with aiofiles.open(path, "r", encoding="utf-8") as f:
+                return json.loads(await f.read())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    async def _write(path: str, entry: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp = f"{path}.tmp"
+        async with aiofiles.open(temp, "w", encoding="utf-8") as f:
+            await f.write(json.dumps(entry, ensure_ascii=False))
+        os.replace(temp, path)
+
+    @staticmethod
+    def _read_stale_before() -> float:
+        try:
+            with open(f"{DETAIL_CACHE_DIR}/stale_before", "r", encoding="utf-8") as f:
+                return float(f.read())
+        except (FileNotFoundError, ValueError):
+            return 0.0
+
+
+detail_cache = DetailCache()
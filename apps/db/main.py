@@ -9,7 +9,7 @@ class Leaderboard:
     def __init__(self, pool: asyncpg.Pool):
         self.abyss_character = tables.AbyssCharaBoard(pool)
         """Abyss character usage leaderboard"""
-        self.abyss = tables.AbyssBoard(pool)
+        self.abyss = tables.AbyssBoard(pool, self.abyss_character)
         """Abyss leaderboard"""
 
 
@@ -51,11 +51,24 @@ class Database:
         """Hoyoverse accounts"""
         self.wish = tables.WishHistoryTable(pool)
         """Wish history"""
+        self.checkin_jobs = tables.CheckinJobTable(pool)
+        """Daily check-in jobs"""
+        self.talents = tables.TalentTable(pool)
+        """Character talent levels"""
+        self.pc_icons = tables.PCIconTable(pool)
+        """Lineup simulator character icons"""
 
     async def create(self):
+        await self.settings.create()
         await self.notifs.resin.alter()
         await self.notifs.pot.alter()
         await self.notifs.pt.alter()
         await self.notifs.talent.alter()
         await self.notifs.weapon.alter()
         await self.notifs.exped.create()
+        await self.checkin_jobs.create()
+        # the usage table has to exist before the abyss board cleans up its entries
+        await self.leaderboard.abyss_character.create()
+        await self.leaderboard.abyss.create()
+        await self.talents.create()
+        await self.pc_icons.create()
@@ -1,10 +1,14 @@
 from .abyss_board import *
 from .abyss_chara_board import *
+from .checkin_jobs import *
+from .client_pool import *
 from .cookies import *
 from .genshin_codes import *
 from .hoyo_account import *
 from .notes_notif import *
+from .pc_icons import *
 from .redeemed_codes import *
 from .talent_notif import *
+from .talents import *
 from .user_settings import *
 from .wish_history import *
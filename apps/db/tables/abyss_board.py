@@ -1,10 +1,12 @@
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 
 from asyncpg import Pool
 from pydantic import BaseModel, Field
 
 from dev.enum import Category
 
+from .abyss_chara_board import AbyssCharaBoard
+
 
 class SingleStrikeCharacter(BaseModel):
     constellation: int = Field(alias="const")
@@ -57,57 +59,162 @@ class AbyssBoardEntry(BaseModel):
     """Character used for single strike"""
 
 
+class RankedAbyssBoardEntry(BaseModel):
+    """Abyss leaderboard entry with its rank"""
+
+    rank: int
+    entry: AbyssBoardEntry
+
+
+class AbyssBoardPage(BaseModel):
+    """The part of an abyss leaderboard that is drawn"""
+
+    entries: List[RankedAbyssBoardEntry]
+    """The top entries, followed by the entries around the user if they are not in the top"""
+    total: int
+    """Number of users on the leaderboard"""
+
+
 class AbyssBoard:
-    def __init__(self, pool: Pool):
+    def __init__(self, pool: Pool, chara_board: AbyssCharaBoard):
         self.pool = pool
+        self.chara_board = chara_board
+        """Entries are deleted from the character usage leaderboard together"""
+
+    async def create(self) -> None:
+        await self.pool.execute(
+            """
+            CREATE INDEX IF NOT EXISTS abyss_leaderboard_single_strike_idx
+            ON abyss_leaderboard (season, single_strike DESC)
+            """
+        )
+        await self.pool.execute(
+            """
+            CREATE INDEX IF NOT EXISTS abyss_leaderboard_full_clear_idx
+            ON abyss_leaderboard (season, stars_collected, runs)
+            """
+        )
+        # entries without runs are left over from failed updates
+        async with self.pool.acquire() as conn, conn.transaction():
+            rows = await conn.fetch(
+                "DELETE FROM abyss_leaderboard WHERE runs = 0 RETURNING uid, season"
+            )
+            await self.chara_board.delete(
+                [row["uid"] for row in rows], [row["season"] for row in rows], conn
+            )
+
+    async def update(self, rows: List[Tuple[Any, ...]]) -> None:
+        """
+        Insert or update abyss leaderboard entries, the runs and wins of a full clear are kept
+
+        Args:
+            rows (List[Tuple[Any, ...]]): Values of the entries in the order of the insert's columns
+        """
+        await self.pool.executemany(
+            """
+            INSERT INTO abyss_leaderboard
+                (single_strike, floor, stars_collected, uid,
+                user_name, user_id, season, runs, wins, icon_url,
+                level, const, refine, c_level, c_icon)
+            VALUES
+                ($1, $2, $3, $4, $5, $6, $7, $8,
+                $9, $10, $11, $12, $13, $14, $15)
+            ON CONFLICT
+                (uid, season)
+            DO UPDATE SET
+                single_strike = $1, floor = $2,
+                stars_collected = $3, user_name = $5,
+                user_id = $6, icon_url = $10, level = $11,
+                const = $12, refine = $13, c_level = $14, c_icon = $15,
+                runs = CASE WHEN abyss_leaderboard.stars_collected = 36
+                    THEN abyss_leaderboard.runs ELSE $8 END,
+                wins = CASE WHEN abyss_leaderboard.stars_collected = 36
+                    THEN abyss_leaderboard.wins ELSE $9 END
+            """,
+            rows,
+        )
 
     async def delete(self, uid: int, season: int) -> None:
         """
-        Delete abyss leaderboard entry
+        Delete abyss leaderboard entry and its character usage entry
 
         Args:
             uid (int): Genshin Impact UID
             season (int): Abyss season
         """
-        await self.pool.execute(
-            "DELETE FROM abyss_leaderboard WHERE uid = $1 AND season = $2",
-            uid,
-            season,
-        )
-
-    async def get_all(
-        self, category: Category, season: Optional[int] = None
-    ) -> List[AbyssBoardEntry]:
+        async with self.pool.acquire() as conn, conn.transaction():
+            await conn.execute(
+                "DELETE FROM abyss_leaderboard WHERE uid = $1 AND season = $2",
+                uid,
+                season,
+            )
+            await self.chara_board.delete([uid], [season], conn)
+
+    async def get_board(
+        self,
+        category: Category,
+        uid: int,
+        season: Optional[int] = None,
+        user_ids: Optional[List[int]] = None,
+        limit: int = 10,
+    ) -> AbyssBoardPage:
         """
-        Get abyss leaderboard entries
+        Get the top of an abyss leaderboard and the entries around a user
+
+        Users are ranked by their best entry, so a user appears once even when
+        all seasons are ranked together.
 
         Args:
             category (Category): Abyss category
-            season (int): Abyss season
+            uid (int): Genshin Impact UID of the user
+            season (Optional[int]): Abyss season, None for all seasons
+            user_ids (Optional[List[int]]): Only rank these Discord users, used for server leaderboards
+            limit (int): Number of top entries
 
         Returns:
-            List[AbyssBoardEntry]: List of abyss leaderboard entries
+            AbyssBoardPage: The ranked entries and the number of users on the leaderboard
         """
         order = (
-            "single_strike DESC" if category == Category.SINGLE_STRIKE else "runs ASC"
+            "single_strike DESC" if category is Category.SINGLE_STRIKE else "runs ASC"
         )
-        if season is None:
-            if category is Category.FULL_CLEAR:
-                query = f"SELECT * FROM abyss_leaderboard WHERE stars_collected = 36 ORDER BY {order}"
-            else:
-                query = f"SELECT * FROM abyss_leaderboard ORDER BY {order}"
-            return [AbyssBoardEntry(**i) for i in await self.pool.fetch(query)]
-
+        conditions = ["runs > 0"]
+        args: List[Any] = [limit, uid]
         if category is Category.FULL_CLEAR:
-            query = f"SELECT * FROM abyss_leaderboard WHERE stars_collected = 36 AND season = $1 ORDER BY {order}"
-        else:
-            query = (
-                f"SELECT * FROM abyss_leaderboard ORDER BY {order} WHERE season = $1 "
+            conditions.append("stars_collected = 36")
+        if season is not None:
+            args.append(season)
+            conditions.append(f"season = ${len(args)}")
+        if user_ids is not None:
+            args.append(user_ids)
+            conditions.append(f"user_id = ANY(${len(args)}::bigint[])")
+
+        query = f"""
+            WITH best AS (
+                SELECT DISTINCT ON (uid) *
+                FROM abyss_leaderboard
+                WHERE {" AND ".join(conditions)}
+                ORDER BY uid, {order}
+            ),
+            ranked AS (
+                SELECT *,
+                    ROW_NUMBER() OVER (ORDER BY {order}, uid) AS rank,
+                    COUNT(*) OVER () AS total
+                FROM best
+            ),
+            current AS (
+                SELECT rank FROM ranked WHERE uid = $2
             )
-        return [
-            AbyssBoardEntry(**i)
-            for i in await self.pool.fetch(
-                query,
-                season,
-            )
-        ]
+            SELECT * FROM ranked
+            WHERE rank <= $1
+                OR rank BETWEEN (SELECT rank FROM current) - 1
+                AND (SELECT rank FROM current) + 1
+            ORDER BY rank
+        """
+        rows = await self.pool.fetch(query, *args)
+        return AbyssBoardPage(
+            entries=[
+                RankedAbyssBoardEntry(rank=row["rank"], entry=AbyssBoardEntry(**row))
+                for row in rows
+            ],
+            total=rows[0]["total"] if rows else 0,
+        )
@@ -1,6 +1,7 @@
 import typing
+from collections import Counter
 
-from asyncpg import Pool
+from asyncpg import Connection, Pool
 from pydantic import BaseModel, Field
 
 
@@ -18,26 +19,332 @@ class AbyssCharaBoardEntry(BaseModel):
     """Discord user ID"""
 
 
+class AbyssTeam(BaseModel):
+    """A team used in a floor 12 chamber"""
+
+    chamber: int
+    """Chamber number"""
+    half: int
+    """1 for the first half, 2 for the second half"""
+    characters: typing.List[int]
+    """Sorted character IDs"""
+
+
+class AbyssTeamsEntry(BaseModel):
+    """A user's floor 12 teams of an abyss season"""
+
+    uid: int
+    """Genshin Impact UID"""
+    user_id: int
+    """Discord user ID"""
+    season: int
+    """Abyss season"""
+    teams: typing.List[AbyssTeam]
+    """Teams used in floor 12"""
+
+    @property
+    def characters(self) -> typing.List[int]:
+        """Character IDs of every team"""
+        return [c for team in self.teams for c in team.characters]
+
+
+class CharacterUsage(BaseModel):
+    """Number of times a character is used"""
+
+    character_id: int
+    uses: int
+
+
+class TeamUsage(BaseModel):
+    """Number of times a team is used"""
+
+    characters: typing.List[int]
+    """Sorted character IDs"""
+    uses: int
+
+
+class AbyssCharaUsage(BaseModel):
+    """Aggregated character usage of an abyss season"""
+
+    characters: typing.List[CharacterUsage]
+    """Character usages, most used first"""
+    players: int
+    """Number of users the usage is counted from"""
+
+
 class AbyssCharaBoard:
-    """Abyss character usage leaderboard"""
+    """Abyss character usage leaderboard
+
+    The number of times each character is used per season is kept in
+    ``abyss_character_usage``, which is updated together with the leaderboard
+    entries, so the global usage board is read without scanning every entry.
+    """
 
     def __init__(self, pool: Pool):
         self.pool = pool
 
-    async def get_all(
-        self, season: typing.Optional[int] = None
-    ) -> typing.List[AbyssCharaBoardEntry]:
-        """Get abyss character usage leaderboard entries"""
-        if season is None:
-            return [
-                AbyssCharaBoardEntry(**i)
-                for i in await self.pool.fetch(
-                    "SELECT * FROM abyss_character_leaderboard"
-                )
-            ]
-        return [
-            AbyssCharaBoardEntry(**i)
-            for i in await self.pool.fetch(
-                "SELECT * FROM abyss_character_leaderboard WHERE season = $1", season
-            )
-        ]
+    async def create(self) -> None:
+        await self.pool.execute(
+            """
+            CREATE INDEX IF NOT EXISTS abyss_character_leaderboard_season_idx
+            ON abyss_character_leaderboard (season)
+            """
+        )
+        await self.pool.execute(
+            """
+            CREATE TABLE IF NOT EXISTS abyss_team_leaderboard (
+                uid bigint NOT NULL,
+                season integer NOT NULL,
+                chamber integer NOT NULL,
+                half integer NOT NULL,
+                characters integer[] NOT NULL,
+                user_id bigint NOT NULL,
+                PRIMARY KEY (uid, season, chamber, half)
+            )
+            """
+        )
+        await self.pool.execute(
+            """
+            CREATE INDEX IF NOT EXISTS abyss_team_leaderboard_season_idx
+            ON abyss_team_leaderboard (season, chamber)
+            """
+        )
+        await self.pool.execute(
+            """
+            CREATE TABLE IF NOT EXISTS abyss_character_usage (
+                season integer NOT NULL,
+                character_id integer NOT NULL,
+                uses integer NOT NULL,
+                PRIMARY KEY (season, character_id)
+            )
+            """
+        )
+        # build the usage table from the existing entries the first time
+        await self.pool.execute(
+            """
+            INSERT INTO abyss_character_usage (season, character_id, uses)
+            SELECT season, character_id, COUNT(*)
+            FROM abyss_character_leaderboard, unnest(characters) AS character_id
+            WHERE NOT EXISTS (SELECT 1 FROM abyss_character_usage)
+            GROUP BY season, character_id
+            """
+        )
+
+    async def update(self, entries: typing.List[AbyssTeamsEntry]) -> None:
+        """Insert or update users' floor 12 teams and the character usage of their seasons
+
+        Args:
+            entries (List[AbyssTeamsEntry]): The entries to write, written in one transaction
+        """
+        latest = {(e.uid, e.season): e for e in entries}
+        if not latest:
+            return
+        entries = list(latest.values())
+
+        async with self.pool.acquire() as conn, conn.transaction():
+            previous = await conn.fetch(
+                """
+                SELECT l.season, l.characters
+                FROM abyss_character_leaderboard AS l
+                JOIN unnest($1::bigint[], $2::integer[]) AS k (uid, season)
+                ON l.uid = k.uid AND l.season = k.season
+                FOR UPDATE OF l
+                """,
+                [e.uid for e in entries],
+                [e.season for e in entries],
+            )
+            await conn.executemany(
+                """
+                INSERT INTO abyss_character_leaderboard
+                    (uid, characters, user_id, season)
+                VALUES
+                    ($1, $2, $3, $4)
+                ON CONFLICT
+                    (uid, season)
+                DO UPDATE SET
+                    characters = $2, user_id = $3
+                """,
+                [(e.uid, e.characters, e.user_id, e.season) for e in entries],
+            )
+
+            diff: typing.Counter[typing.Tuple[int, int]] = Counter()
+            for e in entries:
+                diff.update((e.season, c) for c in e.characters)
+            for row in previous:
+                diff.subtract((row["season"], c) for c in row["characters"] or [])
+            await conn.executemany(
+                """
+                INSERT INTO abyss_character_usage (season, character_id, uses)
+                VALUES ($1, $2, $3)
+                ON CONFLICT (season, character_id)
+                DO UPDATE SET uses = abyss_character_usage.uses + EXCLUDED.uses
+                """,
+                [(season, c, uses) for (season, c), uses in diff.items() if uses != 0],
+            )
+
+            await conn.execute(
+                """
+                DELETE FROM abyss_team_leaderboard AS t
+                USING unnest($1::bigint[], $2::integer[]) AS k (uid, season)
+                WHERE t.uid = k.uid AND t.season = k.season
+                """,
+                [e.uid for e in entries],
+                [e.season for e in entries],
+            )
+            await conn.executemany(
+                """
+                INSERT INTO abyss_team_leaderboard
+                    (uid, season, chamber, half, characters, user_id)
+                VALUES
+                    ($1, $2, $3, $4, $5, $6)
+                """,
+                [
+                    (e.uid, e.season, t.chamber, t.half, t.characters, e.user_id)
+                    for e in entries
+                    for t in e.teams
+                ],
+            )
+
+    async def delete(
+        self,
+        uids: typing.List[int],
+        seasons: typing.List[int],
+        conn: typing.Optional[Connection] = None,
+    ) -> None:
+        """Delete users' entries and teams of seasons and remove them from the character usage
+
+        Args:
+            uids (List[int]): Genshin Impact UIDs
+            seasons (List[int]): Abyss season of each UID
+            conn (Optional[Connection]): Connection of the caller's transaction
+        """
+        if not uids:
+            return
+        if conn is None:
+            async with self.pool.acquire() as conn, conn.transaction():
+                return await self.delete(uids, seasons, conn)
+
+        await conn.execute(
+            """
+            WITH removed AS (
+                DELETE FROM abyss_character_leaderboard AS l
+                USING unnest($1::bigint[], $2::integer[]) AS k (uid, season)
+                WHERE l.uid = k.uid AND l.season = k.season
+                RETURNING l.season, l.characters
+            ), counts AS (
+                SELECT season, character_id, COUNT(*) AS uses
+                FROM removed, unnest(characters) AS character_id
+                GROUP BY season, character_id
+            )
+            UPDATE abyss_character_usage AS u
+            SET uses = u.uses - counts.uses
+            FROM counts
+            WHERE u.season = counts.season AND u.character_id = counts.character_id
+            """,
+            uids,
+            seasons,
+        )
+        await conn.execute(
+            """
+            DELETE FROM abyss_team_leaderboard AS t
+            USING unnest($1::bigint[], $2::integer[]) AS k (uid, season)
+            WHERE t.uid = k.uid AND t.season = k.season
+            """,
+            uids,
+            seasons,
+        )
+
+    async def get_usage(
+        self,
+        season: typing.Optional[int] = None,
+        user_ids: typing.Optional[typing.List[int]] = None,
+    ) -> AbyssCharaUsage:
+        """Get the character usage of a season
+
+        Args:
+            season (Optional[int]): Abyss season, None for all seasons
+            user_ids (Optional[List[int]]): Only count the entries of these Discord users
+        """
+        conditions, args = self._get_conditions(season, user_ids)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        if user_ids is None:
+            # the usage table has no user IDs, server boards are counted from the entries
+            usage_where = "WHERE season = $1" if season is not None else ""
+            rows = await self.pool.fetch(
+                f"""
+                SELECT character_id, SUM(uses) AS uses
+                FROM abyss_character_usage
+                {usage_where}
+                GROUP BY character_id
+                HAVING SUM(uses) > 0
+                ORDER BY uses DESC
+                """,
+                *args,
+            )
+        else:
+            rows = await self.pool.fetch(
+                f"""
+                SELECT character_id, COUNT(*) AS uses
+                FROM abyss_character_leaderboard, unnest(characters) AS character_id
+                {where}
+                GROUP BY character_id
+                ORDER BY uses DESC
+                """,
+                *args,
+            )
+        players = await self.pool.fetchval(
+            f"SELECT COUNT(*) FROM abyss_character_leaderboard {where}", *args
+        )
+        return AbyssCharaUsage(
+            characters=[CharacterUsage(**row) for row in rows], players=players
+        )
+
+    async def get_teams(
+        self,
+        season: typing.Optional[int] = None,
+        chamber: typing.Optional[int] = None,
+        user_ids: typing.Optional[typing.List[int]] = None,
+        limit: int = 10,
+    ) -> typing.List[TeamUsage]:
+        """Get the most used floor 12 teams
+
+        Args:
+            season (Optional[int]): Abyss season, None for all seasons
+            chamber (Optional[int]): Floor 12 chamber, None for every chamber
+            user_ids (Optional[List[int]]): Only count the teams of these Discord users
+            limit (int): Number of teams
+        """
+        conditions, args = self._get_conditions(season, user_ids)
+        if chamber is not None:
+            args.append(chamber)
+            conditions.append(f"chamber = ${len(args)}")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        args.append(limit)
+        rows = await self.pool.fetch(
+            f"""
+            SELECT characters, COUNT(*) AS uses
+            FROM abyss_team_leaderboard
+            {where}
+            GROUP BY characters
+            ORDER BY uses DESC
+            LIMIT ${len(args)}
+            """,
+            *args,
+        )
+        return [TeamUsage(**row) for row in rows]
+
+    @staticmethod
+    def _get_conditions(
+        season: typing.Optional[int], user_ids: typing.Optional[typing.List[int]]
+    ) -> typing.Tuple[typing.List[str], typing.List[typing.Any]]:
+        conditions: typing.List[str] = []
+        args: typing.List[typing.Any] = []
+        if season is not None:
+            args.append(season)
+            conditions.append(f"season = ${len(args)}")
+        if user_ids is not None:
+            args.append(user_ids)
+            conditions.append(f"user_id = ANY(${len(args)}::bigint[])")
+        return conditions, args
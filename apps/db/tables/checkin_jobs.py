@@ -0,0 +1,229 @@
+import datetime
+from enum import Enum
+from typing import Dict, List, Optional
+
+from asyncpg import Pool
+from pydantic import BaseModel
+
+
+class JobStatus(Enum):
+    PENDING = "pending"
+    LEASED = "leased"
+    DONE = "done"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+class CheckinJob(BaseModel):
+    """Daily check-in job of an account"""
+
+    user_id: int
+    """Discord user ID"""
+    uid: int
+    """Game UID"""
+    day: datetime.date
+    """The day (UTC+8) the check-in is for"""
+    status: JobStatus
+    """Job status"""
+    attempts: int
+    """Number of failed attempts"""
+    worker: Optional[str] = None
+    """The worker that leased the job"""
+    leased_until: Optional[datetime.datetime] = None
+    """When the lease expires and the job can be taken by another worker"""
+
+
+class CheckinJobTable:
+    """Durable daily check-in queue, one row per account per day"""
+
+    def __init__(self, pool: Pool):
+        self.pool = pool
+
+    async def create(self) -> None:
+        await self.pool.execute(
+            """
+            CREATE TABLE IF NOT EXISTS checkin_job (
+                user_id bigint NOT NULL,
+                uid bigint NOT NULL,
+                day date NOT NULL,
+                status text NOT NULL DEFAULT 'pending',
+                attempts integer NOT NULL DEFAULT 0,
+                worker text,
+                leased_until timestamp,
+                api text,
+                result text,
+                updated_at timestamp,
+                PRIMARY KEY (user_id, uid, day)
+            )
+            """
+        )
+        await self.pool.execute(
+            """
+            CREATE INDEX IF NOT EXISTS checkin_job_day_status_idx
+            ON checkin_job (day, status, leased_until)
+            """
+        )
+
+    async def enqueue(self, day: datetime.date, reset: bool = False) -> None:
+        """Add a job for every account with daily check-in on that has not checked in on that day
+
+        Args:
+            day (datetime.date): The day to check in for
+            reset (bool): Re-queue every account, even the ones that already checked in
+        """
+        if reset:
+            await self.pool.execute(
+                """
+                INSERT INTO checkin_job (user_id, uid, day)
+                SELECT user_id, uid, $1 FROM hoyo_account WHERE daily_checkin = TRUE
+                ON CONFLICT (user_id, uid, day) DO UPDATE
+                SET status = 'pending', attempts = 0, worker = NULL, leased_until = NULL
+                """,
+                day,
+            )
+        else:
+            await self.pool.execute(
+                """
+                INSERT INTO checkin_job (user_id, uid, day)
+                SELECT user_id, uid, $1 FROM hoyo_account
+                WHERE daily_checkin = TRUE
+                AND (last_checkin IS NULL OR last_checkin::date <> $1)
+                ON CONFLICT (user_id, uid, day) DO NOTHING
+                """,
+                day,
+            )
+
+    async def lease(
+        self,
+        day: datetime.date,
+        worker: str,
+        limit: int,
+        now: datetime.datetime,
+        lease_time: datetime.timedelta,
+    ) -> List[CheckinJob]:
+        """Lease pending jobs, or jobs whose lease has expired, to a worker
+
+        Uses ``FOR UPDATE SKIP LOCKED`` so multiple processes can drain the queue at the same time.
+        """
+        rows = await self.pool.fetch(
+            """
+            UPDATE checkin_job SET status = 'leased', worker = $2, leased_until = $3, updated_at = $4
+            WHERE (user_id, uid, day) IN (
+                SELECT user_id, uid, day FROM checkin_job
+                WHERE day = $1
+                AND (status = 'pending' OR (status = 'leased' AND leased_until < $4))
+                ORDER BY attempts ASC
+                LIMIT $5
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING *
+            """,
+            day,
+            worker,
+            now + lease_time,
+            now,
+            limit,
+        )
+        return [CheckinJob(**row) for row in rows]
+
+    async def finish(
+        self,
+        job: CheckinJob,
+        status: JobStatus,
+        api: str,
+        now: datetime.datetime,
+        result: str = "",
+    ) -> bool:
+        """Mark a leased job as done, failed or skipped
+
+        Returns:
+            bool: False if the job is no longer leased to ``job.worker``
+        """
+        finished = await self.pool.fetchval(
+            """
+            UPDATE checkin_job SET status = $4, api = $5, result = $6, leased_until = NULL,
+            updated_at = $7
+            WHERE user_id = $1 AND uid = $2 AND day = $3
+            AND status = 'leased' AND worker = $8
+            RETURNING TRUE
+            """,
+            job.user_id,
+            job.uid,
+            job.day,
+            status.value,
+            api,
+            result,
+            now,
+            job.worker,
+        )
+        return bool(finished)
+
+    async def release(
+        self, job: CheckinJob, max_attempts: int, result: str = "", attempt: bool = True
+    ) -> bool:
+        """Put a leased job back in the queue, or fail it after too many attempts
+
+        Jobs that were finished or leased to another worker in the meantime are left alone.
+
+        Args:
+            job (CheckinJob): The leased job
+            max_attempts (int): Fail the job when it reaches this many attempts
+            result (str): The error of the attempt
+            attempt (bool): Whether the job was attempted, False when a worker gives it back untouched
+
+        Returns:
+            bool: False if the job is no longer leased to ``job.worker``
+        """
+        released = await self.pool.fetchval(
+            """
+            UPDATE checkin_job SET attempts = attempts + $4::int, worker = NULL, leased_until = NULL,
+            status = CASE WHEN attempts + $4::int >= $5 THEN 'failed' ELSE 'pending' END,
+            result = $6
+            WHERE user_id = $1 AND uid = $2 AND day = $3
+            AND status = 'leased' AND worker = $7
+            RETURNING TRUE
+            """,
+            job.user_id,
+            job.uid,
+            job.day,
+            int(attempt),
+            max_attempts,
+            result,
+            job.worker,
+        )
+        return bool(released)
+
+    async def has_unfinished(self, day: datetime.date) -> bool:
+        """Whether there are jobs that are pending or leased on that day"""
+        return await self.pool.fetchval(
+            """
+            SELECT EXISTS(
+                SELECT 1 FROM checkin_job WHERE day = $1 AND status IN ('pending', 'leased')
+            )
+            """,
+            day,
+        )
+
+    async def get_progress(self, day: datetime.date) -> Dict[JobStatus, int]:
+        """Get the number of jobs of each status on that day"""
+        rows = await self.pool.fetch(
+            "SELECT status, COUNT(*) FROM checkin_job WHERE day = $1 GROUP BY status",
+            day,
+        )
+        return {JobStatus(row["status"]): row["count"] for row in rows}
+
+    async def get_game_count(self, day: datetime.date) -> Dict[str, int]:
+        """Get the number of jobs of each game on that day"""
+        rows = await self.pool.fetch(
+            """
+            SELECT a.game, COUNT(*) FROM checkin_job j
+            JOIN hoyo_account a ON a.user_id = j.user_id AND a.uid = j.uid
+            WHERE j.day = $1 GROUP BY a.game
+            """,
+            day,
+        )
+        return {row["game"]: row["count"] for row in rows}
+
+    async def clean(self, before: datetime.date) -> None:
+        """Delete jobs of the days before a day"""
+        await self.pool.execute("DELETE FROM checkin_job WHERE day < $1", before)
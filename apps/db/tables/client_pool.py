@@ -0,0 +1,55 @@
+from typing import Any, Dict, Tuple
+
+import cachetools
+from genshin import Client, Game, Region
+
+ClientKey = Tuple[int, Game, Region, str]
+"""Hoyoverse account ID, game, region and language"""
+
+
+class ClientPool:
+    """Process-wide genshin.py clients, shared by every command of an account
+
+    Accounts are fetched from the database on every interaction, reusing their clients
+    keeps genshin.py's connections and caches across commands. Clients are never modified
+    after they are created, so each language has its own client and concurrent commands
+    can't change each other's language. A client is rebuilt when the cookies it was
+    created with change, and the least recently used clients are dropped once there are
+    more than ``maxsize``.
+    """
+
+    def __init__(self, maxsize: int = 2048) -> None:
+        self._clients: cachetools.LRUCache = cachetools.LRUCache(maxsize=maxsize)
+
+    def get(
+        self, cookies: Dict[str, Any], game: Game, region: Region, lang: str
+    ) -> Client:
+        """Get the client of an account
+
+        Args:
+            cookies (Dict[str, Any]): The account's cookies, including ``account_id``
+            game (Game): The client's game
+            region (Region): The client's region
+            lang (str): The client's genshin.py language
+        """
+        key: ClientKey = (int(cookies["account_id"]), game, region, lang)
+        signature = tuple(sorted(cookies.items()))
+
+        cached = self._clients.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        client = Client(lang=lang)
+        client.set_cookies(cookies)
+        client.game = game
+        client.region = region
+        self._clients[key] = (signature, client)
+        return client
+
+    def invalidate(self, ltuid: int) -> None:
+        """Drop the clients of an account, called when its cookie is changed or deleted"""
+        for key in [k for k in self._clients if k[0] == ltuid]:
+            self._clients.pop(key, None)
+
+
+client_pool = ClientPool()
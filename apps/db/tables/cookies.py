@@ -1,6 +1,8 @@
 from asyncpg import Pool
 from pydantic import BaseModel
 
+from .client_pool import client_pool
+
 
 class Cookie(BaseModel):
     """Cookie"""
@@ -41,6 +43,7 @@ class CookieTable:
             cookie.ltoken,
             cookie.cookie_token,
         )
+        client_pool.invalidate(cookie.ltuid)
 
     async def get(self, ltuid: int) -> Cookie:
         """Get a cookie"""
@@ -62,6 +65,7 @@ class CookieTable:
             cookie.ltoken,
             cookie.cookie_token,
         )
+        client_pool.invalidate(cookie.ltuid)
 
     async def delete(self, ltuid: int) -> None:
         """Delete a cookie"""
@@ -71,3 +75,4 @@ class CookieTable:
             """,
             ltuid,
         )
+        client_pool.invalidate(ltuid)
@@ -9,6 +9,7 @@ from apps.text_map.convert_locale import to_genshin_py
 from dev.enum import GameType
 from dev.exceptions import AccountNotFound
 
+from .client_pool import client_pool
 from .cookies import Cookie, CookieTable
 from .user_settings import UserSettings, UserSettingsTable
 
@@ -60,8 +61,6 @@ class HoyoAccount(BaseModel):
 
     internal_cookie: Optional[Cookie]
     """Hoyoverse cookie"""
-    internal_client: Optional[Client]
-    """Genshin.py client"""
     internal_settings: Optional[UserSettings]
     """User settings"""
 
@@ -78,35 +77,46 @@ class HoyoAccount(BaseModel):
 
     @property
     async def client(self) -> Client:
-        """Get the genshin.py client"""
-        if not self.internal_client:
-            cookie = await self.cookie
-            self.internal_client = self._create_client(cookie)
-        return self.internal_client
+        """Get the genshin.py client, in the user's language if the settings were loaded"""
+        lang = (
+            to_genshin_py(str(self.internal_settings.lang))
+            if self.internal_settings
+            else "en-us"
+        )
+        return await self.get_client(lang)
+
+    async def get_client(self, lang: str) -> Client:
+        """Get the genshin.py client of a language
+
+        The client is shared with other commands of the account, use this instead of
+        setting its ``lang``.
+
+        Args:
+            lang (str): genshin.py language, e.g. "en-us"
+        """
+        cookie = await self.cookie
+        return self._create_client(cookie, lang)
 
     @property
     async def settings(self) -> UserSettings:
         """Get the user settings"""
         if not self.internal_settings:
             self.internal_settings = await self.settings_db.get_all(self.user_id)
-        if self.internal_client:
-            self.internal_client.lang = to_genshin_py(str(self.internal_settings.lang))
         return self.internal_settings
 
-    def _create_client(self, cookie: Cookie) -> Client:
-        """Create a genshin.py client"""
-        client = Client()
-        client.set_cookies(
+    def _create_client(self, cookie: Cookie, lang: str) -> Client:
+        """Get the shared genshin.py client of the account"""
+        return client_pool.get(
             {
                 "ltuid": cookie.ltuid,
                 "ltoken": cookie.ltoken,
                 "cookie_token": cookie.cookie_token,
                 "account_id": self.ltuid,
-            }
+            },
+            convert_game_type(self.game),
+            Region.CHINESE if self.china else Region.OVERSEAS,
+            lang,
         )
-        client.game = convert_game_type(self.game)
-        client.region = Region.CHINESE if self.china else Region.OVERSEAS
-        return client
 
     class Config:
         arbitrary_types_allowed = True
@@ -27,6 +27,8 @@ class NotifBase(BaseModel):
     """Notification toggle"""
     game: GameType = Field(default=GameType.GENSHIN)
     """Game type"""
+    next_check: typing.Optional[datetime.datetime] = Field(default=None)
+    """When the notes should be checked next, None means as soon as possible"""
 
 
 class PotNotif(NotifBase):
@@ -65,6 +67,10 @@ class ExpedNotif(NotifBase):
     """Notify x hour before expedition ends"""
 
 
+RESCHEDULE_KEYS = {"toggle", "threshold", "hour_before", "max"}
+"""Updating any of these makes the notification due immediately"""
+
+
 class NotifTable:
     def __init__(self, pool: Pool, notif_type: NotifType):
         self.pool = pool
@@ -83,6 +89,25 @@ class NotifTable:
             ADD COLUMN IF NOT EXISTS game text NOT NULL DEFAULT 'genshin'
             """
         )
+        await self.pool.execute(
+            """
+            ALTER TABLE public.notif_base
+            ADD COLUMN IF NOT EXISTS next_check timestamp
+            """
+        )
+        await self.pool.execute(
+            f"""
+            ALTER TABLE public.{self.notif_type.value}
+            ADD COLUMN IF NOT EXISTS next_check timestamp
+            """
+        )
+        await self.pool.execute(
+            f"""
+            CREATE INDEX IF NOT EXISTS {self.notif_type.value}_next_check_idx
+            ON public.{self.notif_type.value} (next_check)
+            WHERE toggle = true
+            """
+        )
 
     async def insert(self, user_id: int, uid: int, game: GameType) -> None:
         """Insert user notification data"""
@@ -95,6 +120,8 @@ class NotifTable:
 
     async def update(self, user_id: int, uid: int, **kwargs: typing.Any) -> None:
         """Update user notification data"""
+        if "next_check" not in kwargs and RESCHEDULE_KEYS & kwargs.keys():
+            kwargs["next_check"] = None
         await self.pool.execute(
             f"UPDATE {self.notif_type.value} SET "
             + ", ".join(f"{key} = ${i}" for i, key in enumerate(kwargs, 3))
@@ -120,6 +147,18 @@ class NotifTable:
         )
         return rows
 
+    async def get_due(self, now: datetime.datetime) -> typing.List[Record]:
+        """Get users of a notification type that has the toggle on and are due to be checked"""
+        rows = await self.pool.fetch(
+            f"""
+            SELECT * FROM {self.notif_type.value}
+            WHERE toggle = true AND (next_check IS NULL OR next_check <= $1)
+            ORDER BY next_check NULLS FIRST
+            """,
+            now,
+        )
+        return rows
+
 
 class ResinNotifTable(NotifTable):
     def __init__(self, pool: Pool):
@@ -131,6 +170,9 @@ class ResinNotifTable(NotifTable):
     async def get_all(self) -> typing.List[ResinNotif]:
         return [ResinNotif(**i) for i in await super().get_all()]
 
+    async def get_due(self, now: datetime.datetime) -> typing.List[ResinNotif]:
+        return [ResinNotif(**i) for i in await super().get_due(now)]
+
 
 class PotNotifTable(NotifTable):
     def __init__(self, pool: Pool):
@@ -142,6 +184,9 @@ class PotNotifTable(NotifTable):
     async def get_all(self) -> typing.List[PotNotif]:
         return [PotNotif(**i) for i in await super().get_all()]
 
+    async def get_due(self, now: datetime.datetime) -> typing.List[PotNotif]:
+        return [PotNotif(**i) for i in await super().get_due(now)]
+
 
 class PTNotifTable(NotifTable):
     def __init__(self, pool: Pool):
@@ -162,6 +207,9 @@ class PTNotifTable(NotifTable):
     async def get_all(self) -> typing.List[PTNotif]:
         return [PTNotif(**i) for i in await super().get_all()]
 
+    async def get_due(self, now: datetime.datetime) -> typing.List[PTNotif]:
+        return [PTNotif(**i) for i in await super().get_due(now)]
+
 
 class ExpedNotifTable(NotifTable):
     def __init__(self, pool: Pool):
@@ -177,9 +225,19 @@ class ExpedNotifTable(NotifTable):
             INHERITS (public.notif_base)
             """
         )
+        await self.pool.execute(
+            """
+            CREATE INDEX IF NOT EXISTS exped_notif_next_check_idx
+            ON public.exped_notif (next_check)
+            WHERE toggle = true
+            """
+        )
 
     async def get(self, user_id: int, uid: int) -> ExpedNotif:
         return ExpedNotif(**await super().get(user_id, uid))
 
     async def get_all(self) -> typing.List[ExpedNotif]:
         return [ExpedNotif(**i) for i in await super().get_all()]
+
+    async def get_due(self, now: datetime.datetime) -> typing.List[ExpedNotif]:
+        return [ExpedNotif(**i) for i in await super().get_due(now)]
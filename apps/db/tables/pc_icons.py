@@ -0,0 +1,76 @@
+from typing import Dict, Iterable, Optional
+
+import cachetools
+from asyncpg import Pool
+
+
+class PCIconTable:
+    """Character icons of the HoYoLAB lineup simulator, used by the character summary card
+
+    The icons are read often and change only when characters are added, so they are
+    kept in memory after the first read. Characters the lineup simulator has no icon
+    for are remembered for an hour, so they don't cause a fetch on every card.
+    """
+
+    def __init__(self, pool: Pool):
+        self.pool = pool
+        self._icons: Optional[Dict[str, str]] = None
+        self._missing: cachetools.TTLCache = cachetools.TTLCache(maxsize=1024, ttl=3600)
+
+    async def create(self) -> None:
+        await self.pool.execute(
+            """
+            CREATE TABLE IF NOT EXISTS character_pc_icon (
+                character_id text PRIMARY KEY,
+                icon text NOT NULL
+            )
+            """
+        )
+
+        # move the document of the json table over the first time
+        if await self.pool.fetchval("SELECT to_regclass('public.json')") is None:
+            return
+        await self.pool.execute(
+            """
+            INSERT INTO character_pc_icon (character_id, icon)
+            SELECT t.key, t.value
+            FROM json, jsonb_each_text(file::jsonb) AS t
+            WHERE file_name = 'genshin/pc_icons.json'
+                AND t.value <> ''
+                AND NOT EXISTS (SELECT 1 FROM character_pc_icon)
+            ON CONFLICT DO NOTHING
+            """
+        )
+
+    async def get_all(self) -> Dict[str, str]:
+        """Character ID to PC icon URL"""
+        if self._icons is None:
+            rows = await self.pool.fetch("SELECT character_id, icon FROM character_pc_icon")
+            self._icons = {row["character_id"]: row["icon"] for row in rows}
+        return dict(self._icons)
+
+    def is_missing(self, character_id: str) -> bool:
+        """Whether the lineup simulator recently had no icon for a character"""
+        return character_id in self._missing
+
+    async def update(self, icons: Dict[str, str], checked: Iterable[str] = ()) -> None:
+        """Insert or update the icons of characters
+
+        Args:
+            icons (Dict[str, str]): Character ID to PC icon URL, empty URLs are skipped
+            checked (Iterable[str]): IDs of the characters that were looked up, the ones
+                without an icon are remembered as missing
+        """
+        for character_id in checked:
+            if not icons.get(character_id):
+                self._missing[character_id] = True
+        icons = {character_id: icon for character_id, icon in icons.items() if icon}
+        await self.pool.executemany(
+            """
+            INSERT INTO character_pc_icon (character_id, icon) VALUES ($1, $2)
+            ON CONFLICT (character_id) DO UPDATE SET icon = $2
+            """,
+            list(icons.items()),
+        )
+        if self._icons is not None:
+            self._icons.update(icons)
@@ -0,0 +1,178 @@
+import datetime
+from typing import Dict, Optional
+
+from asyncpg import Pool
+from pydantic import BaseModel
+
+
+class UserTalents(BaseModel):
+    """Talent levels of a user's characters"""
+
+    talents: Dict[str, str]
+    """Character ID to talent levels, formatted as "a/e/q" """
+    last_updated: Optional[datetime.datetime]
+    """When the talents were last synced"""
+
+
+class TalentTable:
+    """Talent levels per character of each UID, and which talent constellation 3 boosts
+
+    When each UID was last synced is kept in ``talent_sync``, so a sync that fetched
+    nothing still counts as one.
+    """
+
+    def __init__(self, pool: Pool):
+        self.pool = pool
+        self._boosts: Optional[Dict[str, str]] = None
+
+    async def create(self) -> None:
+        await self.pool.execute(
+            """
+            CREATE TABLE IF NOT EXISTS character_talent (
+                uid bigint NOT NULL,
+                character_id integer NOT NULL,
+                talents text NOT NULL,
+                updated_at timestamp NOT NULL,
+                PRIMARY KEY (uid, character_id)
+            )
+            """
+        )
+        await self.pool.execute(
+            """
+            CREATE TABLE IF NOT EXISTS talent_sync (
+                uid bigint PRIMARY KEY,
+                last_updated timestamp NOT NULL
+            )
+            """
+        )
+        # UIDs synced before talent_sync existed
+        await self.pool.execute(
+            """
+            INSERT INTO talent_sync (uid, last_updated)
+            SELECT uid, MAX(updated_at) FROM character_talent GROUP BY uid
+            ON CONFLICT DO NOTHING
+            """
+        )
+        await self.pool.execute(
+            """
+            CREATE TABLE IF NOT EXISTS talent_boost (
+                character_id text PRIMARY KEY,
+                boost text NOT NULL
+            )
+            """
+        )
+
+        # move the documents of the json table over the first time
+        if await self.pool.fetchval("SELECT to_regclass('public.json')") is None:
+            return
+        await self.pool.execute(
+            """
+            INSERT INTO character_talent (uid, character_id, talents, updated_at)
+            SELECT
+                substring(file_name FROM 'talents/(\\d+)\\.json')::bigint,
+                t.key::integer,
+                t.value,
+                (file::jsonb ->> 'last_updated')::timestamp
+            FROM json, jsonb_each_text(file::jsonb) AS t
+            WHERE file_name ~ '^talents/\\d+\\.json$'
+                AND t.key ~ '^\\d+$'
+                AND file::jsonb ? 'last_updated'
+                AND NOT EXISTS (SELECT 1 FROM character_talent)
+            ON CONFLICT DO NOTHING
+            """
+        )
+        await self.pool.execute(
+            """
+            INSERT INTO talent_sync (uid, last_updated)
+            SELECT
+                substring(file_name FROM 'talents/(\\d+)\\.json')::bigint,
+                (file::jsonb ->> 'last_updated')::timestamp
+            FROM json
+            WHERE file_name ~ '^talents/\\d+\\.json$'
+                AND file::jsonb ? 'last_updated'
+            ON CONFLICT DO NOTHING
+            """
+        )
+        await self.pool.execute(
+            """
+            INSERT INTO talent_boost (character_id, boost)
+            SELECT t.key, t.value
+            FROM json, jsonb_each_text(file::jsonb) AS t
+            WHERE file_name = 'genshin/talent_boost.json'
+                AND NOT EXISTS (SELECT 1 FROM talent_boost)
+            ON CONFLICT DO NOTHING
+            """
+        )
+
+    async def get(self, uid: int) -> Optional[UserTalents]:
+        """Get the talents of a UID, None if they were never synced"""
+        last_updated = await self.pool.fetchval(
+            "SELECT last_updated FROM talent_sync WHERE uid = $1", uid
+        )
+        if last_updated is None:
+            return None
+        rows = await self.pool.fetch(
+            "SELECT character_id, talents FROM character_talent WHERE uid = $1", uid
+        )
+        return UserTalents(
+            talents={str(row["character_id"]): row["talents"] for row in rows},
+            last_updated=last_updated,
+        )
+
+    async def update(
+        self, uid: int, talents: Dict[str, str], updated_at: datetime.datetime
+    ) -> None:
+        """Replace the talents of a UID and record the sync
+
+        The stored talents are kept when ``talents`` is empty, e.g. when the
+        calculator refused every request.
+
+        Args:
+            uid (int): Genshin Impact UID
+            talents (Dict[str, str]): Character ID to talent levels
+            updated_at (datetime.datetime): When the talents were synced
+        """
+        async with self.pool.acquire() as conn, conn.transaction():
+            await conn.execute(
+                """
+                INSERT INTO talent_sync (uid, last_updated) VALUES ($1, $2)
+                ON CONFLICT (uid) DO UPDATE SET last_updated = $2
+                """,
+                uid,
+                updated_at,
+            )
+            if not talents:
+                return
+            await conn.execute("DELETE FROM character_talent WHERE uid = $1", uid)
+            await conn.executemany(
+                """
+                INSERT INTO character_talent (uid, character_id, talents, updated_at)
+                VALUES ($1, $2, $3, $4)
+                """,
+                [
+                    (uid, int(character_id), levels, updated_at)
+                    for character_id, levels in talents.items()
+                ],
+            )
+
+    async def get_boosts(self) -> Dict[str, str]:
+        """Character ID to the talent boosted by constellation 3
+
+        The boosts are kept in memory after the first read.
+        """
+        if self._boosts is None:
+            rows = await self.pool.fetch("SELECT character_id, boost FROM talent_boost")
+            self._boosts = {row["character_id"]: row["boost"] for row in rows}
+        return dict(self._boosts)
+
+    async def add_boosts(self, boosts: Dict[str, str]) -> None:
+        """Insert the talent boosts of characters"""
+        await self.pool.executemany(
+            """
+            INSERT INTO talent_boost (character_id, boost) VALUES ($1, $2)
+            ON CONFLICT (character_id) DO UPDATE SET boost = $2
+            """,
+            list(boosts.items()),
+        )
+        if self._boosts is not None:
+            self._boosts.update(boosts)
@@ -11,6 +11,7 @@ class Settings(Enum):
     NOTIFICATION = "notification"
     AUTO_REDEEM = "auto_redeem"
     PROFILE_VERSION = "profile_ver"
+    ABYSS_BOARD_REFRESH = "abyss_board_refresh"
 
 
 class UserSettings(BaseModel):
@@ -28,12 +29,22 @@ class UserSettings(BaseModel):
     """Auto redeem toggle"""
     profile_version: int = Field(default=2, alias="profile_ver")
     """Profile card version"""
+    abyss_board_refresh: bool = Field(default=False)
+    """Abyss leaderboard background refresh toggle"""
 
 
 class UserSettingsTable:
     def __init__(self, pool: Pool):
         self.pool = pool
 
+    async def create(self) -> None:
+        await self.pool.execute(
+            """
+            ALTER TABLE user_settings
+            ADD COLUMN IF NOT EXISTS abyss_board_refresh boolean NOT NULL DEFAULT false
+            """
+        )
+
     async def insert(self, user_id: int) -> None:
         """Insert user settings"""
         await self.pool.execute(
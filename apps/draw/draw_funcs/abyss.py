@@ -1,5 +1,5 @@
 import io
-from typing import List
+from typing import List, Optional
 
 import discord
 import genshin
@@ -21,7 +21,7 @@ from utils import draw_dynamic_background, dynamic_font_size, get_cache, get_fon
 
 
 def one_page(
-    user: genshin.models.PartialGenshinUserStats,
+    user: Optional[genshin.models.PartialGenshinUserStats],
     abyss: genshin.models.SpiralAbyss,
     lang: discord.Locale | str,
     dark_mode: bool,
@@ -45,7 +45,8 @@ def one_page(
         font=font,
         anchor="mm",
     )
-    draw.text((2861, 134), str(user.info.level), fill=fill, font=font, anchor="mm")
+    level = str(user.info.level) if user else "-"
+    draw.text((2861, 134), level, fill=fill, font=font, anchor="mm")
 
     # most played characters
     draw.text((528, 326), text_map.get(613, lang), fill=fill, font=font, anchor="mm")
@@ -242,7 +243,7 @@ def abyss_overview(
     lang: discord.Locale | str,
     dark_mode: bool,
     abyss: genshin.models.SpiralAbyss,
-    user: genshin.models.PartialGenshinUserStats,
+    user: Optional[genshin.models.PartialGenshinUserStats],
 ) -> io.BytesIO:
     app_mode = "light" if not dark_mode else "dark"
     card: Image.Image = Image.open(
@@ -264,7 +265,7 @@ def abyss_overview(
     text = f"{abyss.total_wins}/{abyss.total_battles}"
     offset = (offset[0] + 840, offset[1])
     draw.text(offset, text=text, fill=fill, font=font, anchor="mm")
-    text = f"AR {user.info.level}"
+    text = f"AR {user.info.level if user else '-'}"
     offset = (offset[0] + 830, offset[1])
     draw.text(offset, text=text, fill=fill, font=font, anchor="mm")
     offset = (950 - 100, 220 + 320)
@@ -9,9 +9,9 @@ from PIL import Image, ImageDraw
 import utils.draw as utils
 from apps.text_map import text_map
 from dev.asset import trailblazer_ids
-from utils.general import open_json
+from data.loader import LazyData
 
-tree_info = open_json("HSRMaps/maps/en/avatartree.json")
+tree_info = LazyData("HSRMaps/maps/en/avatartree.json")
 
 
 def draw_profile_card_v1(
@@ -3,7 +3,6 @@ import io
 import random
 from typing import Dict, List, Optional, Tuple
 
-import asyncpg
 import discord
 import enkanetwork as enka
 import genshin
@@ -14,8 +13,8 @@ import apps.draw.draw_funcs as funcs
 import apps.draw.draw_funcs.star_rail as star_rail
 import dev.models as models
 from ambr import Material
-from apps.db.json import read_json, write_json
 from apps.db.tables.abyss_board import AbyssBoardEntry
+from apps.db.tables.pc_icons import PCIconTable
 from apps.wish.models import RecentWish, WishData
 from dev.exceptions import CardNotReady
 from utils import calculate_time, download_images, extract_urls
@@ -25,7 +24,7 @@ from utils.draw import get_hsr_card_data
 @calculate_time
 async def draw_abyss_one_page(
     draw_input: models.DrawInput,
-    user_stats: genshin.models.PartialGenshinUserStats,
+    user_stats: Optional[genshin.models.PartialGenshinUserStats],
     abyss_data: genshin.models.SpiralAbyss,
     user_characters: List[genshin.models.Character],
 ) -> io.BytesIO:
@@ -230,7 +229,7 @@ async def draw_area_card(
 async def draw_abyss_overview_card(
     draw_input: models.DrawInput,
     abyss_data: genshin.models.SpiralAbyss,
-    user_data: genshin.models.PartialGenshinUserStats,
+    user_data: Optional[genshin.models.PartialGenshinUserStats],
 ) -> io.BytesIO:
     characters = [
         abyss_data.ranks.most_bursts_used[0],
@@ -359,22 +358,26 @@ async def character_summary_card(
     draw_input: models.DrawInput,
     character_list: List[genshin.models.Character],
     talents: Dict[str, str],
-    pool: asyncpg.Pool,
+    pc_icon_db: PCIconTable,
 ) -> io.BytesIO:
     urls = [c.weapon.icon for c in character_list]
-    pc_icons = await read_json(pool, "genshin/pc_icons.json")
+    pc_icons = await pc_icon_db.get_all()
 
-    if (
-        not pc_icons
-        or any(str(c.id) not in pc_icons for c in character_list)
-        or any(not pc_icons[str(c.id)] for c in character_list)
+    character_ids = [str(c.id) for c in character_list]
+    if any(
+        c_id not in pc_icons and not pc_icon_db.is_missing(c_id)
+        for c_id in character_ids
     ):
         client = genshin.Client()
         fields = await client.get_lineup_fields()
-        pc_icons = {
-            str(character.id): character.pc_icon for character in fields.characters
-        }
-        await write_json(pool, "genshin/pc_icons.json", pc_icons)
+        await pc_icon_db.update(
+            {str(character.id): character.pc_icon for character in fields.characters},
+            checked=character_ids,
+        )
+        pc_icons = await pc_icon_db.get_all()
+    # characters the lineup simulator has no icon for use their normal icon
+    for c in character_list:
+        pc_icons[str(c.id)] = pc_icons.get(str(c.id)) or c.icon
     urls.extend([pc_icons[str(c.id)] for c in character_list])
 
     await download_images(urls, draw_input.session)
@@ -1,15 +1,13 @@
-import json
-from typing import Any, Dict, List, Optional
+from typing import List
 
-import aiofiles
+from data.loader import LazyData
+
+CHARACTERS_PATH = "API-docs/store/characters.json"
+
+characters = LazyData(CHARACTERS_PATH)
+"""Enka API's characters.json, reloaded when the API-docs submodule is updated"""
 
 
 async def get_character_skill_order(character_id: str) -> List[int]:
     """Get the talent order of a character from Enka API's character.json file."""
-    async with aiofiles.open("API-docs/store/characters.json") as f:
-        characters: Dict[str, Any] = json.loads(await f.read())
-
-    character: Optional[Dict[str, Any]] = characters.get(character_id)
-    if character and "SkillOrder" in character:
-        return character.get("SkillOrder")
-    return []
+    return characters.get(character_id, {}).get("SkillOrder", [])
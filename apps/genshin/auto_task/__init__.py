@@ -1,3 +1,4 @@
+from .abyss_board import *
 from .auto_redeem import *
 from .daily_checkin import *
 from .realtime_notes import *
@@ -0,0 +1,112 @@
+import asyncio
+import time
+from typing import List
+
+import genshin
+import sentry_sdk
+
+from apps.db.tables.hoyo_account import HoyoAccount
+from apps.genshin.leaderboard import abyss_board_writer, build_abyss_record
+from dev.exceptions import AccountNotFound
+from dev.models import BotModel
+from utils import get_current_abyss_season, log
+
+MAX_CONCURRENCY = 4
+"""Number of accounts fetched at the same time"""
+REQUEST_INTERVAL = 1.5
+"""Seconds a worker waits between two accounts"""
+BATCH_SIZE = 100
+"""Number of records buffered before they are written"""
+
+
+class AbyssBoardRefresher:
+    """Refresh the abyss leaderboard in the background
+
+    Accounts on the leaderboard of the current or the last season whose users turned
+    on ``Settings.ABYSS_BOARD_REFRESH`` are refreshed, their abyss data of the current
+    season is fetched under a rate limit and written in batches.
+    """
+
+    def __init__(self, bot: BotModel) -> None:
+        self.bot = bot
+
+        self._total = 0
+        self._success = 0
+        self._errors = 0
+
+    async def start(self) -> None:
+        start = time.perf_counter()
+        try:
+            log.info("[AbyssBoardRefresher] Starting")
+            accounts = await self._get_accounts()
+            self._total = len(accounts)
+
+            queue: asyncio.Queue[HoyoAccount] = asyncio.Queue()
+            for account in accounts:
+                queue.put_nowait(account)
+            await asyncio.gather(
+                *(self._worker(queue) for _ in range(MAX_CONCURRENCY))
+            )
+            await abyss_board_writer.flush(self.bot.db)
+        except Exception as e:  # skipcq: PYL-W0703
+            log.exception(f"[AbyssBoardRefresher] {e}")
+            sentry_sdk.capture_exception(e)
+        finally:
+            log.info(
+                f"[AbyssBoardRefresher] Refreshed {self._success}/{self._total} accounts "
+                f"({self._errors} errors) in {time.perf_counter() - start:.1f}s"
+            )
+
+    async def _get_accounts(self) -> List[HoyoAccount]:
+        season = get_current_abyss_season()
+        rows = await self.bot.pool.fetch(
+            """
+            SELECT DISTINCT l.uid, l.user_id
+            FROM abyss_leaderboard AS l
+            JOIN user_settings AS s ON s.user_id = l.user_id
+            WHERE l.season >= $1 AND s.abyss_board_refresh
+            """,
+            season - 1,
+        )
+        accounts: List[HoyoAccount] = []
+        for row in rows:
+            try:
+                accounts.append(await self.bot.db.users.get(row["user_id"], row["uid"]))
+            except AccountNotFound:
+                continue
+        return accounts
+
+    async def _worker(self, queue: "asyncio.Queue[HoyoAccount]") -> None:
+        while not queue.empty():
+            account = queue.get_nowait()
+            try:
+                await self._refresh(account)
+            except genshin.errors.DataNotPublic:
+                pass
+            except Exception as e:  # skipcq: PYL-W0703
+                self._errors += 1
+                log.warning(f"[AbyssBoardRefresher] {account.uid}: {type(e)} {e}")
+            await asyncio.sleep(REQUEST_INTERVAL)
+
+    async def _refresh(self, account: HoyoAccount) -> None:
+        client = await account.client
+        abyss = await client.get_genshin_spiral_abyss(account.uid)
+        if abyss.max_floor == "0-0" or not abyss.ranks.strongest_strike:
+            return
+        user = await client.get_partial_genshin_user(account.uid)
+        characters = await client.get_genshin_characters(account.uid)
+
+        abyss_board_writer.add(
+            build_abyss_record(
+                abyss,
+                user,
+                list(characters),
+                account.uid,
+                user.info.nickname,
+                account.user_id,
+                0,
+            )
+        )
+        self._success += 1
+        if len(abyss_board_writer) >= BATCH_SIZE:
+            await abyss_board_writer.flush(self.bot.db)
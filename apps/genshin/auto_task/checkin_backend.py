@@ -0,0 +1,118 @@
+import random
+import time
+from enum import Enum
+from typing import Optional
+
+from dev.enum import CheckInAPI
+
+
+class BreakerState(Enum):
+    CLOSED = "closed"
+    """Requests flow normally"""
+    OPEN = "open"
+    """The backend is failing, no requests are sent until the cooldown ends"""
+    HALF_OPEN = "half_open"
+    """The cooldown ended, a single probe request decides whether to close or re-open"""
+
+
+class CheckInBackend:
+    """Adaptive concurrency window and circuit breaker of a check-in API
+
+    The window grows by one request per window of successes (additive increase) and
+    halves on rate limits and errors (multiplicative decrease). After too many errors
+    in a row the breaker opens, then lets one probe through once the cooldown ends;
+    every failed probe doubles the cooldown.
+    """
+
+    def __init__(
+        self,
+        api: CheckInAPI,
+        max_window: int = 8,
+        failure_threshold: int = 5,
+        cooldown: float = 60.0,
+        max_cooldown: float = 900.0,
+    ) -> None:
+        self.api = api
+        self.max_window = max_window
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+        self.window = 1.0
+        self.in_flight = 0
+        self.state = BreakerState.CLOSED
+        self.cooldown = cooldown
+        self.open_until = 0.0
+
+        self.latency: Optional[float] = None
+        """Exponentially weighted moving average of the request latency in seconds"""
+        self.successes = 0
+        self.failures = 0
+        self.rate_limits = 0
+        self.consecutive_failures = 0
+        self.trips = 0
+
+    @property
+    def slots(self) -> int:
+        """Number of requests that can be started right now"""
+        if self.state is BreakerState.OPEN:
+            if time.monotonic() < self.open_until:
+                return 0
+            self.state = BreakerState.HALF_OPEN
+        if self.state is BreakerState.HALF_OPEN:
+            return 0 if self.in_flight else 1
+        return max(0, int(self.window) - self.in_flight)
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until the breaker lets a probe through"""
+        if self.state is not BreakerState.OPEN:
+            return 0.0
+        return max(0.0, self.open_until - time.monotonic())
+
+    def record_latency(self, latency: float) -> None:
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency = 0.8 * self.latency + 0.2 * latency
+
+    def backoff(self, retry_count: int) -> float:
+        """Seconds to wait before retrying a rate limited request, with jitter"""
+        base = max(1.0, self.latency or 1.0)
+        return min(30.0, base * 2**retry_count) * random.uniform(0.5, 1.0)
+
+    def on_success(self) -> None:
+        self.successes += 1
+        self.consecutive_failures = 0
+        if self.state is BreakerState.HALF_OPEN:
+            self.state = BreakerState.CLOSED
+            self.cooldown = self.base_cooldown
+        self.window = min(self.max_window, self.window + 1 / self.window)
+
+    def on_rate_limit(self) -> None:
+        self.rate_limits += 1
+        self.window = max(1.0, self.window / 2)
+
+    def on_failure(self) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.window = max(1.0, self.window / 2)
+
+        if self.state is BreakerState.HALF_OPEN:
+            self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+            self.trip()
+        elif self.consecutive_failures >= self.failure_threshold:
+            self.trip()
+
+    def trip(self) -> None:
+        """Open the breaker for the current cooldown"""
+        self.state = BreakerState.OPEN
+        self.open_until = time.monotonic() + self.cooldown
+        self.trips += 1
+
+    def __str__(self) -> str:
+        latency = f"{self.latency:.2f}s" if self.latency is not None else "-"
+        return (
+            f"{self.state.name} window={self.window:.1f} latency={latency} "
+            f"errors={self.failures} 429s={self.rate_limits} trips={self.trips}"
+        )
@@ -2,7 +2,9 @@ import asyncio
 import datetime
 import io
 import os
-from typing import Any, Dict, List, Union
+import socket
+import time
+from typing import Any, Dict, List, Set, Union
 
 import discord
 import sentry_sdk
@@ -10,13 +12,15 @@ from dotenv import load_dotenv
 
 import dev.asset as asset
 import dev.models as model
+from apps.db.tables.checkin_jobs import CheckinJob, JobStatus
 from apps.db.tables.hoyo_account import HoyoAccount
 from apps.db.tables.user_settings import Settings
+from apps.genshin.auto_task.checkin_backend import CheckInBackend
 from apps.text_map import text_map
 from apps.text_map.convert_locale import to_genshin_py
 from dev.enum import CheckInAPI, GameType
-from dev.exceptions import CheckInAPIError
-from utils import get_dt_now, log
+from dev.exceptions import AccountNotFound, CheckInAPIError
+from utils import fan_out, get_dt_now, log
 from utils.general import get_dc_user
 from utils.genshin import get_checkin_url
 
@@ -24,6 +28,14 @@ load_dotenv()
 
 
 class DailyCheckin:
+    LEASE_SIZE = 10
+    """Number of jobs a worker leases at a time"""
+    LEASE_TIME = datetime.timedelta(minutes=10)
+    """Leased jobs that are not finished by then are picked up again by any worker"""
+    MAX_ATTEMPTS = 3
+    IDLE_INTERVAL = 10.0
+    """Seconds to wait when there is nothing to lease but other workers still hold jobs"""
+
     def __init__(self, bot: model.BotModel, no_date_check: bool = False) -> None:
         self.bot = bot
         self.no_date_check = no_date_check
@@ -32,29 +44,31 @@ class DailyCheckin:
         self._total: Dict[CheckInAPI, int] = {}
         self._errors: Dict[str, int] = {}
 
-        self._genshin_count: int = 0
-        self._honkai_count: int = 0
-        self._hsr_count: int = 0
-
         self._start_time: datetime.datetime
         self._end_time: datetime.datetime
+        self._day: datetime.date
+        self._worker = f"{socket.gethostname()}-{os.getpid()}"
 
         self._api_links = {
             CheckInAPI.VERCEL: os.getenv("VERCEL_URL"),
             CheckInAPI.DETA: os.getenv("DETA_URL"),
             CheckInAPI.RENDER: os.getenv("RENDER_URL"),
         }
+        self._backends = {api: CheckInBackend(api) for api in self._api_links}
 
     async def start(self) -> None:
+        """Queue today's check-ins and drain the queue
+
+        The queue lives in the database, so this can run in several processes at once
+        and a restarted process resumes where the previous one stopped.
+        """
         try:
             log.info("[DailyCheckin] Starting...")
             self._start_time = get_dt_now()
-
-            # initialize the queue
-            queue: asyncio.Queue[HoyoAccount] = asyncio.Queue()
+            self._day = self._start_time.date()
 
             # add users to queue
-            await self._add_users(queue)
+            await self._add_users()
 
             # add checkin tasks
             tasks: List[asyncio.Task] = []
@@ -64,15 +78,9 @@ class DailyCheckin:
                 CheckInAPI.RENDER,
             )
             for api in apis:
-                tasks.append(asyncio.create_task(self._genshin_daily_task(api, queue)))
-
-            # wait until the queue is fully processed
-            await queue.join()
+                tasks.append(asyncio.create_task(self._genshin_daily_task(api)))
 
-            # cancel all checkin tasks
-            for task in tasks:
-                task.cancel()
-            # wait until all check-in tasks are cancelled.
+            # wait until the queue is drained
             await asyncio.gather(*tasks, return_exceptions=True)
 
             self._end_time = get_dt_now()
@@ -85,32 +93,13 @@ class DailyCheckin:
         finally:
             log.info("[DailyCheckin] Finished")
 
-    async def _add_users(self, queue: asyncio.Queue[HoyoAccount]) -> None:
-        users = await self.bot.db.users.get_all()
-        for user in users:
-            if self.no_date_check:
-                last_checkin_check = True
-            else:
-                last_checkin_check = (
-                    user.last_checkin is None
-                    or user.last_checkin.day != get_dt_now().day
-                )
-            if user.daily_checkin and last_checkin_check:
-                await queue.put(user)
-                self._add_count(user)
+    async def _add_users(self) -> None:
+        db = self.bot.db.checkin_jobs
+        await db.clean(self._day - datetime.timedelta(days=7))
+        await db.enqueue(self._day, reset=self.no_date_check)
         log.info("[DailyCheckin] Users added to queue")
 
-    def _add_count(self, user: HoyoAccount) -> None:
-        if user.game is GameType.GENSHIN:
-            self._genshin_count += 1
-        elif user.game is GameType.HONKAI:
-            self._honkai_count += 1
-        elif user.game is GameType.HSR:
-            self._hsr_count += 1
-
-    async def _genshin_daily_task(
-        self, api: CheckInAPI, queue: asyncio.Queue[HoyoAccount]
-    ) -> None:
+    async def _genshin_daily_task(self, api: CheckInAPI) -> None:
         log.info(f"[DailyCheckin] Starting {api.name} task...")
 
         link = self._api_links[api]
@@ -118,63 +107,111 @@ class DailyCheckin:
             log.warning(f"[DailyCheckin] {api.name} link is not set")
             raise ValueError(f"{api.name} link is not set")
 
-        async with self.bot.session.get(link) as resp:
-            if resp.status != 200:
-                log.warning(
-                    f"[DailyCheckin] {api.name} returned {resp.status} status code"
-                )
-                raise CheckInAPIError(api, resp.status)
+        backend = self._backends[api]
+        try:
+            async with self.bot.sessions.checkin.get(link) as resp:
+                if resp.status != 200:
+                    raise CheckInAPIError(api, resp.status)
+        except Exception as e:  # skipcq: PYL-W0703
+            # start with the breaker open, it will be probed after the cooldown
+            log.warning(f"[DailyCheckin] {api.name} health check failed: {e}")
+            backend.trip()
 
         self._total[api] = 0
         self._success[api] = 0
-        MAX_API_ERROR = 5
-        api_error_count = 0
-
-        while True:
-            user = await queue.get()
-            try:
-                embed = await self._do_genshin_daily(api, user)
-                notif = await self.bot.db.settings.get(
-                    user.user_id, Settings.NOTIFICATION
+        db = self.bot.db.checkin_jobs
+        worker = f"{self._worker}-{api.value}"
+        running: Set[asyncio.Task] = set()
+
+        while get_dt_now().date() == self._day:
+            slots = backend.slots
+            if slots:
+                jobs = await db.lease(
+                    self._day, worker, slots, get_dt_now(), self.LEASE_TIME
+                )
+                for job in jobs:
+                    running.add(asyncio.create_task(self._run_job(backend, job)))
+                if (
+                    not jobs
+                    and not running
+                    and not await db.has_unfinished(self._day)
+                ):
+                    break
+
+            if running:
+                _, running = await asyncio.wait(
+                    running,
+                    timeout=backend.retry_after or None,
+                    return_when=asyncio.FIRST_COMPLETED,
                 )
-                if notif:
-                    await self._notify_user(user, embed)
-            except Exception as e:  # skipcq: PYL-W0703
-                api_error_count += 1
-                log.warning(f"[DailyCheckin] {api.name} error: {e}")
-                sentry_sdk.capture_exception(e)
-                await queue.put(user)
-
-                if api_error_count >= MAX_API_ERROR:
-                    return log.warning(
-                        f"[DailyCheckin] {api.name} has reached {MAX_API_ERROR} API errors"
-                    )
             else:
-                self._total[api] += 1
-                if isinstance(embed, model.DefaultEmbed):
-                    await self.bot.db.users.update(
-                        user.user_id, user.uid, last_checkin=get_dt_now()
-                    )
-                    self._success[api] += 1
-                else:
-                    await self.bot.db.users.update(
-                        user.user_id, user.uid, daily_checkin=False
-                    )
-            finally:
-                await asyncio.sleep(2.0)
-                queue.task_done()
+                await asyncio.sleep(backend.retry_after or self.IDLE_INTERVAL)
+
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        log.info(f"[DailyCheckin] {api.name} task ended: {backend}")
+
+    async def _run_job(self, backend: CheckInBackend, job: CheckinJob) -> None:
+        backend.in_flight += 1
+        try:
+            await self._process_job(backend.api, job)
+        except Exception as e:  # skipcq: PYL-W0703
+            backend.on_failure()
+            log.warning(f"[DailyCheckin] {backend.api.name} error: {e}")
+            sentry_sdk.capture_exception(e)
+            await self.bot.db.checkin_jobs.release(job, self.MAX_ATTEMPTS, str(e))
+        else:
+            backend.on_success()
+        finally:
+            backend.in_flight -= 1
+
+    async def _process_job(self, api: CheckInAPI, job: CheckinJob) -> None:
+        db = self.bot.db.checkin_jobs
+        try:
+            user = await self.bot.db.users.get(job.user_id, job.uid)
+        except AccountNotFound:
+            await db.finish(job, JobStatus.SKIPPED, api.value, get_dt_now())
+            return
+        if not user.daily_checkin:
+            await db.finish(job, JobStatus.SKIPPED, api.value, get_dt_now())
+            return
+
+        embed = await self._do_genshin_daily(api, user)
+        self._total[api] += 1
+        if isinstance(embed, model.DefaultEmbed):
+            await self.bot.db.users.update(
+                user.user_id, user.uid, last_checkin=get_dt_now()
+            )
+            finished = await db.finish(job, JobStatus.DONE, api.value, get_dt_now())
+            self._success[api] += 1
+        else:
+            await self.bot.db.users.update(user.user_id, user.uid, daily_checkin=False)
+            finished = await db.finish(
+                job, JobStatus.FAILED, api.value, get_dt_now(), str(embed.title)
+            )
+        if not finished:
+            log.warning(f"[DailyCheckin] Lost the lease of {job.user_id} {job.uid}")
+            return
+
+        # the job is finished, failing to notify must not put it back in the queue
+        try:
+            await self._notify_user(user, embed)
+        except Exception as e:  # skipcq: PYL-W0703
+            log.warning(f"[DailyCheckin] Failed to notify {user.user_id}: {e}")
+            sentry_sdk.capture_exception(e)
 
     async def _do_genshin_daily(
         self, api: CheckInAPI, user: HoyoAccount, retry_count: int = 0
     ) -> model.ShenheEmbed:
-        lang = (await user.settings).lang or "en-US"
+        results = await fan_out({"settings": user.settings, "cookie": user.cookie})
+        lang = results["settings"].lang or "en-US"
         api_link = self._api_links[api]
         if api_link is None:
             raise CheckInAPIError(api, 404)
 
         MAX_RETRY = 3
 
-        cookie = await user.cookie
+        cookie = results["cookie"]
         payload = {
             "cookie": {
                 "ltuid": cookie.ltuid,
@@ -185,13 +222,16 @@ class DailyCheckin:
             "game": user.game.value,
         }
 
-        async with self.bot.session.post(
+        backend = self._backends[api]
+        start = time.monotonic()
+        async with self.bot.sessions.checkin.post(
             url=f"{api_link}/checkin/", json=payload
         ) as resp:
             if resp.status == 200:
                 data = await resp.json()
             else:
                 raise CheckInAPIError(api, resp.status)
+        backend.record_latency(time.monotonic() - start)
 
         if "msg" in data:
             error_id = f"{data['code']} {data['msg']}"
@@ -204,7 +244,8 @@ class DailyCheckin:
                         f"[DailyCheckin] {api.name} retry limit reached, user: {user}"
                     )
                     raise CheckInAPIError(api, 429)
-                await asyncio.sleep(5 * (retry_count + 1))
+                backend.on_rate_limit()
+                await asyncio.sleep(backend.backoff(retry_count))
                 return await self._do_genshin_daily(api, user, retry_count + 1)
 
         embed = self._create_embed(lang, data)
@@ -271,6 +312,10 @@ class DailyCheckin:
         return embed
 
     async def _notify_user(self, user: HoyoAccount, embed: model.ShenheEmbed) -> None:
+        notif = await self.bot.db.settings.get(user.user_id, Settings.NOTIFICATION)
+        if not notif:
+            return
+
         dc_user = await get_dc_user(self.bot, user.user_id)
         embed.set_user_footer(dc_user, user.uid)
         try:
@@ -297,18 +342,26 @@ class DailyCheckin:
             owner = await self.bot.fetch_user(410036441129943050)
 
         each_api = "\n".join(
-            f"{api.name}: {self._success[api]}/{self._total[api]}"
+            f"{api.name}: {self._success[api]}/{self._total[api]} ({self._backends[api]})"
             for api in self._total
         )
+        progress = await self.bot.db.checkin_jobs.get_progress(self._day)
+        each_status = "\n".join(
+            f"{status.name}: {count}" for status, count in progress.items()
+        )
+        games = await self.bot.db.checkin_jobs.get_game_count(self._day)
         embed = model.DefaultEmbed(
             "Daily Checkin Report",
             f"""
             {each_api}
             Total: {sum(self._success.values())}/{sum(self._total.values())}
+
+            Queue:
+            {each_status}
             
-            Genshin: {self._genshin_count}
-            Honkai: {self._honkai_count}
-            Star Rail: {self._hsr_count}
+            Genshin: {games.get(GameType.GENSHIN.value, 0)}
+            Honkai: {games.get(GameType.HONKAI.value, 0)}
+            Star Rail: {games.get(GameType.HSR.value, 0)}
             
             Start time: {self._start_time}
             End time: {self._end_time}
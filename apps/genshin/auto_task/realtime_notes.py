@@ -1,5 +1,5 @@
 import asyncio
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Union
 
 import genshin
@@ -25,6 +25,16 @@ from utils.general import get_dc_user, get_dt_now
 from utils.genshin import get_character_emoji as get_genshin_character_emoji
 from utils.text_map import get_game_name
 
+RESIN_REGEN = timedelta(minutes=8)
+"""Time to regenerate one original resin"""
+STAMINA_REGEN = timedelta(minutes=6)
+"""Time to regenerate one trailblaze power"""
+NOTIF_COOLDOWN = timedelta(hours=2)
+"""Minimum time between two notifications of the same type"""
+MIN_INTERVAL = timedelta(minutes=5)
+MAX_INTERVAL = timedelta(hours=3)
+"""Upper bound between two checks, since items like fragile resin can't be predicted"""
+
 
 class RealtimeNotes:
     def __init__(self, bot: BotModel) -> None:
@@ -39,7 +49,7 @@ class RealtimeNotes:
     async def start(self) -> None:
         """Start the RealtimeNotes process.
 
-        This function retrieves all users with notifications enabled and their associated accounts,
+        This function retrieves users with notifications enabled that are due to be checked,
         and checks for new Genshin Impact API notes for each user. If a new note is found and the
         notification threshold has been exceeded, a notification is sent to the user via Discord.
         If an error occurs during the process, the error is logged and the exception is captured by Sentry.
@@ -69,7 +79,7 @@ class RealtimeNotes:
 
     async def _get_users(self) -> List[NotifBase]:
         """
-        Retrieve users from the database.
+        Retrieve users that are due to be checked from the database.
 
         Args:
             None
@@ -79,10 +89,11 @@ class RealtimeNotes:
         """
         result = []
         # Retrieve users from the database
-        resin = await self.bot.db.notifs.resin.get_all()
-        pot = await self.bot.db.notifs.pot.get_all()
-        pt = await self.bot.db.notifs.pt.get_all()
-        exped = await self.bot.db.notifs.exped.get_all()
+        now = get_dt_now()
+        resin = await self.bot.db.notifs.resin.get_due(now)
+        pot = await self.bot.db.notifs.pot.get_due(now)
+        pt = await self.bot.db.notifs.pt.get_due(now)
+        exped = await self.bot.db.notifs.exped.get_due(now)
 
         # Add notification objects to the result list
         users = resin + pot + pt + exped
@@ -112,12 +123,6 @@ class RealtimeNotes:
             ValueError: If an invalid notification type is encountered.
         """
         for notif_user in users:
-            # Fetch user account details
-            try:
-                user = await self.bot.db.users.get(notif_user.user_id, notif_user.uid)
-            except AccountNotFound:
-                continue
-
             if notif_user.type is NotifType.RESIN:
                 db = self.bot.db.notifs.resin
             elif notif_user.type is NotifType.POT:
@@ -129,12 +134,24 @@ class RealtimeNotes:
             else:
                 raise ValueError("Invalid notification type")
 
+            # Fetch user account details
+            try:
+                user = await self.bot.db.users.get(notif_user.user_id, notif_user.uid)
+            except AccountNotFound:
+                await db.update(
+                    notif_user.user_id,
+                    notif_user.uid,
+                    next_check=get_dt_now() + MAX_INTERVAL,
+                )
+                continue
+
             # Fetch user's language preference
             lang = (await user.settings).lang or "en-US"
 
             # Fetch Discord user object associated with the user account
             dc_user = await get_dc_user(self.bot, user.user_id)
 
+            fetched = user.uid not in self._notes_cache
             try:
                 # Retrieve the latest notes from Genshin Impact API
                 if user.uid in self._notes_cache:
@@ -163,11 +180,17 @@ class RealtimeNotes:
                 # Check if the threshold is exceeded and reset the notification counter if necessary
                 check = await self._check_notes(notif_user)
                 now = get_dt_now()
+                next_check = self._get_next_check(notif_user, notes, check, now)
                 if check and notif_user.current < notif_user.max:
                     if (
                         notif_user.last_notif is not None
-                        and now - notif_user.last_notif < timedelta(hours=2)
+                        and now - notif_user.last_notif < NOTIF_COOLDOWN
                     ):
+                        await db.update(
+                            user.user_id,
+                            user.uid,
+                            next_check=notif_user.last_notif + NOTIF_COOLDOWN,
+                        )
                         continue
 
                     # Send the notification and update the notification counter
@@ -179,14 +202,76 @@ class RealtimeNotes:
                         user.user_id,
                         user.uid,
                         current=notif_user.current + 1,
-                        last_notif=get_dt_now(),
+                        last_notif=now,
+                        next_check=next_check,
                     )
                 elif not check and notif_user.current != 0:
                     # Reset the notification counter if the user's current amount is less than the threshold
-                    await db.update(user.user_id, user.uid, current=0)
+                    await db.update(
+                        user.user_id, user.uid, current=0, next_check=next_check
+                    )
+                else:
+                    await db.update(user.user_id, user.uid, next_check=next_check)
             finally:
-                # Wait for 1.5 seconds before processing the next notification
-                await asyncio.sleep(1.5)
+                # Wait for 1.5 seconds before processing the next account that needs a request
+                if fetched:
+                    await asyncio.sleep(1.5)
+
+    @staticmethod
+    def _get_next_check(
+        notif_user: NotifBase,
+        notes: Union[genshin.models.Notes, genshin.models.StarRailNote],
+        triggered: bool,
+        now: datetime,
+    ) -> datetime:
+        """
+        Predict when the notification threshold will be crossed from the regeneration rates.
+
+        Args:
+            notif_user (NotifBase): The notification to schedule.
+            notes (Union[genshin.models.Notes, genshin.models.StarRailNote]): The latest notes.
+            triggered (bool): Whether the threshold is currently crossed.
+            now (datetime): The current time.
+
+        Returns:
+            datetime: The time the notes should be checked next.
+        """
+        if triggered:
+            wait = NOTIF_COOLDOWN
+        elif isinstance(notif_user, ResinNotif):
+            if isinstance(notes, genshin.models.Notes):
+                wait = RESIN_REGEN * (notif_user.threshold - notes.current_resin)
+            else:
+                wait = STAMINA_REGEN * (notif_user.threshold - notes.current_stamina)
+        elif isinstance(notif_user, PotNotif) and isinstance(
+            notes, genshin.models.Notes
+        ):
+            missing = notes.max_realm_currency - notes.current_realm_currency
+            remaining = notes.remaining_realm_currency_recovery_time
+            if missing > 0 and remaining.total_seconds() > 0:
+                wait = (
+                    remaining
+                    * (notif_user.threshold - notes.current_realm_currency)
+                    / missing
+                )
+            else:
+                wait = MAX_INTERVAL
+        elif isinstance(notif_user, PTNotif) and isinstance(
+            notes, genshin.models.Notes
+        ):
+            remaining = notes.remaining_transformer_recovery_time
+            if remaining is None:
+                wait = MAX_INTERVAL
+            else:
+                wait = remaining - timedelta(hours=notif_user.hour_before + 1)
+        elif isinstance(notif_user, ExpedNotif) and notes.expeditions:
+            # _check_notes only triggers once an expedition has finished, and a
+            # finished one also satisfies the hour_before condition
+            wait = min(e.remaining_time for e in notes.expeditions)
+        else:
+            wait = MAX_INTERVAL
+
+        return now + max(MIN_INTERVAL, min(wait, MAX_INTERVAL))
 
     @staticmethod
     async def _create_error_embed(
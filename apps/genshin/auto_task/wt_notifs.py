@@ -157,12 +157,12 @@ class WTNotifs:
                 await asyncio.sleep(0.5)
 
     async def _get_domains(self, lang: str):
-        client = AmbrTopAPI(self.bot.session, to_ambr_top(lang))
+        client = AmbrTopAPI(self.bot.sessions.ambr, to_ambr_top(lang))
         domains = await client.get_domains()
         return [d for d in domains if d.weekday == self._now.weekday()]
 
     async def _get_upgrade(self, item_id: str, lang: str, notif_type: NotifType):
-        client = AmbrTopAPI(self.bot.session, to_ambr_top(lang))
+        client = AmbrTopAPI(self.bot.sessions.ambr, to_ambr_top(lang))
         if notif_type is NotifType.TALENT:
             upgrade = await client.get_character_upgrade(item_id)
         else:  # notif_type is NotifType.WEAPON:
@@ -173,7 +173,7 @@ class WTNotifs:
         return upgrade
 
     async def _get_item(self, item_id: str, lang: str, notif_type: NotifType):
-        client = AmbrTopAPI(self.bot.session, to_ambr_top(lang))
+        client = AmbrTopAPI(self.bot.sessions.ambr, to_ambr_top(lang))
         if notif_type is NotifType.TALENT:
             item = await client.get_character(item_id)
         else:
@@ -190,7 +190,7 @@ class WTNotifs:
         fp = await draw_material_card(
             DrawInput(
                 loop=self.bot.loop,
-                session=self.bot.session,
+                session=self.bot.sessions.assets,
                 lang=lang,
                 dark_mode=dark_mode,
             ),
@@ -1,39 +1,215 @@
 import asyncio
-from typing import Dict
+import contextlib
+import time
+from typing import AsyncIterator, Dict, List, Optional
 
 from pyppeteer import launch
-from pyppeteer.browser import Browser
+from pyppeteer.browser import Browser, BrowserContext
 
 from apps.text_map import GENSHIN_OPTIMIZER_LANGS
+from utils import log
 
+GENSHIN_OPTIMIZER_URL = "https://frzyc.github.io/genshin-optimizer/#/setting"
+LANG_DROPDOWN = "button#dropdownbtn.MuiButtonBase-root.MuiButton-root.MuiButton-contained.MuiButton-containedPrimary.MuiButton-sizeMedium.MuiButton-containedSizeMedium.MuiButton-fullWidth.css-z7p9wm"
+LANG_OPTION = "div.MuiPaper-root.MuiPaper-elevation.MuiPaper-rounded.MuiPaper-elevation0.css-16nqea3 > div > ul.MuiList-root.MuiList-padding.css-1925rlh > li.MuiButtonBase-root.MuiMenuItem-root.MuiMenuItem-gutters.css-szd4wn:nth-child({})"
 
-async def launch_browsers() -> Dict[str, Browser]:
-    result = {}
-    for key, value in GENSHIN_OPTIMIZER_LANGS.items():
-        browser = await launch({"headless": True, "args": ["--no-sandbox"]})
-        page = await browser.newPage()
-        await page.setViewport({"width": 1440, "height": 900})
-        await page.goto("https://frzyc.github.io/genshin-optimizer/#/setting")
-        lang_dropdown = "button#dropdownbtn.MuiButtonBase-root.MuiButton-root.MuiButton-contained.MuiButton-containedPrimary.MuiButton-sizeMedium.MuiButton-containedSizeMedium.MuiButton-fullWidth.css-z7p9wm"
-        await page.waitForSelector(lang_dropdown)
-        if key != "en-US":
-            await page.click(lang_dropdown)
-            await asyncio.sleep(0.5)
-            await page.click(
-                f"div.MuiPaper-root.MuiPaper-elevation.MuiPaper-rounded.MuiPaper-elevation0.css-16nqea3 > div > ul.MuiList-root.MuiList-padding.css-1925rlh > li.MuiButtonBase-root.MuiMenuItem-root.MuiMenuItem-gutters.css-szd4wn:nth-child({value})"
-            )
-        await page.close()
-        result[key] = browser
-    return result
 
+class BrowserPool:
+    """A small pool of headless browsers shared by the damage calculator
+
+    Instead of keeping one browser per Genshin Optimizer language alive, the pool
+    launches at most ``max_browsers`` browsers and gives every language its own
+    incognito context (Genshin Optimizer keeps the language in local storage,
+    which is isolated per context). Contexts are created on demand and closed
+    after being idle for ``idle_timeout`` seconds, unless a damage calculator view
+    still holds a lease on them.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_browsers: int = 2,
+        max_jobs: int = 4,
+        idle_timeout: int = 1800,
+        check_interval: int = 300,
+        langs: Optional[List[str]] = None,
+    ):
+        self.max_browsers = max_browsers
+        self.idle_timeout = idle_timeout
+        self.check_interval = check_interval
+        self.langs = langs or list(GENSHIN_OPTIMIZER_LANGS.keys())
+
+        self._browsers: List[Browser] = []
+        self._contexts: Dict[str, BrowserContext] = {}
+        self._last_used: Dict[str, float] = {}
+        self._leases: Dict[int, int] = {}
+        """Context ID to the number of views using it"""
+        self._lock = asyncio.Lock()
+        self._jobs = asyncio.Semaphore(max_jobs)
+        self._maintain_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Launch the first browser and start the maintenance loop"""
+        async with self._lock:
+            if not self._browsers:
+                self._browsers.append(await self._launch_browser())
+        if self._maintain_task is None:
+            self._maintain_task = asyncio.create_task(self._maintain_loop())
+
+    async def acquire(self, lang: str) -> BrowserContext:
+        """Lease the browser context of a Genshin Optimizer language, creating it if needed
+
+        The context is not evicted until it is given back with ``release``.
+
+        Args:
+            lang (str): The language, falls back to en-US if it is not supported
+
+        Returns:
+            BrowserContext: A context that can open pages like a browser
+        """
+        if lang not in self.langs:
+            lang = "en-US"
+
+        async with self._lock:
+            self._last_used[lang] = time.monotonic()
+            context = self._contexts.get(lang)
+            if context is not None:
+                self._leases[id(context)] = self._leases.get(id(context), 0) + 1
+                return context
+
+            browser = await self._pick_browser()
+            context = await browser.createIncognitoBrowserContext()
+            try:
+                await self._set_language(context, lang)
+            except Exception:
+                await context.close()
+                raise
+            self._contexts[lang] = context
+            self._leases[id(context)] = 1
+            log.info(f"[BrowserPool] Created context for {lang}")
+            return context
+
+    def release(self, context: BrowserContext) -> None:
+        """Give back a context leased with ``acquire``"""
+        leases = self._leases.get(id(context), 0) - 1
+        if leases > 0:
+            self._leases[id(context)] = leases
+        else:
+            self._leases.pop(id(context), None)
+
+    @contextlib.asynccontextmanager
+    async def job(self, lang: str) -> AsyncIterator[None]:
+        """Limit the number of damage calculations running at the same time
 
-def get_browser(browsers: Dict[str, Browser], lang: str) -> Browser:
-    result = browsers.get(lang)
-    if result is None:
-        return browsers["en-US"]
-    return result
+        Args:
+            lang (str): The language of the context used by the job, kept alive while it runs
+        """
+        if lang not in self.langs:
+            lang = "en-US"
+        async with self._jobs:
+            self._last_used[lang] = time.monotonic()
+            try:
+                yield
+            finally:
+                self._last_used[lang] = time.monotonic()
 
+    async def evict_idle(self) -> None:
+        """Close contexts that have not been used for ``idle_timeout`` seconds
+
+        Contexts that are leased are kept.
+        """
+        now = time.monotonic()
+        async with self._lock:
+            for lang, context in list(self._contexts.items()):
+                if now - self._last_used.get(lang, 0) < self.idle_timeout:
+                    continue
+                if self._leases.get(id(context)):
+                    continue
+                self._contexts.pop(lang)
+                self._last_used.pop(lang, None)
+                await self._close_context(context)
+                log.info(f"[BrowserPool] Evicted idle context for {lang}")
+
+    async def health_check(self) -> None:
+        """Drop browsers that stopped responding along with their contexts
+
+        Views still leasing a dropped context fail their next calculation, the
+        context is created again in a new browser for the views opened after.
+        """
+        async with self._lock:
+            for browser in list(self._browsers):
+                try:
+                    await asyncio.wait_for(browser.version(), timeout=10)
+                except Exception as e:  # skipcq: PYL-W0703
+                    log.warning("[BrowserPool] Browser is unhealthy", exc_info=e)
+                    self._browsers.remove(browser)
+                    for lang, context in list(self._contexts.items()):
+                        if context.browser is browser:
+                            self._contexts.pop(lang)
+                    with contextlib.suppress(Exception):
+                        await browser.close()
+
+    async def close(self) -> None:
+        if self._maintain_task is not None:
+            self._maintain_task.cancel()
+            self._maintain_task = None
+        async with self._lock:
+            for browser in self._browsers:
+                with contextlib.suppress(Exception):
+                    await browser.close()
+            self._browsers.clear()
+            self._contexts.clear()
+            self._last_used.clear()
+            self._leases.clear()
+
+    async def _maintain_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self.health_check()
+                await self.evict_idle()
+            except Exception as e:  # skipcq: PYL-W0703
+                log.warning("[BrowserPool] Maintenance failed", exc_info=e)
+
+    async def _pick_browser(self) -> Browser:
+        """Return the browser with the fewest contexts, launching a new one if allowed"""
+        counts = {id(b): 0 for b in self._browsers}
+        for context in self._contexts.values():
+            if id(context.browser) in counts:
+                counts[id(context.browser)] += 1
+
+        if len(self._browsers) < self.max_browsers and (
+            not self._browsers or min(counts.values()) > 0
+        ):
+            browser = await self._launch_browser()
+            self._browsers.append(browser)
+            return browser
+
+        return min(self._browsers, key=lambda b: counts[id(b)])
+
+    @staticmethod
+    async def _launch_browser() -> Browser:
+        return await launch({"headless": True, "args": ["--no-sandbox"]})
+
+    @staticmethod
+    async def _set_language(context: BrowserContext, lang: str) -> None:
+        if lang == "en-US":
+            return
+
+        page = await context.newPage()
+        try:
+            await page.setViewport({"width": 1440, "height": 900})
+            await page.goto(GENSHIN_OPTIMIZER_URL)
+            await page.waitForSelector(LANG_DROPDOWN)
+            await page.click(LANG_DROPDOWN)
+            await asyncio.sleep(0.5)
+            await page.click(LANG_OPTION.format(GENSHIN_OPTIMIZER_LANGS[lang]))
+        finally:
+            await page.close()
 
-async def launch_debug_browser() -> Browser:
-    browser = await launch({"headless": True, "args": ["--no-sandbox"]})
-    return browser
+    @staticmethod
+    async def _close_context(context: BrowserContext) -> None:
+        try:
+            await context.close()
+        except Exception as e:  # skipcq: PYL-W0703
+            log.warning("[BrowserPool] Failed to close context", exc_info=e)
@@ -0,0 +1,398 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+import cachetools
+from attr import define
+from enkanetwork.model.character import CharacterInfo
+
+import ambr
+from apps.text_map import to_ambr_top
+from data.game.level_multiplier import LEVEL_MULTIPLIER
+
+ENEMY_LEVEL = 100
+"""Enemy level, same as Genshin Optimizer's default"""
+ENEMY_RES = 0.1
+"""Enemy elemental and physical resistance, same as Genshin Optimizer's default"""
+
+PARAM_PATTERN = re.compile(r"\{param(\d+):([^}]+)\}")
+HITS_PATTERN = re.compile(r"[×*xX]\s*(\d+)")
+NOT_DAMAGE_KEYWORDS = ("Bonus", "Increase", "Reduction", "Absorption", "RES")
+
+AMPLIFYING_REACTIONS: Dict[str, Dict[str, float]] = {
+    "vaporize": {"Pyro": 1.5, "Hydro": 2.0},
+    "melt": {"Pyro": 2.0, "Cryo": 1.5},
+}
+ADDITIVE_REACTIONS: Dict[str, Tuple[str, float]] = {
+    "spread": ("Dendro", 1.25),
+    "aggravate": ("Electro", 1.15),
+}
+MELEE_WEAPONS = ("WEAPON_SWORD_ONE_HAND", "WEAPON_CLAYMORE", "WEAPON_POLE")
+SPRINT_SKILL_IDS = (10013, 10413)
+"""Alternate sprints of Ayaka and Mona, listed as skills but not leveled"""
+
+_result_cache: cachetools.LRUCache = cachetools.LRUCache(maxsize=1024)
+
+
+@define
+class Term:
+    param: int
+    """Index of the talent param"""
+    percent: bool
+    """Whether the param is a multiplier on a stat or a flat value"""
+    stat: str
+    """The stat the multiplier scales with: atk, hp, def or em"""
+    hits: int = 1
+
+
+@define
+class DamageRow:
+    label: str
+    damage: List[int]
+    """One value per alternative, e.g. low and high plunge"""
+
+
+@define
+class TalentDamage:
+    name: str
+    rows: List[DamageRow]
+
+
+@define
+class _TalentRow:
+    label: str
+    physical: bool
+    alternatives: List[List[Term]]
+
+
+@define
+class _Talent:
+    name: str
+    icon: str
+    """File name of the talent icon, shared by ambr.top and Enka.network"""
+    rows: List[_TalentRow]
+    params: Dict[int, List[float]]
+    """Talent params by talent level"""
+
+
+def _scaling_stat(text: str) -> str:
+    if "HP" in text:
+        return "hp"
+    if "DEF" in text:
+        return "def"
+    if "Elemental Mastery" in text or "EM" in text:
+        return "em"
+    return "atk"
+
+
+def parse_value(value: str) -> List[List[Term]]:
+    """Parse the value part of an English talent description row
+
+    Args:
+        value (str): e.g. "{param1:F1P}×2" or "{param1:F1P} ATK + {param2:F1P} Elemental Mastery"
+
+    Returns:
+        List[List[Term]]: Alternatives (split by "/") made of summed terms (split by "+")
+    """
+    alternatives: List[List[Term]] = []
+    for alternative in value.split("/"):
+        terms: List[Term] = []
+        for term in alternative.split("+"):
+            match = PARAM_PATTERN.search(term)
+            if match is None:
+                continue
+            rest = term[match.end() :]
+            hits = HITS_PATTERN.search(rest)
+            terms.append(
+                Term(
+                    param=int(match.group(1)) - 1,
+                    percent="P" in match.group(2),
+                    stat=_scaling_stat(rest),
+                    hits=int(hits.group(1)) if hits else 1,
+                )
+            )
+        if terms:
+            alternatives.append(terms)
+    return alternatives
+
+
+def _is_damage_row(label: str, alternatives: List[List[Term]]) -> bool:
+    if "DMG" not in label or any(k in label for k in NOT_DAMAGE_KEYWORDS):
+        return False
+    return bool(alternatives) and all(
+        any(t.percent for t in terms) for terms in alternatives
+    )
+
+
+def _icon_name(url: str) -> str:
+    return url.rsplit("/", 1)[-1].split(".")[0]
+
+
+def _is_physical(talent_index: int, label: str, weapon_type: str) -> bool:
+    if talent_index != 0 or weapon_type == "WEAPON_CATALYST":
+        return False
+    if weapon_type == "WEAPON_BOW" and "Charged" in label:
+        return False
+    return True
+
+
+def parse_talents(
+    detail: ambr.CharacterDetail, en_detail: ambr.CharacterDetail
+) -> List[_Talent]:
+    """Extract the damage rows of normal attack, elemental skill and elemental burst
+
+    Labels come from ``detail`` so they are localized, while rows are classified
+    with ``en_detail`` since both share the same structure. Alternate sprints are
+    returned as well, they are matched against the character's skills later.
+    """
+    active = [
+        (t, en_t)
+        for t, en_t in zip(detail.talents, en_detail.talents)
+        if t.upgrades and t.type is not ambr.CharacterTalentType.PASSIVE
+    ]
+
+    result: List[_Talent] = []
+    for index, (talent, en_talent) in enumerate(active):
+        upgrades = talent.upgrades or []
+        en_upgrade = (en_talent.upgrades or upgrades)[0]
+        rows: List[_TalentRow] = []
+        for row, en_row in zip(upgrades[0].descriptions, en_upgrade.descriptions):
+            if "|" not in row or "|" not in en_row:
+                continue
+            label = row.split("|")[0]
+            en_label, en_value = en_row.split("|", 1)
+            alternatives = parse_value(en_value)
+            if not _is_damage_row(en_label, alternatives):
+                continue
+            rows.append(
+                _TalentRow(
+                    label=label,
+                    physical=_is_physical(index, en_label, detail.weapon_type),
+                    alternatives=alternatives,
+                )
+            )
+        result.append(
+            _Talent(
+                name=talent.name,
+                icon=_icon_name(talent.icon),
+                rows=rows,
+                params={u.level: u.params for u in upgrades},
+            )
+        )
+    return result
+
+
+def fingerprint(character: CharacterInfo) -> Tuple:
+    """A hashable summary of everything in a build that affects its damage"""
+    stats = character.stats
+    return (
+        character.id,
+        character.level,
+        character.constellations_unlocked,
+        tuple(s.level for s in character.skills),
+        stats.FIGHT_PROP_BASE_HP.value,
+        stats.FIGHT_PROP_BASE_ATTACK.value,
+        stats.FIGHT_PROP_MAX_HP.value,
+        stats.FIGHT_PROP_CUR_ATTACK.value,
+        stats.FIGHT_PROP_CUR_DEFENSE.value,
+        stats.FIGHT_PROP_ELEMENT_MASTERY.value,
+        stats.FIGHT_PROP_CRITICAL.value,
+        stats.FIGHT_PROP_CRITICAL_HURT.value,
+        _dmg_bonus(character, character.element.name),
+        stats.FIGHT_PROP_PHYSICAL_ADD_HURT.value,
+    )
+
+
+def _dmg_bonus(character: CharacterInfo, element: str) -> float:
+    stats = character.stats
+    return {
+        "Pyro": stats.FIGHT_PROP_FIRE_ADD_HURT,
+        "Electro": stats.FIGHT_PROP_ELEC_ADD_HURT,
+        "Hydro": stats.FIGHT_PROP_WATER_ADD_HURT,
+        "Dendro": stats.FIGHT_PROP_GRASS_ADD_HURT,
+        "Anemo": stats.FIGHT_PROP_WIND_ADD_HURT,
+        "Geo": stats.FIGHT_PROP_ROCK_ADD_HURT,
+        "Cryo": stats.FIGHT_PROP_ICE_ADD_HURT,
+        "Physical": stats.FIGHT_PROP_PHYSICAL_ADD_HURT,
+    }[element].value
+
+
+class DamageCalculator:
+    """Calculate the damage of a character's talents in process
+
+    Fallback of the Genshin Optimizer calculator for when its browsers are not
+    available. Uses the character's final stats from Enka.network and the talent
+    scalings from ambr.top with the standard damage formula against a level 100
+    enemy with 10% RES. Elemental resonances from the selected teammates are applied.
+    Weapon passives, artifact set effects, character passives and team buffs are not
+    modeled, so the results are lower bounds of what Genshin Optimizer shows for
+    those builds.
+    """
+
+    def __init__(
+        self,
+        character: CharacterInfo,
+        characters: List[CharacterInfo],
+        session: aiohttp.ClientSession,
+        lang: str,
+        hit_mode: str = "critHit",
+    ):
+        self.current_character = character
+        self.characters = characters
+        self.session = session
+        self.lang = lang
+
+        self.hit_mode = hit_mode
+        self.reaction_mode = ""
+        self.infusion_aura = ""
+        self.team: List[str] = []
+
+        self._talents: Optional[List[_Talent]] = None
+        self._weapon_type = ""
+
+    @property
+    def ambr_id(self) -> str:
+        character = self.current_character
+        if character.id in (10000005, 10000007):
+            return f"{character.id}-{character.element.name.lower()}"
+        return str(character.id)
+
+    @property
+    def team_elements(self) -> List[str]:
+        return [
+            c.element.name for c in self.characters if str(c.id) in self.team
+        ]
+
+    async def calculate(self) -> List[TalentDamage]:
+        """Calculate the damage tables with the current modes, cached per build and mode"""
+        key = (
+            fingerprint(self.current_character),
+            self.lang,
+            self.hit_mode,
+            self.reaction_mode,
+            self.infusion_aura,
+            tuple(sorted(self.team_elements)),
+        )
+        result = _result_cache.get(key)
+        if result is None:
+            result = [
+                self._calculate_talent(talent, level)
+                for talent, level in await self._get_leveled_talents()
+            ]
+            _result_cache[key] = result
+        return result
+
+    async def _get_talents(self) -> List[_Talent]:
+        if self._talents is None:
+            client = ambr.AmbrTopAPI(self.session, to_ambr_top(self.lang))
+            en_client = ambr.AmbrTopAPI(self.session, "en")
+            detail = await client.get_character_detail(self.ambr_id)
+            en_detail = await en_client.get_character_detail(self.ambr_id)
+            if detail is None or en_detail is None:
+                raise ValueError(f"Character {self.ambr_id} not found on ambr.top")
+            self._weapon_type = detail.weapon_type
+            self._talents = parse_talents(detail, en_detail)
+        return self._talents
+
+    async def _get_leveled_talents(self) -> List[Tuple[_Talent, int]]:
+        """Normal attack, elemental skill and elemental burst with their levels
+
+        Talents are matched with the character's skills by icon, so alternate sprints
+        listed among the talents are skipped.
+        """
+        talents = await self._get_talents()
+        skills = [
+            s
+            for s in self.current_character.skills
+            if s.id not in SPRINT_SKILL_IDS
+        ]
+        levels = {_icon_name(s.icon.url): s.level for s in skills if s.icon is not None}
+        matched = [(t, levels[t.icon]) for t in talents if t.icon in levels]
+        if len(matched) == len(skills):
+            return matched
+
+        # icons don't match, ambr.top lists an alternate sprint before the burst
+        if len(talents) > len(skills):
+            talents = talents[:2] + talents[-1:]
+        return [(t, s.level) for t, s in zip(talents, skills)]
+
+    def _stats(self) -> Dict[str, float]:
+        stats = self.current_character.stats
+        result = {
+            "atk": stats.FIGHT_PROP_CUR_ATTACK.value,
+            "hp": stats.FIGHT_PROP_MAX_HP.value,
+            "def": stats.FIGHT_PROP_CUR_DEFENSE.value,
+            "em": stats.FIGHT_PROP_ELEMENT_MASTERY.value,
+            "crit_rate": stats.FIGHT_PROP_CRITICAL.value,
+            "crit_dmg": stats.FIGHT_PROP_CRITICAL_HURT.value,
+        }
+
+        # elemental resonance, only the unconditional ones
+        elements = self.team_elements + [self.current_character.element.name]
+        if elements.count("Pyro") >= 2:
+            result["atk"] += stats.FIGHT_PROP_BASE_ATTACK.value * 0.25
+        if elements.count("Hydro") >= 2:
+            result["hp"] += stats.FIGHT_PROP_BASE_HP.value * 0.25
+        if elements.count("Dendro") >= 2:
+            result["em"] += 50
+        return result
+
+    def _calculate_talent(self, talent: _Talent, level: int) -> TalentDamage:
+        character = self.current_character
+        params = talent.params.get(level) or talent.params[max(talent.params)]
+        stats = self._stats()
+
+        rows: List[DamageRow] = []
+        for row in talent.rows:
+            element = character.element.name
+            if row.physical:
+                if self.infusion_aura and self._weapon_type in MELEE_WEAPONS:
+                    element = self.infusion_aura.capitalize()
+                else:
+                    element = "Physical"
+            damage = [
+                round(self._calculate_hit(terms, params, stats, element))
+                for terms in row.alternatives
+            ]
+            rows.append(DamageRow(label=row.label, damage=damage))
+        return TalentDamage(name=talent.name, rows=rows)
+
+    def _calculate_hit(
+        self,
+        terms: List[Term],
+        params: List[float],
+        stats: Dict[str, float],
+        element: str,
+    ) -> float:
+        character = self.current_character
+        em = stats["em"]
+
+        base = 0.0
+        for term in terms:
+            if term.param >= len(params):
+                continue
+            value = params[term.param]
+            if term.percent:
+                value *= stats[term.stat]
+            base += value * term.hits
+
+        additive = ADDITIVE_REACTIONS.get(self.reaction_mode)
+        if additive is not None and additive[0] == element:
+            level_multiplier = LEVEL_MULTIPLIER.get(character.level, LEVEL_MULTIPLIER[90])
+            base += additive[1] * level_multiplier * (1 + 5 * em / (em + 1200))
+
+        damage = base * (1 + _dmg_bonus(character, element))
+
+        if self.hit_mode == "critHit":
+            damage *= 1 + stats["crit_dmg"]
+        elif self.hit_mode == "avgHit":
+            damage *= 1 + min(stats["crit_rate"], 1) * stats["crit_dmg"]
+
+        damage *= (character.level + 100) / (character.level + ENEMY_LEVEL + 200)
+        damage *= 1 - ENEMY_RES
+
+        amplifying = AMPLIFYING_REACTIONS.get(self.reaction_mode, {}).get(element)
+        if amplifying is not None:
+            damage *= amplifying * (1 + 2.78 * em / (em + 1400))
+
+        return damage
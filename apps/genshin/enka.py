@@ -7,6 +7,7 @@ import enkanetwork
 
 from apps.enka.models import EnkaInfoResponse
 from dev.exceptions import NoCharacterFound
+from utils.general import fan_out
 
 
 async def get_enka_info(uid: int, session: aiohttp.ClientSession) -> EnkaInfoResponse:
@@ -26,6 +27,8 @@ async def get_enka_data(
 ]:
     async with enkanetwork.EnkaNetworkAPI(lang=lang) as enka:
         try:
+            # enkanetwork keeps the asset language in class attributes,
+            # so the two fetches can't run concurrently
             data = await enka.fetch_user(uid)
 
             await enka.set_language(enkanetwork.Language.EN)
@@ -33,22 +36,36 @@ async def get_enka_data(
         except enkanetwork.exception.VaildateUIDError as e:
             raise e
         except Exception as e:  # skipcq: PYL-W0703
-            cache = await get_enka_cache(uid, pool)
-            en_cache = await get_enka_cache(uid, pool, en=True)
+            cache, en_cache = await get_enka_caches(uid, pool)
             if not cache or not en_cache:
                 raise e
             return cache, en_cache, None
         else:
             await update_enka_cache(uid, data, en_data, pool)
 
-            cache = await get_enka_cache(uid, pool)
-            en_cache = await get_enka_cache(uid, pool, en=True)
+            cache, en_cache = await get_enka_caches(uid, pool)
 
             if not (cache and en_cache):
                 raise AssertionError
             return cache, en_cache, data
 
 
+async def get_enka_caches(
+    uid: int, pool: asyncpg.Pool
+) -> Tuple[
+    Optional[enkanetwork.model.EnkaNetworkResponse],
+    Optional[enkanetwork.model.EnkaNetworkResponse],
+]:
+    """Get the cache and the English cache of a player concurrently"""
+    results = await fan_out(
+        {
+            "cache": get_enka_cache(uid, pool),
+            "en_cache": get_enka_cache(uid, pool, en=True),
+        }
+    )
+    return results["cache"], results["en_cache"]
+
+
 async def get_enka_cache(
     uid: int, pool: asyncpg.Pool, en: bool = False
 ) -> Optional[enkanetwork.model.EnkaNetworkResponse]:
@@ -110,8 +127,7 @@ async def update_enka_cache(
     if current_data.characters is None or current_en_data.characters is None:
         raise NoCharacterFound
 
-    cache = await get_enka_cache(uid, pool)
-    en_cache = await get_enka_cache(uid, pool, en=True)
+    cache, en_cache = await get_enka_caches(uid, pool)
 
     if cache is None or en_cache is None:
         await save_enka_cache(uid, current_data, pool)
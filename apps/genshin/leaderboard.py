@@ -1,13 +1,28 @@
-from typing import List
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
 
-import asyncpg
 import genshin
+from attr import define
 from discord import utils
 
-from utils import get_current_abyss_season
+from apps.db.main import Database
+from apps.db.tables.abyss_chara_board import AbyssTeam, AbyssTeamsEntry
+from utils import get_current_abyss_season, log
 
 
-async def update_user_abyss_leaderboard(
+@define
+class AbyssBoardRecord:
+    """A user's abyss leaderboard entry and floor 12 teams, ready to be written"""
+
+    uid: int
+    season: int
+    board_row: Tuple[Any, ...]
+    """Values of an ``abyss_leaderboard`` row, in the order of ``AbyssBoard.update``"""
+    teams: Optional[AbyssTeamsEntry]
+    """None if floor 12 was not reached"""
+
+
+def build_abyss_record(
     abyss_data: genshin.models.SpiralAbyss,
     user_data: genshin.models.PartialGenshinUserStats,
     characters: List[genshin.models.Character],
@@ -15,48 +30,14 @@ async def update_user_abyss_leaderboard(
     user_name: str,
     user_id: int,
     previous: int,
-    pool: asyncpg.Pool,
-) -> None:
+) -> AbyssBoardRecord:
     character = abyss_data.ranks.strongest_strike[0]
     g_c = utils.get(characters, id=character.id)
     if not g_c:
         raise AssertionError
 
     current_season = get_current_abyss_season() - previous
-
-    runs = None
-    wins = None
-    row = await pool.fetchrow(
-        """
-        SELECT runs, wins, stars_collected
-        FROM abyss_leaderboard
-        WHERE uid = $1 AND season = $2
-        """,
-        uid,
-        current_season,
-    )
-    if row and row["stars_collected"] == 36:
-        runs = row["runs"]
-        wins = row["wins"]
-
-    await pool.execute(
-        """
-        INSERT INTO abyss_leaderboard
-            (single_strike, floor, stars_collected, uid,
-            user_name, user_id, season, runs, wins, icon_url,
-            level, const, refine, c_level, c_icon)
-        VALUES
-            ($1, $2, $3, $4, $5, $6, $7, $8,
-            $9, $10, $11, $12, $13, $14, $15)
-        ON CONFLICT
-            (uid, season)
-        DO UPDATE SET
-            single_strike = $1, floor = $2,
-            stars_collected = $3, user_name = $5,
-            user_id = $6, runs = $8, wins = $9,
-            icon_url = $10, level = $11, const = $12,
-            refine = $13, c_level = $14, c_icon = $15
-        """,
+    board_row = (
         character.value,
         abyss_data.max_floor,
         abyss_data.total_stars,
@@ -64,8 +45,8 @@ async def update_user_abyss_leaderboard(
         user_name,
         user_id,
         current_season,
-        runs or abyss_data.total_battles,
-        wins or int(abyss_data.total_wins),
+        abyss_data.total_battles,
+        int(abyss_data.total_wins),
         abyss_data.ranks.most_played[0].icon,
         user_data.info.level,
         g_c.constellation,
@@ -75,26 +56,104 @@ async def update_user_abyss_leaderboard(
     )
 
     # character usage rate (only take floor 12 data)
+    teams = None
     floor = utils.get(abyss_data.floors, floor=12)
     if floor:
-        used_characters: List[int] = []
-        for c in floor.chambers:
-            for b in c.battles:
-                for chara in b.characters:
-                    used_characters.append(chara.id)
-        await pool.execute(
-            """
-            INSERT INTO abyss_character_leaderboard
-                (uid, characters, user_id, season)
-            VALUES
-                ($1, $2, $3, $4)
-            ON CONFLICT
-                (uid, season)
-            DO UPDATE SET
-                characters = $2, user_id = $3
-            """,
-            uid,
-            used_characters,
-            user_id,
-            current_season,
+        teams = AbyssTeamsEntry(
+            uid=uid,
+            user_id=user_id,
+            season=current_season,
+            teams=[
+                AbyssTeam(
+                    chamber=c.chamber,
+                    half=b.half,
+                    characters=sorted(chara.id for chara in b.characters),
+                )
+                for c in floor.chambers
+                for b in c.battles
+            ],
         )
+
+    return AbyssBoardRecord(uid, current_season, board_row, teams)
+
+
+async def write_abyss_records(records: List[AbyssBoardRecord], db: Database) -> None:
+    """Write abyss leaderboard records with batched upserts"""
+    if not records:
+        return
+    await db.leaderboard.abyss.update([r.board_row for r in records])
+    await db.leaderboard.abyss_character.update([r.teams for r in records if r.teams])
+
+
+class AbyssBoardWriter:
+    """Buffers abyss leaderboard records so they are written in batches
+
+    Records of the same UID and season replace each other until they are flushed.
+    When a batch fails its records are written one at a time, a record that fails
+    ``max_attempts`` flushes in a row is dropped.
+    """
+
+    def __init__(self, batch_size: int = 100, max_attempts: int = 3) -> None:
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self._records: Dict[Tuple[int, int], AbyssBoardRecord] = {}
+        self._attempts: Dict[Tuple[int, int], int] = {}
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def add(self, record: AbyssBoardRecord) -> None:
+        key = (record.uid, record.season)
+        self._records[key] = record
+        self._attempts.pop(key, None)
+
+    async def flush(self, db: Database) -> int:
+        """Write the buffered records
+
+        Returns:
+            int: Number of records written
+        """
+        async with self._lock:
+            records = list(self._records.values())
+            self._records.clear()
+            written = 0
+            for start in range(0, len(records), self.batch_size):
+                batch = records[start : start + self.batch_size]
+                try:
+                    await write_abyss_records(batch, db)
+                except Exception:  # skipcq: PYL-W0703
+                    log.exception("[Abyss Board] Failed to write records")
+                    for record in batch:
+                        written += await self._write_one(record, db)
+                else:
+                    written += len(batch)
+                    for record in batch:
+                        self._attempts.pop((record.uid, record.season), None)
+            return written
+
+    async def _write_one(self, record: AbyssBoardRecord, db: Database) -> int:
+        key = (record.uid, record.season)
+        try:
+            await write_abyss_records([record], db)
+        except Exception as e:  # skipcq: PYL-W0703
+            if key in self._records:
+                # replaced by a newer record while flushing
+                return 0
+            attempts = self._attempts.get(key, 0) + 1
+            if attempts >= self.max_attempts:
+                self._attempts.pop(key, None)
+                log.warning(
+                    f"[Abyss Board] Dropped [UID]{record.uid} [Season]{record.season} "
+                    f"after {attempts} attempts: {type(e).__name__}: {e}"
+                )
+            else:
+                self._attempts[key] = attempts
+                self._records[key] = record
+            return 0
+
+        self._attempts.pop(key, None)
+        return 1
+
+
+abyss_board_writer = AbyssBoardWriter()
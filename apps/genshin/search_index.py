@@ -0,0 +1,148 @@
+import random
+import unicodedata
+from typing import Dict, List, Set, Tuple
+
+from attr import define
+
+EXCLUDED_IDS = ("10000005", "10000007")  # traveler
+
+
+def normalize(text: str) -> str:
+    """Casefold and strip accents so "Ayaka", "ayaka" and "Ayakà" are the same"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def word_trigrams(words: List[str]) -> Set[str]:
+    """Trigrams of each word padded with spaces, so word starts and ends weigh in fuzzy matches"""
+    return set().union(*(trigrams(f" {word} ") for word in words))
+
+
+@define
+class SearchEntry:
+    item_id: str
+    name: str
+    normalized: str
+    words: List[str]
+
+
+class LangIndex:
+    """Trigram index over the item names of one language"""
+
+    def __init__(self, entries: List[SearchEntry]) -> None:
+        self.entries = entries
+        self.postings: Dict[str, Set[int]] = {}
+        for index, entry in enumerate(entries):
+            for gram in word_trigrams(entry.words):
+                self.postings.setdefault(gram, set()).add(index)
+
+    def search(self, query: str, limit: int) -> List[SearchEntry]:
+        tokens = normalize(query).split()
+        if not tokens:
+            return random.sample(self.entries, min(limit, len(self.entries)))
+
+        grams = set().union(*(trigrams(token) for token in tokens))
+        candidates = self._candidates(grams)
+        matches = [
+            self.entries[index]
+            for index in candidates
+            if all(token in self.entries[index].normalized for token in tokens)
+        ]
+        if matches:
+            phrase = " ".join(tokens)
+            matches.sort(key=lambda e: self._rank(e, phrase, tokens[0]))
+            return matches[:limit]
+
+        return self._fuzzy(word_trigrams(tokens), limit)
+
+    def _candidates(self, grams: Set[str]) -> Set[int] | range:
+        if not grams:
+            # queries shorter than three characters are checked against every name
+            return range(len(self.entries))
+
+        postings = sorted(
+            (self.postings.get(gram, set()) for gram in grams), key=len
+        )
+        return set.intersection(*postings)
+
+    def _fuzzy(self, grams: Set[str], limit: int) -> List[SearchEntry]:
+        """Rank names by the trigrams they share with the query, for typos"""
+        if len(grams) < 4:
+            return []
+
+        scores: Dict[int, int] = {}
+        for gram in grams:
+            for index in self.postings.get(gram, ()):
+                scores[index] = scores.get(index, 0) + 1
+
+        threshold = len(grams) / 2
+        best = sorted(
+            (i for i, score in scores.items() if score >= threshold),
+            key=lambda i: (-scores[i], len(self.entries[i].name)),
+        )
+        return [self.entries[i] for i in best[:limit]]
+
+    @staticmethod
+    def _rank(entry: SearchEntry, phrase: str, first: str) -> Tuple[int, int, str]:
+        if entry.normalized == phrase:
+            tier = 0
+        elif entry.normalized.startswith(phrase):
+            tier = 1
+        elif any(word.startswith(first) for word in entry.words):
+            tier = 2
+        else:
+            tier = 3
+        return tier, len(entry.name), entry.name
+
+
+class SearchIndex:
+    """Search index for the /search autocomplete
+
+    Args:
+        item_maps (Dict[str, Dict[str, Dict[str, str]]]): Item type to the text map of that type
+        (item ID to ambr.top locale to name), in order of priority
+    """
+
+    def __init__(self, item_maps: Dict[str, Dict[str, Dict[str, str]]]) -> None:
+        self.item_types: Dict[str, str] = {}
+        """Item ID to item type"""
+        self._names: Dict[str, List[Tuple[str, str]]] = {}
+        self._indexes: Dict[str, LangIndex] = {}
+
+        for item_type, item_map in item_maps.items():
+            for item_id, names in item_map.items():
+                if item_id in self.item_types:
+                    continue
+                self.item_types[item_id] = item_type
+                if item_id in EXCLUDED_IDS:
+                    continue
+                for lang, name in names.items():
+                    if name:
+                        self._names.setdefault(lang, []).append((item_id, name))
+
+    def search(
+        self, query: str, lang: str, limit: int = 25
+    ) -> List[Tuple[str, str]]:
+        """Search item names of a language
+
+        Returns:
+            List[Tuple[str, str]]: Item ID and name of the best matches
+        """
+        index = self._get_index(lang)
+        return [(e.item_id, e.name) for e in index.search(query, limit)]
+
+    def _get_index(self, lang: str) -> LangIndex:
+        # languages are indexed on first use, most users share a few languages
+        if lang not in self._indexes:
+            entries = []
+            for item_id, name in self._names.get(lang, []):
+                normalized = normalize(name)
+                entries.append(
+                    SearchEntry(item_id, name, normalized, normalized.split())
+                )
+            self._indexes[lang] = LangIndex(entries)
+        return self._indexes[lang]
@@ -1,7 +1,11 @@
 import asyncio
+import collections
 import json
+import os
+import time
 import typing
 import uuid
+import zipfile
 
 import aiofiles
 import aiohttp
@@ -11,19 +15,32 @@ import dev.asset as asset
 from apps.db.tables.hoyo_account import HoyoAccount
 from apps.text_map import AMBR_LANGS
 from data.game.elements import convert_element
-from utils import get_element_name
+from utils import JSONFetcher, get_element_name, log
 
 # abyss.json
 
 
-def add_abyss_entry(
-    result: typing.Dict[str, typing.Any],
+ABYSS_JSON_DIR = "data/abyss_json"
+
+
+def get_unfinished_abyss_seasons() -> typing.List[int]:
+    """Seasons with an abyss.json run that was started but not cleaned up"""
+    try:
+        names = os.listdir(ABYSS_JSON_DIR)
+    except FileNotFoundError:
+        return []
+    return sorted(
+        int(name[: -len(".done")])
+        for name in names
+        if name.endswith(".done") and name[: -len(".done")].isdigit()
+    )
+
+
+def build_abyss_entry(
     account: HoyoAccount,
     abyss: genshin.models.SpiralAbyss,
     characters: typing.List[genshin.models.Character],
-) -> None:
-    result["size"] += 1
-
+) -> typing.Dict[str, typing.Any]:
     data_id = str(uuid.uuid4())
     abyss_dict = {
         "id": data_id,
@@ -59,18 +76,208 @@ def add_abyss_entry(
         user_dict["avatars"].append(character_dict)
 
     abyss_dict["user"] = user_dict
-    result["data"].append(abyss_dict)
+    return abyss_dict
+
+
+class RegionLimiter:
+    """Spaces out requests to the same game server region"""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._locks: typing.Dict[str, asyncio.Lock] = {}
+        self._last: typing.Dict[str, float] = {}
+
+    async def wait(self, region: str) -> None:
+        lock = self._locks.setdefault(region, asyncio.Lock())
+        async with lock:
+            delay = self._last.get(region, 0.0) + self.interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._last[region] = time.monotonic()
+
+
+class AbyssJSONGenerator:
+    """Generate the abyss.json dataset of a season
+
+    Entries are appended to ``<season>.jsonl`` as they are fetched and the UIDs that are done
+    are appended to ``<season>.done``, so a run that is interrupted resumes where it stopped.
+    The zip file is written from the JSON lines at the end, one entry at a time.
+    The files stay until :meth:`clean` is called after the zip file is sent.
+
+    Args:
+        schedule_id (int): The abyss season
+        max_concurrency (int): Number of accounts fetched at the same time
+        region_interval (float): Seconds between two requests to the same region
+    """
+
+    def __init__(
+        self, schedule_id: int, max_concurrency: int = 8, region_interval: float = 0.5
+    ) -> None:
+        self.schedule_id = schedule_id
+        self.max_concurrency = max_concurrency
+        self.limiter = RegionLimiter(region_interval)
+
+        self.entries_path = f"{ABYSS_JSON_DIR}/{schedule_id}.jsonl"
+        self.done_path = f"{ABYSS_JSON_DIR}/{schedule_id}.done"
+        self.zip_path = f"{ABYSS_JSON_DIR}/{schedule_id}.zip"
+
+        self.stats: typing.Counter[str] = collections.Counter()
+        self._write_lock = asyncio.Lock()
+
+    async def run(self, accounts: typing.List[HoyoAccount]) -> str:
+        """Fetch the entries of the accounts that are not done yet and write the zip file
+
+        Returns:
+            str: Path to the zip file
+        """
+        os.makedirs(ABYSS_JSON_DIR, exist_ok=True)
+        done = self._read_done()
+        queue: asyncio.Queue = asyncio.Queue()
+        for account in accounts:
+            if account.uid in done:
+                self.stats["resumed"] += 1
+            # CN server accounts can't be fetched with overseas cookies
+            elif str(account.uid)[0] in ("1", "2", "5"):
+                self.stats["skipped"] += 1
+            else:
+                queue.put_nowait(account)
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(self._worker(queue) for _ in range(self.max_concurrency))
+        )
+        elapsed = time.perf_counter() - start
+        self.stats["seconds"] = int(elapsed)
+
+        await asyncio.to_thread(self._write_zip)
+        fetched = self.stats["entries"] + self.stats["not_cleared"]
+        log.info(
+            f"[Abyss JSON] {self.stats['entries']} entries, {self.stats['errors']} errors, "
+            f"{fetched / elapsed if elapsed else 0:.2f} accounts/s, stats: {dict(self.stats)}"
+        )
+        return self.zip_path
+
+    def clean(self) -> None:
+        """Remove the files of the run after the zip file is sent"""
+        for path in (self.entries_path, self.done_path, self.zip_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while not queue.empty():
+            account: HoyoAccount = queue.get_nowait()
+            try:
+                entry = await self._fetch(account)
+            except Exception as e:  # skipcq: PYL-W0703
+                key = f"error:{type(e).__name__}"
+                self.stats["errors"] += 1
+                self.stats[key] += 1
+                if self.stats[key] == 1:
+                    log.warning(
+                        f"[Abyss JSON] First {type(e).__name__} [UID]{account.uid}: {e}"
+                    )
+                continue
+
+            async with self._write_lock:
+                if entry is not None:
+                    async with aiofiles.open(
+                        self.entries_path, "a", encoding="utf-8"
+                    ) as f:
+                        await f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                    self.stats["entries"] += 1
+                else:
+                    self.stats["not_cleared"] += 1
+                async with aiofiles.open(self.done_path, "a", encoding="utf-8") as f:
+                    await f.write(f"{account.uid}\n")
+
+    async def _fetch(
+        self, account: HoyoAccount
+    ) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        client = await account.get_client("en-us")
+        region = genshin.utility.recognize_genshin_server(account.uid)
+
+        await self.limiter.wait(region)
+        abyss = await client.get_genshin_spiral_abyss(account.uid)
+        if abyss.total_stars != 36:
+            return None
+        await self.limiter.wait(region)
+        characters = await client.get_genshin_characters(account.uid)
+        return build_abyss_entry(account, abyss, list(characters))
+
+    def _read_done(self) -> typing.Set[int]:
+        try:
+            with open(self.done_path, encoding="utf-8") as f:
+                return {int(line) for line in f if line.strip()}
+        except FileNotFoundError:
+            return set()
+
+    def _write_zip(self) -> None:
+        temp = f"{self.zip_path}.tmp"
+        size = 0
+        with zipfile.ZipFile(temp, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            with zip_file.open("data.json", "w") as f:
+                f.write(f'{{"schedule_id": {self.schedule_id}, "data": ['.encode())
+                if os.path.exists(self.entries_path):
+                    with open(self.entries_path, "rb") as entries:
+                        for line in entries:
+                            try:
+                                json.loads(line)
+                            except ValueError:
+                                # a line cut off by a crash
+                                continue
+                            if size:
+                                f.write(b", ")
+                            f.write(line.rstrip(b"\n"))
+                            size += 1
+                f.write(f'], "size": {size}}}'.encode())
+        os.replace(temp, self.zip_path)
 
 
 # text maps
 
 
-async def update_thing_text_map(thing: str, session: aiohttp.ClientSession) -> None:
+async def update_text_maps(
+    things: typing.Sequence[str], session: aiohttp.ClientSession
+) -> None:
+    """Update the text maps of things, the daily dungeon text map and the item name text map
+
+    Every language of every thing is fetched concurrently, the files are written
+    once all of them are fetched.
+    """
+    fetcher = JSONFetcher(session)
+    requests = [
+        (thing, lang)
+        for thing in (*things, "dailyDungeon")
+        for lang in AMBR_LANGS.values()
+    ]
+    responses = await asyncio.gather(
+        *(
+            fetcher.get(f"https://api.ambr.top/v2/{lang}/{thing}")
+            for thing, lang in requests
+        )
+    )
+    data: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+    for (thing, lang), response in zip(requests, responses):
+        data.setdefault(thing, {})[lang] = response
+
+    text_maps = {thing: build_thing_text_map(thing, data[thing]) for thing in things}
+    text_maps["dailyDungeon"] = build_dungeon_text_map(data["dailyDungeon"])
+    text_maps["item_name"] = build_item_text_map(  # type: ignore
+        [text_maps[thing] for thing in things]
+    )
+
+    await asyncio.gather(
+        *(_write_text_map(name, text_map_) for name, text_map_ in text_maps.items())
+    )
+    fetcher.report("Update Text Maps")
+
+
+def build_thing_text_map(
+    thing: str, data: typing.Dict[str, typing.Any]
+) -> typing.Dict[str, typing.Dict[str, str]]:
     update_dict: typing.Dict[str, typing.Dict[str, str]] = {}
     for discord_lang, lang in AMBR_LANGS.items():
-        async with session.get(f"https://api.ambr.top/v2/{lang}/{thing}") as r:
-            data = await r.json()
-        for item_id, item_data in data["data"]["items"].items():
+        for item_id, item_data in data[lang]["data"]["items"].items():
             if item_id not in update_dict:
                 update_dict[item_id] = {}
 
@@ -87,33 +294,27 @@ async def update_thing_text_map(thing: str, session: aiohttp.ClientSession) -> N
     if thing == "avatar":
         update_dict["10000007"] = asset.lumine_name_dict
         update_dict["10000005"] = asset.aether_name_dict
-    async with aiofiles.open(f"text_maps/{thing}.json", "w+", encoding="utf-8") as f:
-        await f.write(json.dumps(update_dict, indent=4, ensure_ascii=False))
+    return update_dict
 
 
-async def update_dungeon_text_map(session: aiohttp.ClientSession) -> None:
-    update_dict = {}
+def build_dungeon_text_map(
+    data: typing.Dict[str, typing.Any]
+) -> typing.Dict[str, typing.Dict[str, str]]:
+    update_dict: typing.Dict[str, typing.Dict[str, str]] = {}
     for lang in list(AMBR_LANGS.values()):
-        async with session.get(f"https://api.ambr.top/v2/{lang}/dailyDungeon") as r:
-            data = await r.json()
-        for _, domains in data["data"].items():
+        for _, domains in data[lang]["data"].items():
             for _, domain_info in domains.items():
                 if str(domain_info["id"]) not in update_dict:
                     update_dict[str(domain_info["id"])] = {}
                 update_dict[str(domain_info["id"])][lang] = domain_info["name"]
-    async with aiofiles.open(
-        "text_maps/dailyDungeon.json", "w+", encoding="utf-8"
-    ) as f:
-        await f.write(json.dumps(update_dict, indent=4, ensure_ascii=False))
+    return update_dict
 
 
-async def update_item_text_map(things_to_update) -> None:
+def build_item_text_map(
+    text_maps: typing.List[typing.Dict[str, typing.Dict[str, str]]]
+) -> typing.Dict[str, str]:
     huge_text_map: typing.Dict[str, str] = {}
-    for thing in things_to_update:
-        async with aiofiles.open(f"text_maps/{thing}.json", "r", encoding="utf-8") as f:
-            text_map_: typing.Dict[str, typing.Dict[str, str]] = json.loads(
-                await f.read()
-            )
+    for text_map_ in text_maps:
         for item_id, item_info in text_map_.items():
             for name in item_info.values():
                 if name in huge_text_map:
@@ -125,8 +326,12 @@ async def update_item_text_map(things_to_update) -> None:
                     huge_text_map[name] = "10000007"
                 else:
                     huge_text_map[name] = item_id
-    async with aiofiles.open("text_maps/item_name.json", "w+", encoding="utf-8") as f:
-        await f.write(json.dumps(huge_text_map, indent=4, ensure_ascii=False))
+    return huge_text_map
+
+
+async def _write_text_map(name: str, text_map_: typing.Dict[str, typing.Any]) -> None:
+    async with aiofiles.open(f"text_maps/{name}.json", "w+", encoding="utf-8") as f:
+        await f.write(json.dumps(text_map_, indent=4, ensure_ascii=False))
 
 
 async def retry_task_five_times(task, *args, **kwargs) -> typing.Any:
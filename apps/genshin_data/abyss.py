@@ -1,138 +1,212 @@
+import asyncio
+import datetime
 import json
-from typing import Any, Dict, List, Tuple
+import os
+from typing import Any, Dict, List, Optional, Tuple
 
-import aiofiles
+from attr import define
 from dateutil import parser
 
+from apps.genshin_data.text_maps import GDTextMap
 from dev.models import AbyssChamber, AbyssFloor, AbyssHalf
 from utils import get_dt_now, get_text, parse_html, time_in_range
 
-TOWER_SCHEDULE = "GenshinData/ExcelBinOutput/TowerScheduleExcelConfigData.json"
+EXCEL_DIR = "GenshinData/ExcelBinOutput"
+TOWER_SCHEDULE = f"{EXCEL_DIR}/TowerScheduleExcelConfigData.json"
+TOWER_FLOOR = f"{EXCEL_DIR}/TowerFloorExcelConfigData.json"
+TOWER_LEVEL = f"{EXCEL_DIR}/TowerLevelExcelConfigData.json"
+DUNGEON_LEVEL_ENTITY = f"{EXCEL_DIR}/DungeonLevelEntityConfigData.json"
+MONSTER_DESCRIBE = f"{EXCEL_DIR}/MonsterDescribeExcelConfigData.json"
+SOURCES = (
+    TOWER_SCHEDULE,
+    TOWER_FLOOR,
+    TOWER_LEVEL,
+    DUNGEON_LEVEL_ENTITY,
+    MONSTER_DESCRIBE,
+)
+FALLBACK_TTL = datetime.timedelta(hours=1)
+"""How long a season is kept when no tower is open, e.g. between seasons"""
+
+
+@define
+class SeasonChamber:
+    num: int
+    enemy_level: int
+    halfs: List[List[int]]
+    """Text map hashes of the enemy names in each half"""
+
+
+@define
+class SeasonFloor:
+    num: int
+    chambers: List[SeasonChamber]
+
+
+@define
+class AbyssSeason:
+    """Language independent data of the current abyss season, texts are text map hashes"""
+
+    close_time: datetime.datetime
+    valid_until: datetime.datetime
+    """The close time, or ``FALLBACK_TTL`` from when it was built if no tower was open"""
+    signature: Tuple[float, ...]
+    """Modification times of the source files the season was built from"""
+    buff_name: int
+    buff_desc: Optional[int]
+    disorders: Dict[int, Optional[List[int]]]
+    """Ley line disorders of each floor, None if the floor is not found"""
+    floors: List[SeasonFloor]
+
+
+@define
+class AbyssData:
+    """Abyss data of the current season in one language"""
+
+    blessing: Tuple[str, str]
+    ley_line_disorders: Dict[int, List[str]]
+    floors: List[AbyssFloor]
+
+
+_season: Optional[AbyssSeason] = None
+_data: Dict[str, AbyssData] = {}
+
+
+async def get_abyss_data(text_map: GDTextMap, lang: str) -> AbyssData:
+    """Get the abyss data of the current season
+
+    The ExcelBinOutput files are only parsed when the season ends or the files change,
+    the result of each language is kept in memory until then.
+    """
+    global _season  # skipcq: PYL-W0603
+
+    if (
+        _season is None
+        or get_dt_now() > _season.valid_until
+        or _season.signature != _get_signature()
+    ):
+        _season = await asyncio.to_thread(build_season)
+        _data.clear()
+
+    if lang not in _data:
+        _data[lang] = _localize(_season, text_map, lang)
+    return _data[lang]
+
+
+def build_season() -> AbyssSeason:
+    signature = _get_signature()
+    tower_schedule = _load(TOWER_SCHEDULE)
+    tower_floors = {f["floorId"]: f for f in _load(TOWER_FLOOR)}
+    tower_levels: Dict[int, List[Dict[str, Any]]] = {}
+    for level in _load(TOWER_LEVEL):
+        tower_levels.setdefault(level["levelGroupId"], []).append(level)
+    dungeon_configs: Dict[int, List[Dict[str, Any]]] = {}
+    for config in _load(DUNGEON_LEVEL_ENTITY):
+        dungeon_configs.setdefault(config["id"], []).append(config)
+    monster_names = {
+        m["id"]: m["nameTextMapHash"] for m in _load(MONSTER_DESCRIBE)
+    }
 
+    current_tower = get_current_tower(tower_schedule)
+
+    buff_configs = dungeon_configs.get(current_tower["monthlyLevelConfigId"], [])
+    floor_ids: List[int] = (
+        current_tower["entranceFloorId"] + current_tower["schedules"][0]["floorList"]
+    )
 
-async def get_abyss_blessing(
-    text_map: Dict[str, Dict[str, str]], lang: str
-) -> Tuple[str, str]:
-    async with aiofiles.open(TOWER_SCHEDULE) as f:
-        tower: List[Dict[str, Any]] = json.loads(await f.read())
-    async with aiofiles.open(
-        "GenshinData/ExcelBinOutput/DungeonLevelEntityConfigData.json"
-    ) as f:
-        dungeon: List[Dict[str, Any]] = json.loads(await f.read())
+    disorders: Dict[int, Optional[List[int]]] = {}
+    floors: List[SeasonFloor] = []
+    for num, floor_id in enumerate(floor_ids, start=1):
+        floor = tower_floors.get(floor_id)
+        if floor is None:
+            disorders[num] = None
+            continue
+
+        disorders[num] = [
+            config["descTextMapHash"]
+            for config in dungeon_configs.get(floor["floorLevelConfigId"], [])
+        ]
+        floors.append(s_floor := SeasonFloor(num=floor["floorIndex"], chambers=[]))
+        for level in tower_levels.get(floor["levelGroupId"], []):
+            s_floor.chambers.append(
+                SeasonChamber(
+                    num=level["levelIndex"],
+                    enemy_level=level["monsterLevel"],
+                    halfs=[
+                        [monster_names[m] for m in half if m in monster_names]
+                        for half in (
+                            level["firstMonsterList"],
+                            level["secondMonsterList"],
+                        )
+                    ],
+                )
+            )
 
-    current_tower = get_current_tower(tower)
+    close_time = parser.parse(current_tower["closeTime"])
+    now = get_dt_now()
+    return AbyssSeason(
+        close_time=close_time,
+        valid_until=close_time if close_time > now else now + FALLBACK_TTL,
+        signature=signature,
+        buff_name=current_tower["buffnameTextMapHash"],
+        buff_desc=buff_configs[0]["descTextMapHash"] if buff_configs else None,
+        disorders=disorders,
+        floors=floors,
+    )
 
-    buff_id = current_tower["monthlyLevelConfigId"]
-    buff_name = get_text(text_map, lang, current_tower["buffnameTextMapHash"])
 
+def _localize(season: AbyssSeason, text_map: GDTextMap, lang: str) -> AbyssData:
     buff_desc = "Unknown"
-    dungeon_configs = find_dungeon_configs(dungeon, buff_id)
-    if dungeon_configs:
-        buff_desc = parse_html(
-            get_text(text_map, lang, dungeon_configs[0]["descTextMapHash"])
+    if season.buff_desc is not None:
+        buff_desc = parse_html(get_text(text_map, lang, season.buff_desc))
+
+    ley_line_disorders: Dict[int, List[str]] = {}
+    for num, hashes in season.disorders.items():
+        if hashes is None:
+            ley_line_disorders[num] = ["Unknown"]
+            continue
+        descs = (parse_html(get_text(text_map, lang, h)) for h in hashes)
+        ley_line_disorders[num] = [d for d in descs if d != "Unknown"]
+
+    floors = [
+        AbyssFloor(
+            num=floor.num,
+            chambers=[
+                AbyssChamber(
+                    num=chamber.num,
+                    enemy_level=chamber.enemy_level,
+                    halfs=[
+                        AbyssHalf(
+                            num=index + 1,
+                            enemies=[get_text(text_map, lang, h) for h in half],
+                        )
+                        for index, half in enumerate(chamber.halfs)
+                    ],
+                )
+                for chamber in floor.chambers
+            ],
         )
+        for floor in season.floors
+    ]
 
-    return buff_name, buff_desc
-
-
-async def get_ley_line_disorders(
-    text_map: Dict[str, Dict[str, str]], lang: str
-) -> Dict[int, List[str]]:
-    async with aiofiles.open(TOWER_SCHEDULE) as f:
-        tower: List[Dict[str, Any]] = json.loads(await f.read())
-    async with aiofiles.open(
-        "GenshinData/ExcelBinOutput/TowerFloorExcelConfigData.json"
-    ) as f:
-        floor: List[Dict[str, Any]] = json.loads(await f.read())
-    async with aiofiles.open(
-        "GenshinData/ExcelBinOutput/DungeonLevelEntityConfigData.json"
-    ) as f:
-        dungeon: List[Dict[str, Any]] = json.loads(await f.read())
-
-    current_tower = get_current_tower(tower)
-
-    result: Dict[int, List[str]] = {}
-    num = 1
-    floor_ids: List[int] = (
-        current_tower["entranceFloorId"] + current_tower["schedules"][0]["floorList"]
+    return AbyssData(
+        blessing=(get_text(text_map, lang, season.buff_name), buff_desc),
+        ley_line_disorders=ley_line_disorders,
+        floors=floors,
     )
-    for floor_id in floor_ids:
-        result[num] = ["Unknown"]
-        floor_excel = find_tower_floor(floor, floor_id)
-        if floor_excel:
-            result[num] = []
-            config_id = floor_excel["floorLevelConfigId"]
-            dungeon_configs = find_dungeon_configs(dungeon, config_id)
-            for dungeon_config in dungeon_configs:
-                disorder_desc = parse_html(
-                    get_text(text_map, lang, dungeon_config["descTextMapHash"])
-                )
-                if disorder_desc != "Unknown":
-                    result[num].append(disorder_desc)
-        num += 1
-
-    return result
-
-
-async def get_abyss_enemies(
-    text_map: Dict[str, Dict[str, str]], lang: str
-) -> List[AbyssFloor]:
-    result: List[AbyssFloor] = []
-
-    async with aiofiles.open(TOWER_SCHEDULE) as f:
-        tower_schedule: List[Dict[str, Any]] = json.loads(await f.read())
-    async with aiofiles.open(
-        "GenshinData/ExcelBinOutput/TowerFloorExcelConfigData.json"
-    ) as f:
-        tower_floor: List[Dict[str, Any]] = json.loads(await f.read())
-    async with aiofiles.open(
-        "GenshinData/ExcelBinOutput/TowerLevelExcelConfigData.json"
-    ) as f:
-        tower_level: List[Dict[str, Any]] = json.loads(await f.read())
-    async with aiofiles.open(
-        "GenshinData/ExcelBinOutput/MonsterDescribeExcelConfigData.json"
-    ) as f:
-        monster_describe: List[Dict[str, Any]] = json.loads(await f.read())
 
-    current_tower = get_current_tower(tower_schedule)
 
-    corridor = current_tower["entranceFloorId"]
-    spire = current_tower["schedules"][0]["floorList"]
-
-    for floor_id in corridor + spire:
-        floor = find_tower_floor(tower_floor, floor_id)
-        result.append(a_floor := AbyssFloor(num=floor["floorIndex"], chambers=[]))
-        tower_levels = find_tower_levels(tower_level, floor["levelGroupId"])
-        for t_level in tower_levels:
-            a_floor.chambers.append(
-                a_chamber := AbyssChamber(
-                    num=t_level["levelIndex"],
-                    enemy_level=t_level["monsterLevel"],
-                    halfs=[],
-                )
-            )
-            halfs: List[List[int]] = [
-                t_level["firstMonsterList"],
-                t_level["secondMonsterList"],
-            ]
-            for index, half in enumerate(halfs):
-                a_chamber.halfs.append(a_half := AbyssHalf(num=index + 1, enemies=[]))
-                for monster_id in half:
-                    monster = find_monster_describe(monster_describe, monster_id)
-                    if monster:
-                        a_half.enemies.append(
-                            get_text(text_map, lang, monster["nameTextMapHash"])
-                        )
+def _load(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
 
-        result.append(a_floor)
 
-    return result
+def _get_signature() -> Tuple[float, ...]:
+    return tuple(os.path.getmtime(path) for path in SOURCES)
 
 
 def get_current_tower(tower: List[Dict[str, Any]]) -> Dict[str, Any]:
-    tower.reverse()
-    current_tower = tower[-1]
-    for t in tower:
+    current_tower = tower[0]
+    for t in reversed(tower):
         open_time = t["schedules"][0]["openTime"]
         open_time = parser.parse(open_time)
         close_time = t["closeTime"]
@@ -142,39 +216,3 @@ def get_current_tower(tower: List[Dict[str, Any]]) -> Dict[str, Any]:
             break
 
     return current_tower
-
-
-def find_tower_floor(floor: List[Dict[str, Any]], floor_id: int) -> Dict[str, Any]:
-    for f in floor:
-        if f["floorId"] == floor_id:
-            return f
-    return {}
-
-
-def find_dungeon_configs(
-    dungeon: List[Dict[str, Any]], config_id: int
-) -> List[Dict[str, Any]]:
-    result: List[Dict[str, Any]] = []
-    for d in dungeon:
-        if d["id"] == config_id:
-            result.append(d)
-    return result
-
-
-def find_tower_levels(
-    tower_level: List[Dict[str, Any]], level_grou_id: int
-) -> List[Dict[str, Any]]:
-    result: List[Dict[str, Any]] = []
-    for t in tower_level:
-        if t["levelGroupId"] == level_grou_id:
-            result.append(t)
-    return result
-
-
-def find_monster_describe(
-    monster_describe: List[Dict[str, Any]], monster_id: int
-) -> Dict[str, Any]:
-    for m in monster_describe:
-        if m["id"] == monster_id:
-            return m
-    return {}
@@ -1,19 +1,123 @@
+import bisect
 import json
+import logging
+import mmap
 import os
-from typing import Dict
+import struct
+from typing import Dict, Optional
 
+TEXT_MAP_DIR = "GenshinData/TextMap"
+STORE_DIR = "data/gd_text_map"
 
-def load_text_maps() -> Dict[str, Dict[str, str]]:
-    result: Dict[str, Dict[str, str]] = {}
+HEADER = struct.Struct("<4sIQQ")
+"""magic, version, source signature, number of entries"""
+MAGIC = b"GDTM"
+VERSION = 1
 
-    json_files = [
-        j_file
-        for j_file in os.listdir("GenshinData/TextMap")
-        if j_file.endswith(".json")
-    ]
-    for json_file in json_files:
-        with open(f"GenshinData/TextMap/{json_file}", encoding="utf-8") as f:
-            data: Dict[str, str] = json.load(f)
-        result[json_file.split("TextMap")[-1].replace(".json", "")] = data
 
-    return result
+class TextMapStore:
+    """Read-only text map of one language stored on disk
+
+    The file is a header, the sorted text map hashes, the offsets of their strings
+    and the UTF-8 string blob. It is memory-mapped, so lookups are a binary search
+    over the hashes and only the pages that are read end up in memory.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        _, _, _, count = HEADER.unpack_from(self._mmap)
+        view = memoryview(self._mmap)
+        hashes_start = HEADER.size
+        offsets_start = hashes_start + count * 8
+        self._blob_start = offsets_start + (count + 1) * 8
+
+        self._hashes = view[hashes_start:offsets_start].cast("Q")
+        self._offsets = view[offsets_start : self._blob_start].cast("Q")
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def get(self, text_hash: int) -> Optional[str]:
+        index = bisect.bisect_left(self._hashes, text_hash)
+        if index == len(self._hashes) or self._hashes[index] != text_hash:
+            return None
+        start = self._blob_start + self._offsets[index]
+        end = self._blob_start + self._offsets[index + 1]
+        return self._mmap[start:end].decode("utf-8")
+
+
+class GDTextMap:
+    """GenshinData text maps of every language, backed by :class:`TextMapStore` files"""
+
+    def __init__(self) -> None:
+        self._stores: Dict[str, TextMapStore] = {}
+
+    def get(self, text_hash: int, lang: str) -> Optional[str]:
+        store = self._stores.get(lang)
+        if store is None:
+            return None
+        return store.get(text_hash)
+
+    def load(self) -> None:
+        """Build the stores that are missing or out of date, then open all of them"""
+        if not os.path.isdir(TEXT_MAP_DIR):
+            logging.warning(f"[GDTextMap] {TEXT_MAP_DIR} not found")
+            return
+
+        os.makedirs(STORE_DIR, exist_ok=True)
+        for file in os.listdir(TEXT_MAP_DIR):
+            if not file.endswith(".json"):
+                continue
+            lang = file.split("TextMap")[-1].replace(".json", "")
+            source = f"{TEXT_MAP_DIR}/{file}"
+            path = f"{STORE_DIR}/{lang}.bin"
+
+            signature = _get_signature(source)
+            if _read_signature(path) != signature:
+                logging.info(f"[GDTextMap] Building {lang} store")
+                build_store(source, path, signature)
+            self._stores[lang] = TextMapStore(path)
+
+
+def build_store(source: str, path: str, signature: int) -> None:
+    """Convert a GenshinData TextMap JSON file into a store file"""
+    with open(source, encoding="utf-8") as f:
+        data: Dict[str, str] = json.load(f)
+
+    entries = sorted((int(k), v.encode("utf-8")) for k, v in data.items())
+    del data
+
+    offsets = [0]
+    for _, text in entries:
+        offsets.append(offsets[-1] + len(text))
+
+    # write to a temporary file so a running bot never sees a half written store
+    temp = f"{path}.tmp"
+    with open(temp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, signature, len(entries)))
+        f.write(struct.pack(f"<{len(entries)}Q", *(h for h, _ in entries)))
+        f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        for _, text in entries:
+            f.write(text)
+    os.replace(temp, path)
+
+
+def _get_signature(source: str) -> int:
+    stat = os.stat(source)
+    return (stat.st_mtime_ns ^ (stat.st_size << 32)) & 0xFFFFFFFFFFFFFFFF
+
+
+def _read_signature(path: str) -> Optional[int]:
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) != HEADER.size:
+        return None
+    magic, version, signature, _ = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return signature
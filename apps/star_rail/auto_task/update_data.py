@@ -2,6 +2,7 @@ from typing import Dict, List
 
 from discord import Forbidden, Guild
 
+from data.loader import check_for_updates
 from dev.models import BotModel
 from utils.general import open_json, write_json
 from yatta import YattaAPI
@@ -26,6 +27,7 @@ class DataUpdater:
         await self.fetch_url_map()
         await self.upload_emojis()
         write_json("data/star_rail/emoji_map.json", self.emoji_map)
+        check_for_updates()
 
     async def fetch_url_map(self) -> None:
         """
@@ -0,0 +1,31 @@
+"""Benchmark of text map startup time and lookups per second
+
+Run with ``python -m apps.text_map.benchmark`` from the repository root.
+"""
+import os
+import time
+import timeit
+
+from .text_map_app import COMPILED_PATH, TextMap
+
+
+def main() -> None:
+    if os.path.exists(COMPILED_PATH):
+        os.remove(COMPILED_PATH)
+
+    start = time.perf_counter()
+    TextMap()
+    print(f"Startup (compile from YAML): {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    text_map = TextMap()
+    print(f"Startup (compiled): {time.perf_counter() - start:.3f}s")
+
+    number = 1_000_000
+    for lang in ("en-US", "zh-TW", "unknown"):
+        seconds = timeit.timeit(lambda: text_map.get(329, lang), number=number)
+        print(f"get(329, {lang!r}): {number / seconds:,.0f} lookups/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Translations of command names, descriptions and choices
+
+The bundle is built offline with ``python -m apps.text_map.command_translations``
+from the repository root, which writes every text map hash in every Discord locale
+to ``BUNDLE_PATH``. The bot loads it at startup, strings missing from it or a bundle
+built from other text maps fall back to translating on demand.
+"""
+import hashlib
+import json
+from typing import Dict, Optional
+
+import discord
+
+from .convert_locale import CROWDIN_LANGS
+from .text_map_app import text_map
+
+BUNDLE_PATH = "text_maps/command_translations.json"
+
+
+def get_signature() -> str:
+    """Hash of the YAML text maps the translations are made from"""
+    sha = hashlib.sha256()
+    for lang in sorted(CROWDIN_LANGS.values()):
+        try:
+            with open(f"text_maps/langs/{lang}.yaml", "rb") as f:
+                sha.update(f.read())
+        except FileNotFoundError:
+            pass
+        sha.update(b"\0")
+    return sha.hexdigest()
+
+
+def translate(map_hash: int, lang: discord.Locale | str) -> Optional[str]:
+    """Translate a text map hash for Discord, None if there is no text"""
+    text = text_map.get(map_hash, lang)
+    if text == "":
+        return None
+    if len(text.split(" ")) == 1:
+        return text.lower()
+
+    # hard code stuff
+    if str(lang) == "vi" and map_hash == 105:
+        return "nhân-vật"
+
+    return text
+
+
+def build_bundle() -> Dict[str, Dict[str, str]]:
+    """Locale to text map hash to translation, hashes without text are left out"""
+    size = len(text_map.tables.get("en-US", []))
+    bundle: Dict[str, Dict[str, str]] = {}
+    for lang in discord.Locale:
+        translations: Dict[str, str] = {}
+        for map_hash in range(size):
+            text = translate(map_hash, lang)
+            if text is not None:
+                translations[str(map_hash)] = text
+        bundle[str(lang)] = translations
+    return bundle
+
+
+def load_bundle(signature: str) -> Optional[Dict[str, Dict[str, str]]]:
+    """Load the bundle, None if it is missing or was built from other text maps"""
+    try:
+        with open(BUNDLE_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if data.get("signature") != signature:
+        return None
+    return data["locales"]
+
+
+def main() -> None:
+    bundle = build_bundle()
+    with open(BUNDLE_PATH, "w", encoding="utf-8") as f:
+        json.dump(
+            {"signature": get_signature(), "locales": bundle}, f, ensure_ascii=False
+        )
+    print(f"Wrote {sum(len(t) for t in bundle.values())} translations to {BUNDLE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import yaml
+from data.loader import LazyData
 
 from .convert_locale import CROWDIN_LANGS
 
@@ -9,14 +9,12 @@ class CondText:
         files = ["artifact", "build", "character", "weapon"]
         langs = ["en-US", "zh-TW"]
         for lang in langs:
-            for file in files:
-                with open(f"shenhe_external/{lang}/{file}.yaml", encoding="utf-8") as f:
-                    if lang not in self.data:
-                        self.data[lang] = {}
-                    try:
-                        self.data[lang][file] = yaml.safe_load(f)
-                    except Exception:  # skipcq: PYL-W0703
-                        print(f"Error loading {lang}/{file}.yaml")
+            self.data[lang] = {
+                file: LazyData(
+                    f"shenhe_external/{lang}/{file}.yaml", ignore_errors=True
+                )
+                for file in files
+            }
 
     def get_text(self, lang: str, file: str, key: str) -> str:
         lang = CROWDIN_LANGS.get(lang, "en-US")
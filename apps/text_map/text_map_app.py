@@ -1,16 +1,20 @@
 import json
-from typing import Any, Dict, Optional, Union
+import os
+from typing import Any, Dict, List, Optional, Union
 
 import discord
 import yaml
 
 from .convert_locale import CROWDIN_LANGS, to_ambr_top
 
+COMPILED_PATH = "text_maps/compiled.json"
+
 
 class TextMap:
     def __init__(self):
         self.langs = CROWDIN_LANGS.values()
-        self.lang_maps: Dict[str, Dict[str, str]] = {}
+        self.tables: Dict[str, List[str]] = {}
+        """Locale to a list of texts indexed by hash, with the en-US fallback already applied"""
 
         self.artifact: Dict[str, Dict[str, str]] = {}
         self.character: Dict[str, Dict[str, str]] = {}
@@ -22,8 +26,12 @@ class TextMap:
         self.load()
 
     def load(self):
-        for lang in self.langs:
-            self.lang_maps[lang] = self._open_file(f"text_maps/langs/{lang}.yaml")
+        compiled = self._load_compiled()
+        self.tables = {
+            locale: compiled.get(path, compiled.get("en-US", []))
+            for locale, path in CROWDIN_LANGS.items()
+        }
+        self._default = self.tables.get("en-US", [])
 
         self.character = self._open_file("text_maps/avatar.json")
         self.material = self._open_file("text_maps/material.json")
@@ -38,14 +46,15 @@ class TextMap:
         lang: Union[discord.Locale, str] = "en-US",
         user_locale: Optional[str] = None,
     ) -> str:
-        lang = str(user_locale or lang)
-        path = CROWDIN_LANGS.get(lang, "en-US")
-        lang_text_map = self.lang_maps[path]
-        text = lang_text_map.get(str(map_hash), "")
-        if not text:
-            lang_text_map = self.lang_maps["en-US"]
-            text = lang_text_map.get(str(map_hash), "")
-        return text
+        table = self.tables.get(str(user_locale or lang), self._default)
+        if not isinstance(map_hash, int):  # hash passed as a string
+            try:
+                map_hash = int(map_hash)
+            except ValueError:
+                return ""
+        if map_hash < 0 or map_hash >= len(table):
+            return ""
+        return table[map_hash]
 
     def get_id_from_name(self, name: str) -> Optional[int]:
         result = self.item_name.get(name)
@@ -118,6 +127,42 @@ class TextMap:
         ambr_locale = to_ambr_top(str(lang))
         return artifact_text[str(ambr_locale)]
 
+    def _load_compiled(self) -> Dict[str, List[str]]:
+        """Load the compiled text maps, compiling them again if any YAML file changed"""
+        signature = {}
+        for lang in self.langs:
+            try:
+                signature[lang] = os.stat(f"text_maps/langs/{lang}.yaml").st_mtime_ns
+            except FileNotFoundError:
+                signature[lang] = None
+
+        compiled = self._open_file(COMPILED_PATH)
+        if compiled.get("signature") == signature:
+            return compiled["langs"]
+
+        langs = self._compile()
+        try:
+            with open(COMPILED_PATH, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"signature": signature, "langs": langs}, f, ensure_ascii=False
+                )
+        except OSError:
+            pass
+        return langs
+
+    def _compile(self) -> Dict[str, List[str]]:
+        lang_maps: Dict[str, Dict[int, str]] = {}
+        for lang in self.langs:
+            lang_map = self._open_file(f"text_maps/langs/{lang}.yaml")
+            lang_maps[lang] = {int(k): str(v) for k, v in lang_map.items() if v}
+
+        english = lang_maps.get("en-US", {})
+        size = max((max(m, default=-1) for m in lang_maps.values()), default=-1) + 1
+        return {
+            lang: [lang_map.get(i, english.get(i, "")) for i in range(size)]
+            for lang, lang_map in lang_maps.items()
+        }
+
     @staticmethod
     def _open_file(path: str) -> Dict[str, Any]:
         try:
@@ -46,8 +46,8 @@ class AdminCog(commands.Cog, name="admin"):
 
     @commands.is_owner()
     @commands.command(name="sync")
-    async def sync(self, ctx: commands.Context):
-        await self.bot.tree.sync()
+    async def sync(self, ctx: commands.Context, force: bool = False):
+        await self.bot.tree.sync(force=force)
         await ctx.send("commands synced")
 
     @commands.is_owner()
@@ -103,6 +103,11 @@ class AdminCog(commands.Cog, name="admin"):
             f.write("")
         await ctx.send("log flushed")
 
+    @commands.is_owner()
+    @commands.command(name="http")
+    async def http_stats(self, ctx: commands.Context):
+        await ctx.send(f"```\n{self.bot.sessions.get_summary()}\n```")
+
 
 async def setup(bot: commands.AutoShardedBot) -> None:
     await bot.add_cog(AdminCog(bot))
@@ -31,7 +31,7 @@ class CalcCog(commands.GroupCog, name="calc"):
     async def calc_weapon(self, inter: Interaction):
         i: Inter = inter  # type: ignore
         lang = await self.bot.db.settings.get(i.user.id, Settings.LANG) or str(i.locale)
-        ambr = AmbrTopAPI(i.client.session, to_ambr_top(lang))
+        ambr = AmbrTopAPI(i.client.sessions.ambr, to_ambr_top(lang))
         view = calc_weapon.View(lang, await ambr.get_weapon_types())
         view.author = i.user
         await i.response.send_message(view=view)
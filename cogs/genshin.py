@@ -12,7 +12,7 @@ from discord.utils import format_dt
 from dotenv import load_dotenv
 from enkanetwork import Assets
 from genshin import Client
-from genshin.models import Notes
+from genshin.models import Notes, PartialGenshinUserStats, SpiralAbyss
 
 import dev.asset as asset
 import dev.exceptions as exceptions
@@ -20,17 +20,17 @@ import dev.models as models
 import ui
 import utils.general as general
 from ambr import AmbrTopAPI, Character, Material, Weapon
-from apps.db.json import read_json
 from apps.db.tables.user_settings import Settings
 from apps.draw import main_funcs
 from apps.genshin import enka, leaderboard
+from apps.genshin.search_index import SearchIndex
 from apps.genshin_data import abyss
 from apps.text_map import convert_locale, text_map
 from data.cards.dice_element import get_dice_emoji
 from dev.enum import GameType
 from ui.others import manage_accounts
 from utils import disable_view_items, get_character_emoji, get_uid_region_hash
-from utils.genshin import update_talents_json
+from utils.genshin import update_talents
 from utils.text_map import get_game_name
 
 load_dotenv()
@@ -90,7 +90,7 @@ class GenshinCog(commands.Cog, name="genshin"):
             "namecard",
             "book",
         )
-        self.text_map_files: List[Dict[str, Any]] = []
+        item_maps: Dict[str, Dict[str, Dict[str, str]]] = {}
         for map_ in maps_to_open:
             try:
                 async with aiofiles.open(
@@ -99,7 +99,8 @@ class GenshinCog(commands.Cog, name="genshin"):
                     data = json.loads(await f.read())
             except FileNotFoundError:
                 data = {}
-            self.text_map_files.append(data)
+            item_maps[map_] = data
+        self.search_index = SearchIndex(item_maps)
         try:
             async with aiofiles.open(
                 "text_maps/item_name.json", "r", encoding="utf-8"
@@ -183,13 +184,12 @@ class GenshinCog(commands.Cog, name="genshin"):
         dark_mode = await self.bot.db.settings.get(i.user.id, Settings.DARK_MODE)
         draw_input = models.DrawInput(
             loop=self.bot.loop,
-            session=self.bot.session,
+            session=self.bot.sessions.assets,
             lang=lang,
             dark_mode=dark_mode,
         )
 
-        client = await user.client
-        client.lang = convert_locale.to_genshin_py(lang)
+        client = await user.get_client(convert_locale.to_genshin_py(lang))
         if user.game is GameType.GENSHIN:
             notes = await client.get_genshin_notes(user.uid)
             fp = await main_funcs.draw_realtime_card(
@@ -328,10 +328,9 @@ class GenshinCog(commands.Cog, name="genshin"):
 
         fp = self.bot.stats_card_cache.get(user.uid)
         if fp is None:
-            client = await user.client
-            client.lang = convert_locale.to_genshin_py(lang)
+            client = await user.get_client(convert_locale.to_genshin_py(lang))
             genshin_user = await client.get_partial_genshin_user(user.uid)
-            ambr = AmbrTopAPI(self.bot.session)
+            ambr = AmbrTopAPI(self.bot.sessions.ambr)
             characters = await ambr.get_character(
                 include_beta=False, include_traveler=False
             )
@@ -340,7 +339,9 @@ class GenshinCog(commands.Cog, name="genshin"):
 
             fp = await main_funcs.draw_stats_card(
                 models.DrawInput(
-                    loop=self.bot.loop, session=self.bot.session, dark_mode=dark_mode
+                    loop=self.bot.loop,
+                    session=self.bot.sessions.assets,
+                    dark_mode=dark_mode,
                 ),
                 namecard,
                 genshin_user.stats,
@@ -380,8 +381,7 @@ class GenshinCog(commands.Cog, name="genshin"):
         lang = lang or str(i.locale)
         dark_mode = await self.bot.db.settings.get(i.user.id, Settings.DARK_MODE)
 
-        client = await user.client
-        client.lang = convert_locale.to_genshin_py(lang)
+        client = await user.get_client(convert_locale.to_genshin_py(lang))
         genshin_user = await client.get_partial_genshin_user(user.uid)
         explorations = genshin_user.explorations
 
@@ -389,7 +389,9 @@ class GenshinCog(commands.Cog, name="genshin"):
         if fp is None:
             fp = await main_funcs.draw_area_card(
                 models.DrawInput(
-                    loop=self.bot.loop, session=self.bot.session, dark_mode=dark_mode
+                    loop=self.bot.loop,
+                    session=self.bot.sessions.assets,
+                    dark_mode=dark_mode,
                 ),
                 list(explorations),
             )
@@ -452,18 +454,26 @@ class GenshinCog(commands.Cog, name="genshin"):
             ephemeral=ephemeral,
         )
 
-        client = await user.client
-        client.lang = convert_locale.to_genshin_py(lang)
-        g_characters = await client.get_genshin_characters(user.uid)
-        g_characters = list(g_characters)
-
-        talents = await read_json(self.bot.pool, f"talents/{user.uid}.json")
-        if talents is None:
-            await update_talents_json(
-                g_characters, client, self.bot.pool, user.uid, self.bot.session
+        client = await user.get_client(convert_locale.to_genshin_py(lang))
+        results = await general.fan_out(
+            {
+                "characters": client.get_genshin_characters(user.uid),
+                "talents": self.bot.db.talents.get(user.uid),
+            },
+            optional=["talents"],
+        )
+        g_characters = list(results["characters"])
+
+        if results["talents"] is None:
+            await update_talents(
+                g_characters,
+                client,
+                self.bot.db.talents,
+                user.uid,
+                self.bot.sessions.ambr,
             )
 
-        client = AmbrTopAPI(self.bot.session)
+        client = AmbrTopAPI(self.bot.sessions.ambr)
         characters = await client.get_character(
             include_beta=False, include_traveler=False
         )
@@ -530,13 +540,22 @@ class GenshinCog(commands.Cog, name="genshin"):
         dark_mode = await self.bot.db.settings.get(i.user.id, Settings.DARK_MODE)
 
         client = await user.client
-        abyss_data = await client.get_genshin_spiral_abyss(
-            user.uid, previous=bool(previous)
+        results = await general.fan_out(
+            {
+                "abyss": client.get_genshin_spiral_abyss(
+                    user.uid, previous=bool(previous)
+                ),
+                "user": client.get_partial_genshin_user(user.uid),
+                "characters": client.get_genshin_characters(user.uid),
+            },
+            optional=["user", "characters"],
         )
+        abyss_data: SpiralAbyss = results["abyss"]
         if not abyss_data.ranks.most_kills:
             raise exceptions.AbyssDataNotFound
-        g_user = await client.get_partial_genshin_user(user.uid)
-        characters = await client.get_genshin_characters(user.uid)
+        # the cards are drawn without the adventure rank and constellations if these failed
+        g_user: Optional[PartialGenshinUserStats] = results["user"]
+        characters = results["characters"] or []
 
         overview = models.DefaultEmbed()
         overview.set_image(url="attachment://overview_card.png")
@@ -552,7 +571,7 @@ class GenshinCog(commands.Cog, name="genshin"):
             fp = await main_funcs.draw_abyss_overview_card(
                 models.DrawInput(
                     loop=self.bot.loop,
-                    session=self.bot.session,
+                    session=self.bot.sessions.assets,
                     lang=lang,
                     dark_mode=dark_mode,
                 ),
@@ -580,16 +599,22 @@ class GenshinCog(commands.Cog, name="genshin"):
         )
         view.message = await i.original_response()
 
-        if abyss_result.abyss.max_floor != "0-0":
-            await leaderboard.update_user_abyss_leaderboard(
-                abyss_result.abyss,
-                abyss_result.genshin_user,
-                abyss_result.characters,
-                abyss_result.uid,
-                abyss_result.genshin_user.info.nickname,
-                i.user.id,
-                previous,
-                self.bot.pool,
+        if (
+            abyss_result.abyss.max_floor != "0-0"
+            and abyss_result.genshin_user is not None
+            and abyss_result.characters
+        ):
+            # written in batches by the schedule cog
+            leaderboard.abyss_board_writer.add(
+                leaderboard.build_abyss_record(
+                    abyss_result.abyss,
+                    abyss_result.genshin_user,
+                    abyss_result.characters,
+                    abyss_result.uid,
+                    abyss_result.genshin_user.info.nickname,
+                    i.user.id,
+                    previous,
+                )
             )
 
     @app_commands.command(name="stuck", description=_("Data not public?", hash=149))
@@ -818,7 +843,7 @@ class GenshinCog(commands.Cog, name="genshin"):
             fp, fp_two = await main_funcs.draw_profile_overview_card(
                 models.DrawInput(
                     loop=self.bot.loop,
-                    session=self.bot.session,
+                    session=self.bot.sessions.assets,
                     lang=lang,
                     dark_mode=dark_mode,
                 ),
@@ -885,17 +910,13 @@ class GenshinCog(commands.Cog, name="genshin"):
         lang = user_locale or i.locale
         ambr_top_locale = convert_locale.to_ambr_top(lang)
         dark_mode = await self.bot.db.settings.get(i.user.id, Settings.DARK_MODE)
-        client = AmbrTopAPI(self.bot.session, ambr_top_locale)
+        client = AmbrTopAPI(self.bot.sessions.ambr, ambr_top_locale)
 
-        item_type = None
-        for index, file in enumerate(self.text_map_files):
-            if query in file:
-                item_type = index
-                break
+        item_type = self.search_index.item_types.get(query)
         if item_type is None:
             raise exceptions.ItemNotFound
 
-        if item_type == 0:  # character
+        if item_type == "avatar":  # character
             character = await client.get_character_detail(query)
             if character is None:
                 raise exceptions.ItemNotFound
@@ -903,13 +924,13 @@ class GenshinCog(commands.Cog, name="genshin"):
                 character, i, lang, client, dark_mode
             )
 
-        elif item_type == 1:  # weapon
+        elif item_type == "weapon":  # weapon
             weapon = await client.get_weapon_detail(int(query))
             if weapon is None:
                 raise exceptions.ItemNotFound
             await ui.search_nav.parse_weapon_wiki(weapon, i, lang, client, dark_mode)
 
-        elif item_type == 2:  # material
+        elif item_type == "material":  # material
             material = await client.get_material_detail(int(query))
             if material is None:
                 raise exceptions.ItemNotFound
@@ -917,25 +938,25 @@ class GenshinCog(commands.Cog, name="genshin"):
                 material, i, lang, client, dark_mode
             )
 
-        elif item_type == 3:  # artifact
+        elif item_type == "reliquary":  # artifact
             artifact = await client.get_artifact_detail(int(query))
             if artifact is None:
                 raise exceptions.ItemNotFound
             await ui.search_nav.parse_artifact_wiki(artifact, i, lang)
 
-        elif item_type == 4:  # monster
+        elif item_type == "monster":  # monster
             monster = await client.get_monster_detail(int(query))
             if monster is None:
                 raise exceptions.ItemNotFound
             await ui.search_nav.parse_monster_wiki(monster, i, lang, client, dark_mode)
 
-        elif item_type == 5:  # food
+        elif item_type == "food":  # food
             food = await client.get_food_detail(int(query))
             if food is None:
                 raise exceptions.ItemNotFound
             await ui.search_nav.parse_food_wiki(food, i, lang, client, dark_mode)
 
-        elif item_type == 6:  # furniture
+        elif item_type == "furniture":  # furniture
             furniture = await client.get_furniture_detail(int(query))
             if furniture is None:
                 raise exceptions.ItemNotFound
@@ -943,13 +964,13 @@ class GenshinCog(commands.Cog, name="genshin"):
                 furniture, i, lang, client, dark_mode
             )
 
-        elif item_type == 7:  # namecard
+        elif item_type == "namecard":  # namecard
             namecard = await client.get_name_card_detail(int(query))
             if namecard is None:
                 raise exceptions.ItemNotFound
             await ui.search_nav.parse_namecard_wiki(namecard, i, lang)
 
-        elif item_type == 8:  # book
+        elif item_type == "book":  # book
             book = await client.get_book_detail(int(query))
             if book is None:
                 raise exceptions.ItemNotFound
@@ -962,29 +983,12 @@ class GenshinCog(commands.Cog, name="genshin"):
         lang = await self.bot.db.settings.get(i.user.id, Settings.LANG)
         lang = lang or str(i.locale)
         ambr_top_locale = convert_locale.to_ambr_top(lang)
-        result: List[app_commands.Choice] = []
-        for queries in self.text_map_files:
-            for item_id, query_names in queries.items():
-                if item_id in ("10000005", "10000007"):
-                    continue
-
-                item_name = query_names[ambr_top_locale]
-                if current.lower() in item_name.lower() and item_name:
-                    result.append(app_commands.Choice(name=item_name, value=item_id))
-                elif " " in current:
-                    splited = current.split(" ")
-                    all_match = True
-                    for word in splited:
-                        if word.lower() not in item_name.lower():
-                            all_match = False
-                            break
-                    if all_match and item_name != "":
-                        result.append(
-                            app_commands.Choice(name=item_name, value=item_id)
-                        )
-        if not current:
-            random.shuffle(result)
-        return result[:25]
+        return [
+            app_commands.Choice(name=item_name, value=item_id)
+            for item_id, item_name in self.search_index.search(
+                current, str(ambr_top_locale)
+            )
+        ]
 
     @app_commands.command(
         name="beta",
@@ -994,7 +998,7 @@ class GenshinCog(commands.Cog, name="genshin"):
         lang = await self.bot.db.settings.get(i.user.id, Settings.LANG)
         lang = lang or str(i.locale)
 
-        client = AmbrTopAPI(self.bot.session, convert_locale.to_ambr_top(lang))
+        client = AmbrTopAPI(self.bot.sessions.ambr, convert_locale.to_ambr_top(lang))
         result = ""
         first_icon_url = ""
         characters = await client.get_character()
@@ -1052,7 +1056,9 @@ class GenshinCog(commands.Cog, name="genshin"):
             )
 
         fp = await main_funcs.draw_banner_card(
-            models.DrawInput(loop=self.bot.loop, session=self.bot.session, lang=lang),
+            models.DrawInput(
+                loop=self.bot.loop, session=self.bot.sessions.assets, lang=lang
+            ),
             [w.banner for w in banners],
         )
         fp.seek(0)
@@ -1078,11 +1084,9 @@ class GenshinCog(commands.Cog, name="genshin"):
         i: models.Inter = inter  # type: ignore
         await i.response.defer()
         lang = await i.client.db.settings.get(i.user.id, Settings.LANG) or str(i.locale)
-        floors = await abyss.get_abyss_enemies(self.bot.gd_text_map, lang)
-
-        ley_line_disorders = await abyss.get_ley_line_disorders(
-            self.bot.gd_text_map, lang
-        )
+        abyss_data = await abyss.get_abyss_data(self.bot.gd_text_map, lang)
+        floors = abyss_data.floors
+        ley_line_disorders = abyss_data.ley_line_disorders
 
         embeds: Dict[str, discord.Embed] = {}
         enemies: Dict[str, List[models.AbyssHalf]] = {}
@@ -1114,9 +1118,7 @@ class GenshinCog(commands.Cog, name="genshin"):
             icon_url=i.user.display_avatar.url,
         )
 
-        buff_name, buff_desc = await abyss.get_abyss_blessing(
-            self.bot.gd_text_map, lang
-        )
+        buff_name, buff_desc = abyss_data.blessing
         buff_embed = models.DefaultEmbed(text_map.get(733, lang))
         buff_embed.add_field(
             name=buff_name,
@@ -1160,7 +1162,7 @@ class GenshinCog(commands.Cog, name="genshin"):
             )
             scenario_dict[str(scenario.id)] = scenario
 
-        ambr = AmbrTopAPI(self.bot.session, convert_locale.to_ambr_top(lang))
+        ambr = AmbrTopAPI(self.bot.sessions.ambr, convert_locale.to_ambr_top(lang))
         characters = await ambr.get_character(include_beta=False)
 
         if isinstance(characters, List):
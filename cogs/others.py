@@ -216,7 +216,7 @@ class OthersCog(commands.Cog, name="others"):
         await i.response.defer()
 
         lang = await self.bot.db.settings.get(i.user.id, Settings.LANG) or str(i.locale)
-        ambr = AmbrTopAPI(self.bot.session, to_ambr_top(lang))
+        ambr = AmbrTopAPI(self.bot.sessions.ambr, to_ambr_top(lang))
         character = await ambr.get_character(character_id)
         if not isinstance(character, Character):
             raise AutocompleteError
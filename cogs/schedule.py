@@ -1,6 +1,6 @@
 import asyncio
 import json
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import aiofiles
 import aiohttp
@@ -15,8 +15,9 @@ import apps.genshin as genshin_app
 import apps.star_rail.auto_task as star_rail_auto_task
 import dev.models as models
 from apps.genshin import auto_task
+from data.loader import check_for_updates
 from dev.base_ui import capture_exception
-from utils import convert_dict_to_zipped_json, fetch_cards, get_dt_now, log
+from utils import fetch_cards, get_dt_now, log
 from utils.general import get_dc_user, open_json
 
 load_dotenv()
@@ -40,12 +41,20 @@ class Schedule(commands.Cog):
     def __init__(self, bot) -> None:
         self.bot: models.BotModel = bot
         self.debug = self.bot.debug
+        self.realtime_notes_task: Optional[asyncio.Task] = None
+        self.daily_checkin_task: Optional[asyncio.Task] = None
+        self.abyss_board_task: Optional[asyncio.Task] = None
+        self.abyss_json_task: Optional[asyncio.Task] = None
         if not self.debug:
             self.run_tasks.start()
+        # /abyss buffers its leaderboard entries, so they are flushed in debug mode too
+        self.flush_abyss_board_loop.start()
 
     async def cog_unload(self) -> None:
         if not self.debug:
             self.run_tasks.cancel()
+        self.flush_abyss_board_loop.cancel()
+        await genshin_app.abyss_board_writer.flush(self.bot.db)
 
     loop_interval = 1
 
@@ -54,18 +63,47 @@ class Schedule(commands.Cog):
         """Run the tasks every loop_interval minutes"""
         now = get_dt_now()
 
+        if now.minute % 5 < self.loop_interval:  # every 5 minutes
+            if self.realtime_notes_task is None or self.realtime_notes_task.done():
+                self.realtime_notes_task = asyncio.create_task(
+                    auto_task.RealtimeNotes(self.bot).start()
+                )
+
         if now.minute < self.loop_interval:  # every hour
-            asyncio.create_task(auto_task.RealtimeNotes(self.bot).start())
             asyncio.create_task(self.save_codes())
 
-        if now.hour == 0 and now.minute < self.loop_interval:  # midnight
-            asyncio.create_task(auto_task.DailyCheckin(self.bot).start())
+            # midnight, or resume check-ins left unfinished by a restart
+            if self.daily_checkin_task is None or self.daily_checkin_task.done():
+                if now.hour == 0 or await self.bot.db.checkin_jobs.has_unfinished(
+                    now.date()
+                ):
+                    self.daily_checkin_task = asyncio.create_task(
+                        auto_task.DailyCheckin(self.bot).start()
+                    )
+
+        if now.hour % 6 == 3 and now.minute < self.loop_interval:  # every 6 hours
+            if self.abyss_board_task is None or self.abyss_board_task.done():
+                self.abyss_board_task = asyncio.create_task(
+                    auto_task.AbyssBoardRefresher(self.bot).start()
+                )
 
         if now.hour == 1 and now.minute < self.loop_interval:  # 1am
             asyncio.create_task(star_rail_auto_task.DataUpdater(self.bot).start())
             asyncio.create_task(self.update_shenhe_cache_and_data())
-            if now.day in (3, 10, 18, 25):
-                asyncio.create_task(self.generate_abyss_json())
+            if now.day in (3, 10, 18, 25) and (
+                self.abyss_json_task is None or self.abyss_json_task.done()
+            ):
+                self.abyss_json_task = asyncio.create_task(self.generate_abyss_json())
+
+        # every hour, resume abyss.json runs that were interrupted or failed to send
+        if now.minute < self.loop_interval and (
+            self.abyss_json_task is None or self.abyss_json_task.done()
+        ):
+            seasons = genshin_app.get_unfinished_abyss_seasons()
+            if seasons:
+                self.abyss_json_task = asyncio.create_task(
+                    self.resume_abyss_json(seasons)
+                )
 
         if now.hour in (4, 15, 21) and now.minute < self.loop_interval:  # 4am, 3pm, 9pm
             hour_dict = {
@@ -87,6 +125,17 @@ class Schedule(commands.Cog):
         await self.update_game_data()
         await self.update_card_data()
 
+    @tasks.loop(minutes=loop_interval)
+    async def flush_abyss_board_loop(self) -> None:
+        """Write the abyss leaderboard entries buffered by /abyss"""
+        await self.flush_abyss_board()
+
+    @schedule_error_handler
+    async def flush_abyss_board(self) -> None:
+        written = await genshin_app.abyss_board_writer.flush(self.bot.db)
+        if written:
+            log.info(f"[Schedule] Wrote {written} abyss leaderboard entries")
+
     @schedule_error_handler
     async def save_codes(self) -> None:
         codes = await self.find_codes(self.bot.session)
@@ -105,37 +154,30 @@ class Schedule(commands.Cog):
 
     @schedule_error_handler
     async def generate_abyss_json(self) -> None:
-        log.info("[Schedule] Generating abyss.json...")
+        """Start a new abyss.json run of the current season, discarding a leftover one"""
+        generator = genshin_app.AbyssJSONGenerator(
+            genshin_app.get_current_abyss_season()
+        )
+        generator.clean()
+        await self._run_abyss_json(generator)
 
-        result: Dict[str, Any] = {}
-        result["schedule_id"] = genshin_app.get_current_abyss_season()
-        result["size"] = 0
-        result["data"] = []
+    @schedule_error_handler
+    async def resume_abyss_json(self, seasons: List[int]) -> None:
+        """Finish and send abyss.json runs that were left unfinished"""
+        for season in seasons:
+            log.info(f"[Schedule] Resuming abyss.json of season {season}")
+            await self._run_abyss_json(genshin_app.AbyssJSONGenerator(season))
 
+    async def _run_abyss_json(self, generator: genshin_app.AbyssJSONGenerator) -> None:
+        log.info("[Schedule] Generating abyss.json...")
         accounts = await self.bot.db.users.get_all()
-
-        for account in accounts:
-            if str(account.uid)[0] in (1, 2, 5):
-                continue
-
-            client = await account.client
-            client.lang = "en-us"
-
-            try:
-                abyss = await client.get_genshin_spiral_abyss(account.uid)
-                characters = await client.get_genshin_characters(account.uid)
-            except Exception:  # skipcq: PYL-W0703
-                pass
-            else:
-                if abyss.total_stars != 36:
-                    continue
-
-                genshin_app.add_abyss_entry(result, account, abyss, list(characters))
+        path = await generator.run(accounts)
         log.info("[Schedule] Generated abyss.json")
 
         user = await get_dc_user(self.bot, 630235350526328844)
-        fp = convert_dict_to_zipped_json(result)
-        await user.send(file=discord.File(fp, "abyss_json.zip"))
+        stats = ", ".join(f"{k}: {v}" for k, v in generator.stats.items())
+        await user.send(stats, file=discord.File(path, "abyss_json.zip"))
+        generator.clean()
         log.info("[Schedule] Saved abyss.json")
 
     @schedule_error_handler
@@ -143,8 +185,8 @@ class Schedule(commands.Cog):
         """Updates genshin game data and adds emojis"""
         log.info("[Schedule][Update Game Data] Start")
         await genshin.utility.update_characters_ambr()
-        client = ambr.AmbrTopAPI(self.bot.session, "cht")
-        eng_client = ambr.AmbrTopAPI(self.bot.session, "en")
+        client = ambr.AmbrTopAPI(self.bot.sessions.ambr, "cht")
+        eng_client = ambr.AmbrTopAPI(self.bot.sessions.ambr, "en")
         things_to_update = ("character", "weapon", "artifact")
         character_map = open_json("data/game/character_map.json")
         character_map["10000005"] = {
@@ -230,7 +272,7 @@ class Schedule(commands.Cog):
                             break
                     if emoji_server is not None:
                         try:
-                            async with self.bot.session.get(obj.icon) as r:
+                            async with self.bot.sessions.assets.get(obj.icon) as r:
                                 bytes_obj = await r.read()
                             emoji = await emoji_server.create_custom_emoji(
                                 name=object_id,
@@ -247,6 +289,7 @@ class Schedule(commands.Cog):
                     object_map[str(obj.id)]["emoji"] = str(emoji)
             with open(f"data/game/{thing}_map.json", "w+", encoding="utf-8") as f:
                 json.dump(object_map, f, ensure_ascii=False, indent=4)
+        check_for_updates()
         log.info("[Schedule][Update Game Data] Ended")
 
     @schedule_error_handler
@@ -265,14 +308,7 @@ class Schedule(commands.Cog):
             "monster",
             "namecard",
         )
-        for thing in things_to_update:
-            await genshin_app.update_thing_text_map(thing, self.bot.session)
-
-        # daily dungeon text map
-        await genshin_app.update_dungeon_text_map(self.bot.session)
-
-        # item name text map
-        await genshin_app.update_item_text_map(things_to_update)
+        await genshin_app.update_text_maps(things_to_update, self.bot.sessions.ambr)
 
         log.info("[Schedule][Update Text Map] Ended")
 
@@ -281,21 +317,30 @@ class Schedule(commands.Cog):
         log.info("[Schedule][Update Card Data] Start")
 
         cards = await fetch_cards(self.bot.session)
-        for lang, card_data in cards.items():
-            async with aiofiles.open(
-                f"data/cards/card_data_{lang}.json", "w+", encoding="utf-8"
-            ) as f:
-                await f.write(json.dumps(card_data, indent=4, ensure_ascii=False))
+        await asyncio.gather(
+            *(
+                self.write_card_data(lang, card_data)
+                for lang, card_data in cards.items()
+            )
+        )
 
         log.info("[Schedule][Update Card Data] Ended")
 
+    @staticmethod
+    async def write_card_data(lang: str, card_data: List[Dict[str, Any]]) -> None:
+        async with aiofiles.open(
+            f"data/cards/card_data_{lang}.json", "w+", encoding="utf-8"
+        ) as f:
+            await f.write(json.dumps(card_data, indent=4, ensure_ascii=False))
+
     @schedule_error_handler
     async def update_ambr_cache(self):
         """Updates data from ambr.top"""
         log.info("[Schedule][Update Ambr Cache] Start")
-        client = ambr.AmbrTopAPI(self.bot.session)
+        client = ambr.AmbrTopAPI(self.bot.sessions.ambr)
         await client.update_cache(all_lang=True)
         await client.update_cache(static=True)
+        ambr.detail_cache.invalidate()
         log.info("[Schedule][Update Ambr Cache] Ended")
 
     @run_tasks.before_loop
@@ -124,7 +124,7 @@ class WishCog(commands.GroupCog, name="wish"):
         member = member or i.user
         lang = await i.client.db.settings.get(i.user.id, Settings.LANG) or str(i.locale)
 
-        client = ambr.AmbrTopAPI(self.bot.session, to_ambr_top(lang))
+        client = ambr.AmbrTopAPI(self.bot.sessions.ambr, to_ambr_top(lang))
 
         wishes: List[WishItem] = []
         uid = await i.client.db.users.get_uid(member.id)
@@ -244,7 +244,7 @@ class WishCog(commands.GroupCog, name="wish"):
         fp = await main_funcs.draw_wish_overview_card(
             models.DrawInput(
                 loop=self.bot.loop,
-                session=self.bot.session,
+                session=self.bot.sessions.assets,
                 lang=lang,
                 dark_mode=dark_mode,
             ),
@@ -1,8 +1,6 @@
-import json
-from typing import Dict, List
+from data.loader import LazyData
 
-with open("data/game/rollTable.json", "r") as f:
-    roll_table: Dict[str, Dict[str, Dict[str, List[List[float]]]]] = json.load(f)
+roll_table = LazyData("data/game/rollTable.json")
 
 
 def calculate_substat_roll(prop_id: str, value: float, rarity: int) -> int:
@@ -1,8 +1,6 @@
-import json
-from typing import Any, Dict
+from data.loader import LazyData
 
-with open("data/game/enka_character.json") as f:
-    enka_characters: Dict[str, Any] = json.load(f)
+enka_characters = LazyData("data/game/enka_character.json")
 
 
 def get_enka_characters():
@@ -0,0 +1,93 @@
+LEVEL_MULTIPLIER = {
+    1: 17.165606,
+    2: 18.535048,
+    3: 19.904854,
+    4: 21.274902,
+    5: 22.6454,
+    6: 24.649612,
+    7: 26.640642,
+    8: 28.868587,
+    9: 31.36768,
+    10: 34.143345,
+    11: 37.201,
+    12: 40.66,
+    13: 44.446667,
+    14: 48.56352,
+    15: 53.74848,
+    16: 59.081898,
+    17: 64.420044,
+    18: 69.72446,
+    19: 75.12314,
+    20: 80.58478,
+    21: 86.11203,
+    22: 91.70374,
+    23: 97.24463,
+    24: 102.812645,
+    25: 108.40956,
+    26: 113.20169,
+    27: 118.102905,
+    28: 122.97932,
+    29: 129.72733,
+    30: 136.29291,
+    31: 142.67085,
+    32: 149.02902,
+    33: 155.41699,
+    34: 161.8255,
+    35: 169.10631,
+    36: 176.51808,
+    37: 184.07274,
+    38: 191.70952,
+    39: 199.55692,
+    40: 207.38205,
+    41: 215.3989,
+    42: 224.16566,
+    43: 233.50217,
+    44: 243.35057,
+    45: 256.06308,
+    46: 268.5435,
+    47: 281.52606,
+    48: 295.01364,
+    49: 309.0672,
+    50: 323.6016,
+    51: 336.75754,
+    52: 350.5303,
+    53: 364.4827,
+    54: 378.61917,
+    55: 398.6004,
+    56: 416.39825,
+    57: 434.387,
+    58: 452.95105,
+    59: 472.60623,
+    60: 492.8849,
+    61: 513.56854,
+    62: 539.1032,
+    63: 565.51056,
+    64: 592.53876,
+    65: 624.4434,
+    66: 651.47015,
+    67: 679.4968,
+    68: 707.79407,
+    69: 736.67145,
+    70: 765.64026,
+    71: 794.7734,
+    72: 824.67737,
+    73: 851.1578,
+    74: 877.74207,
+    75: 914.2291,
+    76: 946.74677,
+    77: 979.4114,
+    78: 1011.223,
+    79: 1044.7917,
+    80: 1077.4437,
+    81: 1109.9976,
+    82: 1142.9766,
+    83: 1176.3695,
+    84: 1210.1844,
+    85: 1253.8357,
+    86: 1288.9528,
+    87: 1325.4841,
+    88: 1363.4569,
+    89: 1405.0974,
+    90: 1446.8535,
+}
+"""Character level multiplier used by spread and aggravate"""
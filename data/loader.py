@@ -0,0 +1,154 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import time
+import weakref
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import yaml
+
+CACHE_DIR = "data/.cache"
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+load_times: Dict[str, float] = {}
+"""Path to the seconds it took to load the file, for the files loaded so far"""
+
+
+def load(path: str) -> Any:
+    """Load a JSON or YAML file through a pickle cache
+
+    The parsed data is pickled to ``data/.cache`` keyed by the source file's mtime and size,
+    so later loads skip parsing until the source changes. Missing files load as an empty dict.
+    """
+    start = time.perf_counter()
+    key = _stat_key(path)
+    if key is None:
+        return {}
+
+    cache_path = f"{CACHE_DIR}/{hashlib.sha1(path.encode()).hexdigest()}.pickle"
+    data = _read_cache(cache_path, path, key)
+    source = "cache"
+    if data is None:
+        data = _parse(path)
+        _write_cache(cache_path, path, key, data)
+        source = "source"
+
+    load_times[path] = time.perf_counter() - start
+    logging.info(
+        f"[DataLoader] Loaded {path} from {source} in {load_times[path] * 1000:.1f}ms"
+    )
+    return data
+
+
+def _stat_key(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _parse(path: str) -> Any:
+    with open(path, "rb") as f:
+        content = f.read()
+    if path.endswith((".yaml", ".yml")):
+        return yaml.load(content, Loader=YAML_LOADER)  # nosec
+    return json.loads(content)
+
+
+def _read_cache(cache_path: str, path: str, key: Tuple[int, int]) -> Optional[Any]:
+    try:
+        with open(cache_path, "rb") as f:
+            cached_path, cached_key, data = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        return None
+    if cached_path != path or cached_key != key:
+        return None
+    return data
+
+
+def _write_cache(cache_path: str, path: str, key: Tuple[int, int], data: Any) -> None:
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temp = f"{cache_path}.tmp"
+        with open(temp, "wb") as f:
+            pickle.dump((path, key, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, cache_path)
+    except OSError as e:
+        logging.warning(f"[DataLoader] Failed to cache {path}: {e}")
+
+
+_instances: "weakref.WeakValueDictionary[int, LazyData]" = weakref.WeakValueDictionary()
+"""id() to every LazyData, which is a Mapping and therefore not hashable"""
+
+
+def check_for_updates() -> None:
+    """Make every :class:`LazyData` check its file on the next access
+
+    Called after data files are rewritten, so the new data is used without waiting
+    for the check interval.
+    """
+    for instance in list(_instances.values()):
+        instance.check_for_update()
+
+
+class LazyData(Mapping):
+    """Read-only mapping of a data file that is loaded on first access
+
+    The file's mtime and size are checked at most once every ``check_interval``
+    seconds, or on the next access after :func:`check_for_updates` is called, so
+    files that are rewritten at runtime are loaded again after they change.
+    """
+
+    def __init__(
+        self, path: str, ignore_errors: bool = False, check_interval: float = 60.0
+    ) -> None:
+        """
+        Args:
+            path (str): Path of the JSON or YAML file
+            ignore_errors (bool): Log files that fail to parse and load them as an empty dict
+            check_interval (float): Seconds between two checks for changes of the file
+        """
+        self.path = path
+        self.ignore_errors = ignore_errors
+        self.check_interval = check_interval
+        self._data: Optional[Dict[Any, Any]] = None
+        self._key: Optional[Tuple[int, int]] = None
+        self._next_check = 0.0
+        _instances[id(self)] = self
+
+    def check_for_update(self) -> None:
+        """Check the file for changes on the next access"""
+        self._next_check = 0.0
+
+    @property
+    def data(self) -> Dict[Any, Any]:
+        if self._data is not None and time.monotonic() < self._next_check:
+            return self._data
+
+        key = _stat_key(self.path)
+        self._next_check = time.monotonic() + self.check_interval
+        if self._data is None or key != self._key:
+            try:
+                self._data = load(self.path) or {}
+            except Exception:  # skipcq: PYL-W0703
+                if self._data is None and not self.ignore_errors:
+                    raise
+                # keep the last good data, e.g. when the file is being rewritten
+                logging.exception(f"[DataLoader] Failed to load {self.path}")
+                if self._data is None:
+                    self._data = {}
+            self._key = key
+        return self._data
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.data[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
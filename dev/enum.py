@@ -41,3 +41,4 @@ class Category(Enum):
     SINGLE_STRIKE = "single_strike_damage"
     CHARACTER_USAGE_RATE = "character_usage_rate"
     FULL_CLEAR = "full_clear"
+    TEAM_USAGE = "team_usage"
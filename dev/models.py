@@ -13,11 +13,15 @@ from discord.ext import commands
 from enkanetwork.model.base import EnkaNetworkResponse
 from logingateway import HuTaoLoginAPI
 from logingateway.model import Player
-from pyppeteer.browser import Browser
 
 import ambr.models as ambr
 from apps.db.main import Database
+from apps.genshin_data.text_maps import GDTextMap
 from apps.text_map import text_map
+from dev.sessions import SessionFactory
+
+if typing.TYPE_CHECKING:
+    from apps.genshin.browser import BrowserPool
 
 
 @define
@@ -30,6 +34,7 @@ class DamageResult:
 class DrawInput:
     loop: asyncio.AbstractEventLoop
     session: aiohttp.ClientSession
+    """Session the images are downloaded with, ``sessions.assets``"""
     lang: discord.Locale | str = "en-US"
     dark_mode: bool = False
 
@@ -43,7 +48,11 @@ class LoginInfo:
 
 class BotModel(commands.AutoShardedBot):
     session: aiohttp.ClientSession
-    browsers: typing.Dict[str, Browser]
+    """The default session, same as ``sessions.default``"""
+    sessions: SessionFactory
+    """Sessions with their own connection pools for each upstream"""
+    browser_pool: typing.Optional["BrowserPool"] = None
+    """Genshin Optimizer browsers, None if they could not be launched"""
     gateway: HuTaoLoginAPI
     pool: asyncpg.Pool
     debug: bool
@@ -55,7 +64,7 @@ class BotModel(commands.AutoShardedBot):
     maintenance: bool = False
     maintenance_time: str = ""
     launch_time = datetime.utcnow()
-    gd_text_map: typing.Dict[str, typing.Dict[str, str]]
+    gd_text_map: GDTextMap
     stats_card_cache = cachetools.TTLCache(maxsize=512, ttl=120)
     area_card_cache = cachetools.TTLCache(maxsize=512, ttl=120)
     abyss_overview_card_cache = cachetools.TTLCache(maxsize=512, ttl=120)
@@ -291,7 +300,7 @@ class Inter(discord.Interaction):
 class AbyssResult:
     embed_title: str
     abyss: genshin.models.SpiralAbyss
-    genshin_user: genshin.models.PartialGenshinUserStats
+    genshin_user: typing.Optional[genshin.models.PartialGenshinUserStats]
     discord_user: discord.User | discord.Member | discord.ClientUser
     overview_embed: discord.Embed
     overview_file: io.BytesIO
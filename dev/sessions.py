@@ -0,0 +1,157 @@
+import time
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+import aiohttp
+from attr import define, field
+
+
+@define
+class UpstreamConfig:
+    """Connection limits of an upstream"""
+
+    limit: int
+    """Maximum number of connections"""
+    limit_per_host: int
+    """Maximum number of connections to one host"""
+    timeout: float
+    """Total timeout of a request in seconds"""
+    connect_timeout: float = 10.0
+    keepalive_timeout: float = 30.0
+    dns_cache_ttl: int = 300
+
+
+@define
+class UpstreamStats:
+    requests: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    total_latency: float = 0.0
+    statuses: Dict[int, int] = field(factory=dict)
+
+    @property
+    def average_latency(self) -> float:
+        return self.total_latency / self.requests if self.requests else 0.0
+
+
+UPSTREAMS: Dict[str, UpstreamConfig] = {
+    "default": UpstreamConfig(
+        limit=50, limit_per_host=10, timeout=300, connect_timeout=30
+    ),
+    "assets": UpstreamConfig(limit=32, limit_per_host=16, timeout=60),
+    "ambr": UpstreamConfig(limit=16, limit_per_host=16, timeout=30),
+    "checkin": UpstreamConfig(limit=32, limit_per_host=16, timeout=60),
+}
+"""
+- default: discord attachments, image URL validation, codes API and everything else,
+  with aiohttp's default timeouts since some of these are large downloads
+- assets: icon and image downloads for drawing cards
+- ambr: ambr.top API
+- checkin: daily check-in backends
+"""
+
+
+class SessionFactory:
+    """aiohttp sessions with their own connection pools, one per upstream
+
+    Each upstream has its own connector, so a burst of icon downloads can't take
+    the connections that daily check-in needs. Sessions are created on first use.
+    """
+
+    def __init__(self, upstreams: Optional[Dict[str, UpstreamConfig]] = None) -> None:
+        self.upstreams = dict(UPSTREAMS if upstreams is None else upstreams)
+        self.stats: Dict[str, UpstreamStats] = {
+            name: UpstreamStats() for name in self.upstreams
+        }
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+
+    @property
+    def default(self) -> aiohttp.ClientSession:
+        return self.get("default")
+
+    @property
+    def assets(self) -> aiohttp.ClientSession:
+        return self.get("assets")
+
+    @property
+    def ambr(self) -> aiohttp.ClientSession:
+        return self.get("ambr")
+
+    @property
+    def checkin(self) -> aiohttp.ClientSession:
+        return self.get("checkin")
+
+    def get(self, upstream: str) -> aiohttp.ClientSession:
+        session = self._sessions.get(upstream)
+        if session is None or session.closed:
+            session = self._create_session(upstream)
+            self._sessions[upstream] = session
+        return session
+
+    async def close(self) -> None:
+        for session in self._sessions.values():
+            await session.close()
+        self._sessions.clear()
+
+    def get_summary(self) -> str:
+        """One line of stats per upstream"""
+        return "\n".join(
+            f"{name}: {s.requests} requests, {s.errors} errors, {s.in_flight} in flight, "
+            f"{s.average_latency * 1000:.0f}ms avg, statuses {s.statuses}"
+            for name, s in self.stats.items()
+        )
+
+    def _create_session(self, upstream: str) -> aiohttp.ClientSession:
+        config = self.upstreams[upstream]
+        connector = aiohttp.TCPConnector(
+            limit=config.limit,
+            limit_per_host=config.limit_per_host,
+            keepalive_timeout=config.keepalive_timeout,
+            ttl_dns_cache=config.dns_cache_ttl,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=config.timeout, connect=config.connect_timeout
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            trace_configs=[self._create_trace_config(self.stats[upstream])],
+        )
+
+    @staticmethod
+    def _create_trace_config(stats: UpstreamStats) -> aiohttp.TraceConfig:
+        async def on_request_start(
+            _: aiohttp.ClientSession,
+            context: SimpleNamespace,
+            __: aiohttp.TraceRequestStartParams,
+        ) -> None:
+            context.start = time.monotonic()
+            stats.in_flight += 1
+
+        async def on_request_end(
+            _: aiohttp.ClientSession,
+            context: SimpleNamespace,
+            params: aiohttp.TraceRequestEndParams,
+        ) -> None:
+            stats.in_flight -= 1
+            stats.requests += 1
+            stats.total_latency += time.monotonic() - context.start
+            status = params.response.status
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+        async def on_request_exception(
+            _: aiohttp.ClientSession,
+            __: SimpleNamespace,
+            ___: aiohttp.TraceRequestExceptionParams,
+        ) -> None:
+            stats.in_flight -= 1
+            stats.errors += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+        return trace_config
+
+
+sessions = SessionFactory()
@@ -2,12 +2,13 @@
 
 import argparse
 import asyncio
+import hashlib
 import json
 import os
 import platform
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import aiofiles
 import aiohttp
@@ -20,9 +21,9 @@ from dotenv import load_dotenv
 
 import dev.models as models
 from apps.db.main import Database
-from apps.genshin import launch_browsers, launch_debug_browser
-from apps.genshin_data.text_maps import load_text_maps
-from apps.text_map import text_map
+from apps.genshin import BrowserPool
+from apps.genshin_data.text_maps import GDTextMap
+from apps.text_map import command_translations
 from dev.base_ui import (
     get_error_handle_embed,
     global_error_handler,
@@ -30,10 +31,13 @@ from dev.base_ui import (
 )
 from dev.exceptions import FeatureDisabled, Maintenance
 from dev.models import BotModel
+from dev.sessions import sessions
 from utils import log, sentry_logging
 
 load_dotenv()
 
+TREE_HASH_PATH = "command_tree_hash.json"
+
 parser = argparse.ArgumentParser()
 parser.add_argument(
     "--env",
@@ -70,26 +74,33 @@ else:
 
 
 class Translator(app_commands.Translator):
+    def __init__(self) -> None:
+        self.signature = command_translations.get_signature()
+        self.bundle: Dict[str, Dict[str, str]] = (
+            command_translations.load_bundle(self.signature) or {}
+        )
+        """Locale to text map hash to translation, built offline"""
+        if not self.bundle:
+            log.warning("[System]Translator: Bundle is missing or outdated")
+        self._cache: Dict[Tuple[int, str], Optional[str]] = {}
+
     async def translate(
         self,
         string: app_commands.locale_str,
         lang: discord.Locale,
         _: app_commands.TranslationContext,
     ) -> Optional[str]:
-        try:
-            text = text_map.get(string.extras["hash"], lang)
-            if len(text.split(" ")) == 1:
-                return text.lower()
-            if text == "":
-                return None
-
-            # hard code stuff
-            if str(lang) == "vi" and string.extras["hash"] == 105:
-                return "nhân-vật"
-
-            return text
-        except KeyError:
+        map_hash = string.extras.get("hash")
+        if map_hash is None:
             return None
+        translations = self.bundle.get(str(lang))
+        if translations is not None:
+            return translations.get(str(map_hash))
+
+        key = (map_hash, str(lang))
+        if key not in self._cache:
+            self._cache[key] = command_translations.translate(map_hash, lang)
+        return self._cache[key]
 
 
 class ShenheCommandTree(app_commands.CommandTree):
@@ -97,8 +108,26 @@ class ShenheCommandTree(app_commands.CommandTree):
         super().__init__(bot)
 
     async def sync(
-        self, *, guild: Optional[discord.abc.Snowflake] = None
+        self, *, guild: Optional[discord.abc.Snowflake] = None, force: bool = False
     ) -> List[app_commands.AppCommand]:
+        """Sync the command tree, skipped when it is the same as the last synced one
+
+        Args:
+            guild (Optional[discord.abc.Snowflake]): The guild to sync the commands to
+            force (bool): Sync even if the tree did not change
+        """
+        key = str(guild.id) if guild else "global"
+        tree_hash = await self.get_tree_hash(guild)
+        try:
+            async with aiofiles.open(TREE_HASH_PATH, "r") as f:
+                tree_hashes: Dict[str, str] = json.loads(await f.read())
+        except FileNotFoundError:
+            tree_hashes = {}
+
+        if not force and tree_hashes.get(key) == tree_hash:
+            log.info("[System]sync: Command tree unchanged, skipped sync")
+            return await self.fetch_commands(guild=guild)
+
         synced = await super().sync(guild=guild)
         log.info(f"[System]sync: Synced {len(synced)} commands")
         if synced:
@@ -108,8 +137,24 @@ class ShenheCommandTree(app_commands.CommandTree):
             async with aiofiles.open("command_map.json", "w") as f:
                 await f.write(json.dumps(command_map))
 
+        tree_hashes[key] = tree_hash
+        async with aiofiles.open(TREE_HASH_PATH, "w") as f:
+            await f.write(json.dumps(tree_hashes))
+
         return synced
 
+    async def get_tree_hash(self, guild: Optional[discord.abc.Snowflake]) -> str:
+        """Hash of the untranslated commands and the text maps they are translated from
+
+        Nothing is translated, so an unchanged tree is detected before any translation work.
+        """
+        payload = [command.to_dict() for command in self._get_all_commands(guild=guild)]
+        dumped = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        signature = (
+            self.translator.signature if isinstance(self.translator, Translator) else ""
+        )
+        return hashlib.sha256(f"{dumped}{signature}".encode("utf-8")).hexdigest()
+
     async def interaction_check(self, i: discord.Interaction, /) -> bool:
         client: BotModel = i.client  # type: ignore
 
@@ -166,8 +211,10 @@ class Shenhe(BotModel):
         )
 
         self.session = session
+        self.sessions = sessions
         self.pool = pool
         self.debug = debug
+        self.launch_browser_in_debug = launch_browser_in_debug
         self.db = Database(self.pool)
 
     async def setup_hook(self) -> None:
@@ -189,22 +236,32 @@ class Shenhe(BotModel):
                     f"[Cog Load Error]: [Cog name]{cog_name} [Exception]{e}", exc_info=e
                 )
 
-        self.gd_text_map = load_text_maps()
+        await self.tree.set_translator(Translator())
+        if not self.debug:
+            await self.tree.sync()
+
+        self.gd_text_map = GDTextMap()
+        await asyncio.to_thread(self.gd_text_map.load)
 
         self.owner_id = 410036441129943050
 
     async def on_ready(self):
-        tree = self.tree
-        await tree.set_translator(Translator())
         log.info(f"[System]on_ready: Logged in as {self.user}")
         log.info(f"[System]on_ready: Total {len(self.guilds)} servers connected")
-        if not self.debug:
+        if self.browser_pool is None and (
+            not self.debug or self.launch_browser_in_debug
+        ):
+            pool = (
+                BrowserPool(max_browsers=1, langs=["en-US"])
+                if self.debug
+                else BrowserPool()
+            )
             try:
-                self.browsers = await launch_browsers()
+                await pool.start()
             except Exception as e:  # skipcq: PYL-W0703
                 log.warning("[System]on_ready: Launch browsers failed", exc_info=e)
-        if self.debug and self.launch_browser_in_debug:
-            self.browsers = {"en-US": await launch_debug_browser()}
+            else:
+                self.browser_pool = pool
 
     async def on_message(self, message: discord.Message):
         if self.user is None:
@@ -226,10 +283,10 @@ class Shenhe(BotModel):
         log.warning(f"[{ctx.author.id}]on_command_error: {error}", exc_info=error)
 
     async def close(self) -> None:
-        await self.session.close()
-        if hasattr(self, "browsers"):
-            for browser in self.browsers.values():
-                await browser.close()
+        log.info(f"[HTTP] Session stats:\n{self.sessions.get_summary()}")
+        await self.sessions.close()
+        if self.browser_pool is not None:
+            await self.browser_pool.close()
 
 
 if platform.system() == "Linux":
@@ -250,8 +307,7 @@ async def main() -> None:
     if not pool:
         raise AssertionError
 
-    session = aiohttp.ClientSession()
-    bot = Shenhe(session=session, pool=pool)
+    bot = Shenhe(session=sessions.default, pool=pool)
 
     @bot.before_invoke
     async def before_invoke(ctx: commands.Context):
@@ -284,7 +340,7 @@ async def main() -> None:
         else:
             log.info(f"[Context Menu Command][{i.user.id}][{i.command.name}]")
 
-    async with (session, bot, pool):
+    async with (bot, pool):
         try:
             await bot.start(token)
         except KeyboardInterrupt:
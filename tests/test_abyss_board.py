@@ -0,0 +1,90 @@
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+abyss_board = pytest.importorskip("apps.db.tables.abyss_board")
+
+from dev.enum import Category  # noqa: E402
+
+
+def make_row(uid: int, rank: int, total: int) -> Dict[str, Any]:
+    return {
+        "uid": uid,
+        "user_id": uid * 10,
+        "season": 1,
+        "user_name": f"user {uid}",
+        "level": 60,
+        "icon_url": "icon.png",
+        "stars_collected": 36,
+        "wins": 12,
+        "runs": 12,
+        "single_strike": 1000 - rank,
+        "floor": "12-3",
+        "const": 0,
+        "refine": 1,
+        "c_level": 90,
+        "c_icon": "character.png",
+        "rank": rank,
+        "total": total,
+    }
+
+
+class FakePool:
+    def __init__(self, rows: List[Dict[str, Any]]) -> None:
+        self.rows = rows
+        self.fetches: List[Tuple[str, Tuple[Any, ...]]] = []
+
+    async def fetch(self, query: str, *args: Any) -> List[Dict[str, Any]]:
+        self.fetches.append((query, args))
+        return self.rows
+
+
+def get_board(pool: FakePool, *args: Any, **kwargs: Any):
+    board = abyss_board.AbyssBoard(pool, None)  # type: ignore
+    return asyncio.run(board.get_board(*args, **kwargs))
+
+
+def test_page_from_ranked_rows() -> None:
+    pool = FakePool([make_row(1, 1, 50), make_row(2, 2, 50), make_row(9, 20, 50)])
+
+    page = get_board(pool, Category.SINGLE_STRIKE, 9, limit=2)
+
+    assert page.total == 50
+    assert [(e.rank, e.entry.uid) for e in page.entries] == [(1, 1), (2, 2), (20, 9)]
+    assert page.entries[0].entry.character.level == 90
+    query, args = pool.fetches[0]
+    assert args == (2, 9)
+    assert "single_strike DESC" in query
+
+
+def test_empty_board() -> None:
+    page = get_board(FakePool([]), Category.FULL_CLEAR, 1)
+    assert page.total == 0 and page.entries == []
+
+
+@pytest.mark.parametrize(
+    "category,season,user_ids,args,conditions",
+    [
+        (Category.FULL_CLEAR, None, None, (10, 1), ["runs ASC", "stars_collected"]),
+        (Category.SINGLE_STRIKE, 3, None, (10, 1, 3), ["season = $3"]),
+        (
+            Category.FULL_CLEAR,
+            3,
+            [7],
+            (10, 1, 3, [7]),
+            ["stars_collected = 36", "season = $3", "ANY($4::bigint[])"],
+        ),
+        (Category.SINGLE_STRIKE, None, [7], (10, 1, [7]), ["ANY($3::bigint[])"]),
+    ],
+)
+def test_board_filters(category, season, user_ids, args, conditions) -> None:
+    pool = FakePool([])
+    get_board(pool, category, 1, season, user_ids)
+
+    query, fetch_args = pool.fetches[0]
+    assert fetch_args == args
+    for condition in conditions:
+        assert condition in query
+    if category is not Category.FULL_CLEAR:
+        assert "stars_collected = 36" not in query
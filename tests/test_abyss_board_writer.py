@@ -0,0 +1,82 @@
+import asyncio
+from typing import List, Set
+
+import pytest
+
+leaderboard = pytest.importorskip("apps.genshin.leaderboard")
+
+
+class FakeDatabase:
+    def __init__(self) -> None:
+        self.written: List[int] = []
+        self.bad: Set[int] = set()
+        self.calls = 0
+
+    async def write(self, records, db) -> None:
+        assert db is self
+        self.calls += 1
+        if any(r.uid in self.bad for r in records):
+            raise ValueError("bad record")
+        self.written.extend(r.uid for r in records)
+
+
+@pytest.fixture
+def db(monkeypatch: pytest.MonkeyPatch) -> FakeDatabase:
+    database = FakeDatabase()
+    monkeypatch.setattr(leaderboard, "write_abyss_records", database.write)
+    return database
+
+
+def make_record(uid: int, season: int = 1, value: int = 0):
+    return leaderboard.AbyssBoardRecord(uid, season, (value,), None)
+
+
+def test_records_of_the_same_uid_replace_each_other(db: FakeDatabase) -> None:
+    writer = leaderboard.AbyssBoardWriter(batch_size=10)
+    writer.add(make_record(1, value=1))
+    writer.add(make_record(1, value=2))
+    writer.add(make_record(1, season=2))
+    assert len(writer) == 2
+
+    assert asyncio.run(writer.flush(db)) == 2  # type: ignore
+    assert len(writer) == 0
+    assert db.calls == 1
+
+
+def test_bad_record_does_not_block_the_others(db: FakeDatabase) -> None:
+    writer = leaderboard.AbyssBoardWriter(batch_size=2, max_attempts=2)
+    for uid in range(1, 6):
+        writer.add(make_record(uid))
+    db.bad.add(2)
+
+    assert asyncio.run(writer.flush(db)) == 4  # type: ignore
+    assert sorted(db.written) == [1, 3, 4, 5]
+    assert len(writer) == 1
+
+    # dropped after max_attempts flushes
+    assert asyncio.run(writer.flush(db)) == 0  # type: ignore
+    assert len(writer) == 0
+
+
+def test_record_is_kept_until_the_database_recovers(db: FakeDatabase) -> None:
+    writer = leaderboard.AbyssBoardWriter(max_attempts=3)
+    writer.add(make_record(1))
+    db.bad.add(1)
+    asyncio.run(writer.flush(db))  # type: ignore
+    asyncio.run(writer.flush(db))  # type: ignore
+    assert len(writer) == 1
+
+    db.bad.clear()
+    assert asyncio.run(writer.flush(db)) == 1  # type: ignore
+    assert db.written == [1]
+
+
+def test_new_record_resets_attempts(db: FakeDatabase) -> None:
+    writer = leaderboard.AbyssBoardWriter(max_attempts=2)
+    writer.add(make_record(1))
+    db.bad.add(1)
+    asyncio.run(writer.flush(db))  # type: ignore
+
+    writer.add(make_record(1, value=1))
+    asyncio.run(writer.flush(db))  # type: ignore
+    assert len(writer) == 1
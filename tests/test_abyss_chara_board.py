@@ -0,0 +1,115 @@
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+abyss_chara_board = pytest.importorskip("apps.db.tables.abyss_chara_board")
+AbyssTeam = abyss_chara_board.AbyssTeam
+AbyssTeamsEntry = abyss_chara_board.AbyssTeamsEntry
+
+
+class FakeConnection:
+    """Answers the previous-entries query and records the writes"""
+
+    def __init__(self, previous: List[Dict[str, Any]]) -> None:
+        self.previous = previous
+        self.writes: Dict[str, List[Any]] = {}
+        self.fetches: List[Tuple[str, Tuple[Any, ...]]] = []
+
+    def acquire(self) -> "FakeConnection":
+        return self
+
+    def transaction(self) -> "FakeConnection":
+        return self
+
+    async def __aenter__(self) -> "FakeConnection":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+    async def fetch(self, query: str, *args: Any) -> List[Dict[str, Any]]:
+        self.fetches.append((query, args))
+        if "FOR UPDATE" in query:
+            return self.previous
+        return [{"characters": [1, 2, 3, 4], "uses": 2}]
+
+    async def execute(self, query: str, *args: Any) -> None:
+        self.writes.setdefault(" ".join(query.split()[:3]), []).append(args)
+
+    async def executemany(self, query: str, rows: List[Tuple[Any, ...]]) -> None:
+        self.writes.setdefault(" ".join(query.split()[:3]), []).extend(rows)
+
+
+def make_entry(uid: int, characters: List[List[int]], season: int = 1):
+    return AbyssTeamsEntry(
+        uid=uid,
+        user_id=uid * 10,
+        season=season,
+        teams=[
+            AbyssTeam(chamber=i // 2 + 1, half=i % 2 + 1, characters=team)
+            for i, team in enumerate(characters)
+        ],
+    )
+
+
+def test_update_writes_the_usage_difference() -> None:
+    conn = FakeConnection(previous=[{"season": 1, "characters": [1, 2, 5]}])
+    board = abyss_chara_board.AbyssCharaBoard(conn)  # type: ignore
+
+    asyncio.run(
+        board.update(
+            [
+                make_entry(1, [[9]]),
+                # the latest entry of a UID and season replaces the earlier ones
+                make_entry(1, [[1, 2], [1, 3]]),
+                make_entry(2, [[3]], season=2),
+            ]
+        )
+    )
+
+    assert sorted(conn.writes["INSERT INTO abyss_character_usage"]) == [
+        (1, 1, 1),
+        (1, 3, 1),
+        (1, 5, -1),
+        (2, 3, 1),
+    ]
+    assert sorted(conn.writes["INSERT INTO abyss_character_leaderboard"]) == [
+        (1, [1, 2, 1, 3], 10, 1),
+        (2, [3], 20, 2),
+    ]
+    assert sorted(conn.writes["INSERT INTO abyss_team_leaderboard"]) == [
+        (1, 1, 1, 1, [1, 2], 10),
+        (1, 1, 1, 2, [1, 3], 10),
+        (2, 2, 1, 1, [3], 20),
+    ]
+    assert conn.writes["DELETE FROM abyss_team_leaderboard"] == [([1, 2], [1, 2])]
+
+
+def test_update_without_entries() -> None:
+    conn = FakeConnection(previous=[])
+    asyncio.run(abyss_chara_board.AbyssCharaBoard(conn).update([]))  # type: ignore
+    assert not conn.writes and not conn.fetches
+
+
+@pytest.mark.parametrize(
+    "season,chamber,user_ids,args,conditions",
+    [
+        (None, None, None, (5,), []),
+        (3, None, None, (3, 5), ["season = $1"]),
+        (3, 2, [7], (3, [7], 2, 5), ["season = $1", "ANY($2", "chamber = $3"]),
+        (None, 1, [7], ([7], 1, 5), ["ANY($1", "chamber = $2"]),
+    ],
+)
+def test_get_teams_parameters(season, chamber, user_ids, args, conditions) -> None:
+    conn = FakeConnection(previous=[])
+    board = abyss_chara_board.AbyssCharaBoard(conn)  # type: ignore
+
+    teams = asyncio.run(board.get_teams(season, chamber, user_ids, limit=5))
+
+    assert teams[0].characters == [1, 2, 3, 4] and teams[0].uses == 2
+    query, fetch_args = conn.fetches[0]
+    assert fetch_args == args
+    assert f"LIMIT ${len(args)}" in query
+    for condition in conditions:
+        assert condition in query
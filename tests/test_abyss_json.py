@@ -0,0 +1,99 @@
+import asyncio
+import json
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+tasks = pytest.importorskip("apps.genshin.tasks")
+
+
+class FakeAccount:
+    def __init__(self, uid: int) -> None:
+        self.uid = uid
+
+
+@pytest.fixture
+def generator(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(tasks, "ABYSS_JSON_DIR", str(tmp_path))
+    return tasks.AbyssJSONGenerator(42, max_concurrency=2, region_interval=0)
+
+
+def read_zip(path: str) -> Dict[str, Any]:
+    with zipfile.ZipFile(path) as zip_file:
+        return json.loads(zip_file.read("data.json"))
+
+
+def test_write_zip_skips_cut_off_lines(generator) -> None:
+    with open(generator.entries_path, "w", encoding="utf-8") as f:
+        f.write('{"id": "a"}\n{"id": "b"}\n{"id": "c')
+
+    generator._write_zip()
+
+    assert read_zip(generator.zip_path) == {
+        "schedule_id": 42,
+        "data": [{"id": "a"}, {"id": "b"}],
+        "size": 2,
+    }
+
+
+def test_write_zip_without_entries(generator) -> None:
+    generator._write_zip()
+
+    assert read_zip(generator.zip_path) == {"schedule_id": 42, "data": [], "size": 0}
+
+
+def test_run_resumes_and_cleans(generator, monkeypatch: pytest.MonkeyPatch) -> None:
+    fetched: List[int] = []
+
+    async def fetch(account: FakeAccount) -> Optional[Dict[str, Any]]:
+        fetched.append(account.uid)
+        if account.uid == 700000003:
+            return None
+        return {"uid": account.uid}
+
+    monkeypatch.setattr(generator, "_fetch", fetch)
+    with open(generator.entries_path, "w", encoding="utf-8") as f:
+        f.write('{"uid": 700000001}\n')
+    with open(generator.done_path, "w", encoding="utf-8") as f:
+        f.write("700000001\n")
+    assert tasks.get_unfinished_abyss_seasons() == [42]
+
+    accounts = [
+        FakeAccount(uid) for uid in (700000001, 700000002, 700000003, 100000001)
+    ]
+    path = asyncio.run(generator.run(accounts))  # type: ignore
+
+    assert sorted(fetched) == [700000002, 700000003]
+    assert generator.stats["resumed"] == 1
+    assert generator.stats["skipped"] == 1
+    assert generator.stats["not_cleared"] == 1
+    data = read_zip(path)
+    assert sorted(d["uid"] for d in data["data"]) == [700000001, 700000002]
+
+    generator.clean()
+    assert tasks.get_unfinished_abyss_seasons() == []
+
+
+def test_run_logs_first_error_of_each_type(
+    generator, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def fetch(account: FakeAccount) -> Optional[Dict[str, Any]]:
+        if account.uid % 2:
+            raise ValueError(account.uid)
+        raise KeyError(account.uid)
+
+    warnings: List[str] = []
+    monkeypatch.setattr(generator, "_fetch", fetch)
+    monkeypatch.setattr(tasks.log, "warning", warnings.append)
+
+    accounts = [FakeAccount(uid) for uid in range(700000001, 700000007)]
+    asyncio.run(generator.run(accounts))  # type: ignore
+
+    assert generator.stats["errors"] == 6
+    assert generator.stats["error:ValueError"] == 3
+    assert generator.stats["error:KeyError"] == 3
+    assert len(warnings) == 2
+    # failed accounts are retried by the next run
+    assert not Path(generator.done_path).exists()
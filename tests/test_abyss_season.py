@@ -0,0 +1,112 @@
+import asyncio
+import datetime
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+abyss = pytest.importorskip("apps.genshin_data.abyss")
+
+NOW = datetime.datetime(2023, 6, 20, 12)
+
+
+def make_tower(tower_id: int, open_time: str, close_time: str) -> Dict[str, Any]:
+    return {
+        "scheduleId": tower_id,
+        "closeTime": close_time,
+        "monthlyLevelConfigId": 1,
+        "buffnameTextMapHash": 10,
+        "entranceFloorId": [1001],
+        "schedules": [{"openTime": open_time, "floorList": []}],
+    }
+
+
+@pytest.fixture
+def excel(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> List[Dict[str, Any]]:
+    files: Dict[str, Any] = {
+        "TOWER_SCHEDULE": [],
+        "TOWER_FLOOR": [
+            {
+                "floorId": 1001,
+                "floorIndex": 1,
+                "floorLevelConfigId": 2,
+                "levelGroupId": 3,
+            }
+        ],
+        "TOWER_LEVEL": [
+            {
+                "levelGroupId": 3,
+                "levelIndex": 1,
+                "monsterLevel": 95,
+                "firstMonsterList": [7],
+                "secondMonsterList": [],
+            }
+        ],
+        "DUNGEON_LEVEL_ENTITY": [
+            {"id": 1, "descTextMapHash": 11},
+            {"id": 2, "descTextMapHash": 12},
+        ],
+        "MONSTER_DESCRIBE": [{"id": 7, "nameTextMapHash": 13}],
+    }
+    for name, data in files.items():
+        path = tmp_path / f"{name}.json"
+        path.write_text(json.dumps(data))
+        monkeypatch.setattr(abyss, name, str(path))
+    monkeypatch.setattr(
+        abyss, "SOURCES", tuple(str(tmp_path / f"{n}.json") for n in files)
+    )
+    monkeypatch.setattr(abyss, "get_dt_now", lambda: NOW)
+    monkeypatch.setattr(abyss, "_season", None)
+    monkeypatch.setattr(abyss, "_data", {})
+    monkeypatch.setattr(abyss, "_localize", lambda season, *_: season)
+    return files["TOWER_SCHEDULE"]
+
+
+def write_schedule(towers: List[Dict[str, Any]]) -> None:
+    with open(abyss.TOWER_SCHEDULE, "w", encoding="utf-8") as f:
+        json.dump(towers, f)
+
+
+def count_builds(monkeypatch: pytest.MonkeyPatch) -> List[Any]:
+    builds: List[Any] = []
+    build_season = abyss.build_season
+
+    def counting_build_season() -> Any:
+        builds.append(None)
+        return build_season()
+
+    monkeypatch.setattr(abyss, "build_season", counting_build_season)
+    return builds
+
+
+def test_current_season_is_built_once(
+    excel: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    write_schedule([make_tower(1, "2023-06-16 04:00:00", "2023-07-01 03:59:59")])
+    builds = count_builds(monkeypatch)
+
+    first = asyncio.run(abyss.get_abyss_data(None, "en-US"))
+    second = asyncio.run(abyss.get_abyss_data(None, "en-US"))
+
+    assert first is second
+    assert len(builds) == 1
+    assert first.valid_until == first.close_time
+    assert first.floors[0].chambers[0].halfs == [[13], []]
+
+
+def test_fallback_season_is_not_rebuilt_every_call(
+    excel: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # between seasons, no tower contains now
+    write_schedule([make_tower(1, "2023-06-01 04:00:00", "2023-06-16 03:59:59")])
+    builds = count_builds(monkeypatch)
+
+    season = asyncio.run(abyss.get_abyss_data(None, "en-US"))
+    asyncio.run(abyss.get_abyss_data(None, "en-US"))
+    assert len(builds) == 1
+    assert season.valid_until == NOW + abyss.FALLBACK_TTL
+
+    monkeypatch.setattr(abyss, "get_dt_now", lambda: NOW + abyss.FALLBACK_TTL * 2)
+    asyncio.run(abyss.get_abyss_data(None, "en-US"))
+    assert len(builds) == 2
@@ -0,0 +1,119 @@
+import asyncio
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+import ambr  # noqa: E402
+from ambr import client  # noqa: E402
+
+MATERIAL = {
+    "id": 104301,
+    "name": "Teachings of Freedom",
+    "icon": "UI_ItemIcon_104301",
+    "rank": 2,
+}
+CACHE = {
+    "en": {
+        "domain": {
+            "data": {
+                "monday": {
+                    "1": {
+                        "id": 1,
+                        "name": "Forsaken Rift",
+                        "city": 1,
+                        "reward": [104301],
+                    }
+                }
+            }
+        },
+        "material": {"data": {"items": {"104301": MATERIAL}}},
+    },
+    "static": {
+        "upgrade": {
+            "data": {
+                "avatar": {"10000002": {"items": [104301]}},
+                "weapon": {"11101": {"items": [104301]}},
+            }
+        }
+    },
+}
+
+
+@pytest.fixture
+def api(monkeypatch: pytest.MonkeyPatch) -> ambr.AmbrTopAPI:
+    monkeypatch.setattr(client, "_memory_cache", copy.deepcopy(CACHE))
+    return ambr.AmbrTopAPI(None, "en")  # type: ignore
+
+
+def test_get_domains_twice(api: ambr.AmbrTopAPI) -> None:
+    first = asyncio.run(api.get_domains())
+    second = asyncio.run(api.get_domains())
+
+    assert first == second
+    assert first[0].city.id == 1
+    assert first[0].weekday == 0
+    assert [r.id for r in first[0].rewards] == [104301]
+    assert client._memory_cache == CACHE
+
+
+def test_get_upgrades_twice(api: ambr.AmbrTopAPI) -> None:
+    for _ in range(2):
+        character = asyncio.run(api.get_character_upgrade("10000002"))
+        characters = asyncio.run(api.get_character_upgrade())
+        weapon = asyncio.run(api.get_weapon_upgrade(11101))
+        weapons = asyncio.run(api.get_weapon_upgrade())
+
+        assert isinstance(character, ambr.CharacterUpgrade)
+        assert [i.id for i in character.items] == [104301]
+        assert isinstance(characters, list) and characters[0] == character
+        assert isinstance(weapon, ambr.WeaponUpgrade)
+        assert [i.id for i in weapon.items] == [104301]
+        assert isinstance(weapons, list) and weapons[0] == weapon
+    assert client._memory_cache == CACHE
+
+
+class FakeResponse:
+    def __init__(self, body: bytes) -> None:
+        self.status = 200
+        self.headers = {"ETag": None}
+        self.body = body
+
+    async def __aenter__(self) -> "FakeResponse":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+    async def read(self) -> bytes:
+        for _ in range(5):
+            await asyncio.sleep(0)
+        return self.body
+
+
+class FakeSession:
+    def get(self, url: str, headers: dict) -> FakeResponse:
+        return FakeResponse(json.dumps({"url": url}).encode())
+
+
+def test_overlapping_updates(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(client, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(client, "MANIFEST_PATH", str(tmp_path / "manifest.json"))
+    api = ambr.AmbrTopAPI(FakeSession(), "en")  # type: ignore
+
+    async def update() -> None:
+        await asyncio.gather(
+            api.update_cache(endpoint="character"),
+            api.update_cache(endpoint="weapon"),
+            api.update_cache(static=True),
+        )
+
+    asyncio.run(update())
+
+    for path in ("en/avatar.json", "en/weapon.json", "static/upgrade.json"):
+        assert (tmp_path / path).exists()
+    assert len(json.loads((tmp_path / "manifest.json").read_text())) == 4
+    assert not [p for p in tmp_path.iterdir() if p.name.startswith(".staging")]
@@ -0,0 +1,62 @@
+import asyncio
+from typing import Any, List
+
+import pytest
+
+browser = pytest.importorskip("apps.genshin.browser")
+
+
+class FakeContext:
+    def __init__(self, fake_browser: "FakeBrowser") -> None:
+        self.browser = fake_browser
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self) -> None:
+        self.contexts: List[FakeContext] = []
+
+    async def createIncognitoBrowserContext(self) -> FakeContext:
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+
+@pytest.fixture
+def pool(monkeypatch: pytest.MonkeyPatch) -> Any:
+    async def launch() -> FakeBrowser:
+        return FakeBrowser()
+
+    monkeypatch.setattr(browser.BrowserPool, "_launch_browser", staticmethod(launch))
+    return browser.BrowserPool(max_browsers=1, idle_timeout=0, langs=["en-US"])
+
+
+def test_leased_contexts_are_not_evicted(pool: Any) -> None:
+    async def run() -> None:
+        first = await pool.acquire("en-US")
+        second = await pool.acquire("en-US")
+        assert first is second
+
+        await pool.evict_idle()
+        assert not first.closed
+
+        pool.release(first)
+        await pool.evict_idle()
+        assert not first.closed
+
+        pool.release(second)
+        await pool.evict_idle()
+        assert first.closed
+        assert await pool.acquire("en-US") is not first
+
+    asyncio.run(run())
+
+
+def test_unsupported_languages_use_english(pool: Any) -> None:
+    async def run() -> None:
+        assert await pool.acquire("fr") is await pool.acquire("en-US")
+
+    asyncio.run(run())
@@ -0,0 +1,91 @@
+import pytest
+
+checkin_backend = pytest.importorskip("apps.genshin.auto_task.checkin_backend")
+
+from dev.enum import CheckInAPI  # noqa: E402
+
+BreakerState = checkin_backend.BreakerState
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(checkin_backend.time, "monotonic", clock)
+    return clock
+
+
+def make_backend(**kwargs):
+    return checkin_backend.CheckInBackend(list(CheckInAPI)[0], **kwargs)
+
+
+def test_window_grows_and_halves() -> None:
+    backend = make_backend(max_window=4)
+    assert backend.slots == 1
+
+    for _ in range(20):
+        backend.on_success()
+    assert backend.window == 4
+    backend.in_flight = 1
+    assert backend.slots == 3
+
+    backend.on_rate_limit()
+    assert backend.window == 2
+    backend.on_failure()
+    backend.on_failure()
+    assert backend.window == 1
+    assert backend.state is BreakerState.CLOSED
+
+
+def test_breaker_opens_probes_and_closes(clock: Clock) -> None:
+    backend = make_backend(failure_threshold=3, cooldown=60)
+    for _ in range(3):
+        backend.on_failure()
+    assert backend.state is BreakerState.OPEN
+    assert backend.slots == 0
+    assert backend.retry_after == 60
+
+    clock.now += 60
+    assert backend.slots == 1
+    assert backend.state is BreakerState.HALF_OPEN
+    backend.in_flight = 1
+    assert backend.slots == 0
+
+    backend.in_flight = 0
+    backend.on_success()
+    assert backend.state is BreakerState.CLOSED
+    assert backend.trips == 1
+
+
+def test_failed_probe_doubles_the_cooldown(clock: Clock) -> None:
+    backend = make_backend(failure_threshold=1, cooldown=60, max_cooldown=100)
+    backend.on_failure()
+
+    clock.now += 60
+    assert backend.slots == 1
+    backend.on_failure()
+    assert backend.state is BreakerState.OPEN
+    assert backend.retry_after == 100
+
+    clock.now += 100
+    assert backend.slots == 1
+    backend.on_success()
+    assert backend.cooldown == 60
+
+
+def test_backoff_and_latency() -> None:
+    backend = make_backend()
+    backend.record_latency(2.0)
+    backend.record_latency(4.0)
+    assert backend.latency == pytest.approx(2.4)
+
+    for retry_count in range(10):
+        assert 0 < backend.backoff(retry_count) <= 30
+    assert "CLOSED" in str(backend)
@@ -0,0 +1,55 @@
+import asyncio
+import datetime
+from typing import Any, List, Optional, Tuple
+
+import pytest
+
+checkin_jobs = pytest.importorskip("apps.db.tables.checkin_jobs")
+CheckinJob = checkin_jobs.CheckinJob
+CheckinJobTable = checkin_jobs.CheckinJobTable
+JobStatus = checkin_jobs.JobStatus
+
+DAY = datetime.date(2023, 6, 1)
+NOW = datetime.datetime(2023, 6, 1, 0, 5)
+
+
+class FakePool:
+    """Records queries and answers fetchval with a fixed value"""
+
+    def __init__(self, fetchval: Any = None) -> None:
+        self.queries: List[Tuple[str, Tuple[Any, ...]]] = []
+        self._fetchval = fetchval
+
+    async def fetchval(self, query: str, *args: Any) -> Optional[Any]:
+        self.queries.append((query, args))
+        return self._fetchval
+
+
+def make_job(worker: str = "host-1-vercel") -> CheckinJob:
+    return CheckinJob(
+        user_id=1, uid=2, day=DAY, status=JobStatus.LEASED, attempts=0, worker=worker
+    )
+
+
+@pytest.mark.parametrize("updated,expected", [(True, True), (None, False)])
+def test_finish_is_conditional_on_the_lease(updated: Any, expected: bool) -> None:
+    pool = FakePool(updated)
+    table = CheckinJobTable(pool)  # type: ignore
+
+    assert (
+        asyncio.run(table.finish(make_job(), JobStatus.DONE, "vercel", NOW)) is expected
+    )
+    query, args = pool.queries[0]
+    assert "status = 'leased' AND worker = $8" in query
+    assert args[-1] == "host-1-vercel"
+
+
+@pytest.mark.parametrize("updated,expected", [(True, True), (None, False)])
+def test_release_is_conditional_on_the_lease(updated: Any, expected: bool) -> None:
+    pool = FakePool(updated)
+    table = CheckinJobTable(pool)  # type: ignore
+
+    assert asyncio.run(table.release(make_job(), 3, "error")) is expected
+    query, args = pool.queries[0]
+    assert "status = 'leased' AND worker = $7" in query
+    assert args[-1] == "host-1-vercel"
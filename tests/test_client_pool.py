@@ -0,0 +1,72 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+client_pool = pytest.importorskip("apps.db.tables.client_pool")
+cookies = pytest.importorskip("apps.db.tables.cookies")
+
+from genshin import Game, Region  # noqa: E402
+
+COOKIES = {"ltuid": 1, "ltoken": "a", "cookie_token": "b", "account_id": 1}
+
+
+class FakePool:
+    async def execute(self, query: str, *args: Any) -> None:
+        pass
+
+
+def get(pool, lang: str = "en-us", **changes: Any):
+    return pool.get({**COOKIES, **changes}, Game.GENSHIN, Region.OVERSEAS, lang)
+
+
+def test_clients_are_shared_per_account_and_language() -> None:
+    pool = client_pool.ClientPool()
+    client = get(pool)
+
+    assert get(pool) is client
+    assert client.lang == "en-us"
+    assert client.game is Game.GENSHIN
+    assert client.region is Region.OVERSEAS
+
+    other_lang = get(pool, "zh-tw")
+    assert other_lang is not client
+    assert other_lang.lang == "zh-tw"
+    assert client.lang == "en-us"
+    assert pool.get(COOKIES, Game.STARRAIL, Region.OVERSEAS, "en-us") is not client
+
+
+def test_changed_cookies_rebuild_the_client() -> None:
+    pool = client_pool.ClientPool()
+    client = get(pool)
+
+    assert get(pool, ltoken="c") is not client
+    assert get(pool, ltoken="c") is get(pool, ltoken="c")
+
+
+def test_invalidate_and_lru() -> None:
+    pool = client_pool.ClientPool(maxsize=2)
+    client = get(pool)
+    other_account = get(pool, account_id=2)
+
+    pool.invalidate(1)
+    assert get(pool) is not client
+    assert get(pool, account_id=2) is other_account
+
+    get(pool, account_id=3)
+    assert len(pool._clients) == 2
+
+
+@pytest.mark.parametrize("method", ["insert", "update", "delete"])
+def test_cookie_changes_invalidate_clients(
+    method: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pool = client_pool.ClientPool()
+    monkeypatch.setattr(cookies, "client_pool", pool)
+    client = get(pool)
+
+    table = cookies.CookieTable(FakePool())  # type: ignore
+    cookie = cookies.Cookie(ltuid=1, ltoken="a", cookie_token="b")
+    asyncio.run(getattr(table, method)(1 if method == "delete" else cookie))
+
+    assert get(pool) is not client
@@ -0,0 +1,34 @@
+import json
+from pathlib import Path
+
+import pytest
+
+command_translations = pytest.importorskip("apps.text_map.command_translations")
+
+
+@pytest.fixture
+def bundle_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "command_translations.json"
+    monkeypatch.setattr(command_translations, "BUNDLE_PATH", str(path))
+    return path
+
+
+def test_bundle_is_loaded_for_the_same_text_maps(bundle_path: Path) -> None:
+    command_translations.main()
+    signature = command_translations.get_signature()
+
+    bundle = command_translations.load_bundle(signature)
+    assert bundle is not None
+    assert bundle["en-US"]["105"] == command_translations.translate(105, "en-US")
+
+
+def test_outdated_or_missing_bundle_is_ignored(bundle_path: Path) -> None:
+    assert command_translations.load_bundle("signature") is None
+
+    bundle_path.write_text(json.dumps({"signature": "old", "locales": {}}))
+    assert command_translations.load_bundle("new") is None
+
+
+def test_single_words_are_lowercased() -> None:
+    text = command_translations.translate(105, "en-US")
+    assert text is not None and " " not in text and text == text.lower()
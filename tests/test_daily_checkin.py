@@ -0,0 +1,79 @@
+import asyncio
+import datetime
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+
+daily_checkin = pytest.importorskip("apps.genshin.auto_task.daily_checkin")
+
+from apps.db.tables.checkin_jobs import CheckinJob, JobStatus  # noqa: E402
+from apps.genshin.auto_task.checkin_backend import CheckInBackend  # noqa: E402
+from dev.enum import CheckInAPI  # noqa: E402
+from dev.models import DefaultEmbed  # noqa: E402
+
+
+class FakeJobs:
+    def __init__(self, finished: bool = True) -> None:
+        self.finished = finished
+        self.calls: List[str] = []
+
+    async def finish(self, *_: Any, **__: Any) -> bool:
+        self.calls.append("finish")
+        return self.finished
+
+    async def release(self, *_: Any, **__: Any) -> bool:
+        self.calls.append("release")
+        return True
+
+
+class FakeUsers:
+    async def get(self, user_id: int, uid: int) -> Any:
+        return SimpleNamespace(user_id=user_id, uid=uid, daily_checkin=True)
+
+    async def update(self, *_: Any, **__: Any) -> None:
+        pass
+
+
+class BrokenSettings:
+    async def get(self, *_: Any) -> bool:
+        raise RuntimeError("settings are down")
+
+
+def make_checkin(jobs: FakeJobs) -> Any:
+    db = SimpleNamespace(
+        checkin_jobs=jobs, users=FakeUsers(), settings=BrokenSettings()
+    )
+    checkin = daily_checkin.DailyCheckin(SimpleNamespace(db=db))  # type: ignore
+    checkin._total[CheckInAPI.VERCEL] = 0
+    checkin._success[CheckInAPI.VERCEL] = 0
+
+    async def do_daily(*_: Any) -> DefaultEmbed:
+        return DefaultEmbed("Checked in")
+
+    checkin._do_genshin_daily = do_daily
+    return checkin
+
+
+def make_job() -> CheckinJob:
+    return CheckinJob(
+        user_id=1,
+        uid=2,
+        day=datetime.date(2023, 6, 1),
+        status=JobStatus.LEASED,
+        attempts=0,
+        worker="host-1-vercel",
+    )
+
+
+@pytest.mark.parametrize("finished", [True, False])
+def test_failed_notification_does_not_release_the_job(finished: bool) -> None:
+    jobs = FakeJobs(finished)
+    checkin = make_checkin(jobs)
+    backend = CheckInBackend(CheckInAPI.VERCEL)
+
+    asyncio.run(checkin._run_job(backend, make_job()))
+
+    assert jobs.calls == ["finish"]
+    assert backend.failures == 0
+    assert checkin._success[CheckInAPI.VERCEL] == 1
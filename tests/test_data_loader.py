@@ -0,0 +1,77 @@
+import json
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+
+loader = pytest.importorskip("data.loader")
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(loader, "CACHE_DIR", str(tmp_path / ".cache"))
+
+
+def write(path: Path, data: dict, mtime: int) -> None:
+    path.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_load_uses_the_pickle_cache(tmp_path: Path) -> None:
+    path = tmp_path / "data.yaml"
+    path.write_text("a: 1\n", encoding="utf-8")
+
+    assert loader.load(str(path)) == {"a": 1}
+    assert len(os.listdir(tmp_path / ".cache")) == 1
+    assert loader.load(str(path)) == {"a": 1}
+    assert loader.load(str(tmp_path / "missing.json")) == {}
+
+
+def test_lazy_data_checks_the_file_on_an_interval(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "data.json"
+    write(path, {"a": 1}, 1_000_000_000)
+    stats: List[str] = []
+    stat_key = loader._stat_key
+
+    def counting_stat_key(p: str):
+        stats.append(p)
+        return stat_key(p)
+
+    monkeypatch.setattr(loader, "_stat_key", counting_stat_key)
+    data = loader.LazyData(str(path), check_interval=3600)
+    assert not stats
+
+    assert data["a"] == 1
+    assert list(data) == ["a"]
+    assert len(data) == 1
+    assert len(stats) == 2  # LazyData.data and load
+
+    write(path, {"a": 2}, 2_000_000_000)
+    assert data["a"] == 1
+    assert len(stats) == 2
+
+    loader.check_for_updates()
+    assert data["a"] == 2
+
+
+def test_lazy_data_keeps_the_last_good_data(tmp_path: Path) -> None:
+    path = tmp_path / "data.json"
+    write(path, {"a": 1}, 1_000_000_000)
+    data = loader.LazyData(str(path), check_interval=0)
+    assert data["a"] == 1
+
+    path.write_text("{", encoding="utf-8")
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+    assert data["a"] == 1
+
+
+def test_lazy_data_ignore_errors(tmp_path: Path) -> None:
+    path = tmp_path / "data.json"
+    path.write_text("{", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        loader.LazyData(str(path))["a"]
+    assert not loader.LazyData(str(path), ignore_errors=True)
@@ -0,0 +1,101 @@
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from ambr import response_cache  # noqa: E402
+from ambr.endpoints import BASE  # noqa: E402
+
+URL = f"{BASE}en/avatar/10000002"
+
+
+class FakeResponse:
+    def __init__(self, status: int, data: Optional[Dict[str, Any]]) -> None:
+        self.status = status
+        self.headers = {"ETag": '"v1"'}
+        self.data = data
+
+    async def __aenter__(self) -> "FakeResponse":
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+    async def json(self) -> Optional[Dict[str, Any]]:
+        return self.data
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.requests: List[Dict[str, str]] = []
+        self.data: Dict[str, Any] = {"data": {"name": "Ayaka"}}
+
+    def get(self, url: str, headers: Dict[str, str]) -> FakeResponse:
+        self.requests.append(headers)
+        if headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(304, None)
+        return FakeResponse(200, self.data)
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(response_cache, "DETAIL_CACHE_DIR", str(tmp_path))
+
+
+def test_concurrent_lookups_share_one_request() -> None:
+    cache = response_cache.DetailCache()
+    session = FakeSession()
+
+    async def get_many() -> List[Dict[str, Any]]:
+        return await asyncio.gather(*(cache.get(session, URL) for _ in range(5)))  # type: ignore
+
+    results = asyncio.run(get_many())
+    assert all(r == session.data for r in results)
+    assert len(session.requests) == 1
+
+    asyncio.run(cache.get(session, URL))  # type: ignore
+    assert len(session.requests) == 1
+
+
+def test_responses_are_kept_on_disk() -> None:
+    session = FakeSession()
+    asyncio.run(response_cache.DetailCache().get(session, URL))  # type: ignore
+
+    data = asyncio.run(response_cache.DetailCache().get(session, URL))  # type: ignore
+    assert data == session.data
+    assert len(session.requests) == 1
+
+
+def test_stale_responses_are_revalidated() -> None:
+    cache = response_cache.DetailCache()
+    session = FakeSession()
+    asyncio.run(cache.get(session, URL))  # type: ignore
+
+    cache.invalidate()
+    assert asyncio.run(cache.get(session, URL)) == session.data  # type: ignore
+    assert session.requests == [{}, {"If-None-Match": '"v1"'}]
+
+    # the invalidation outlives a restart, the revalidated entry does not need another one
+    cache = response_cache.DetailCache()
+    asyncio.run(cache.get(session, URL))  # type: ignore
+    assert len(session.requests) == 2
+
+    expired = response_cache.DetailCache(ttl=0)
+    asyncio.run(expired.get(session, URL))  # type: ignore
+    assert len(session.requests) == 3
+
+
+def test_errors_are_not_cached() -> None:
+    cache = response_cache.DetailCache()
+    session = FakeSession()
+    session.data = {"code": 404}
+
+    with pytest.raises(ValueError):
+        asyncio.run(cache.get(session, URL))  # type: ignore
+    session.data = {"data": {"name": "Ayaka"}}
+    assert asyncio.run(cache.get(session, URL)) == session.data  # type: ignore
+    assert len(session.requests) == 2
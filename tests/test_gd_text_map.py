@@ -0,0 +1,81 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+text_maps = pytest.importorskip("apps.genshin_data.text_maps")
+
+DATA = {"3": "three", "1": "一", "200": "", "4294967295": "max"}
+
+
+def write_source(path: Path, data: dict, mtime: int) -> None:
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_store_lookups(tmp_path: Path) -> None:
+    source = tmp_path / "TextMapEN.json"
+    write_source(source, DATA, 1_000_000_000)
+    path = str(tmp_path / "EN.bin")
+    text_maps.build_store(str(source), path, 42)
+
+    store = text_maps.TextMapStore(path)
+    assert len(store) == 4
+    for text_hash, text in DATA.items():
+        assert store.get(int(text_hash)) == text
+    for text_hash in (0, 2, 201, 2**40):
+        assert store.get(text_hash) is None
+    assert text_maps._read_signature(path) == 42
+
+
+def test_empty_store(tmp_path: Path) -> None:
+    source = tmp_path / "TextMapEN.json"
+    write_source(source, {}, 1_000_000_000)
+    path = str(tmp_path / "EN.bin")
+    text_maps.build_store(str(source), path, 1)
+
+    store = text_maps.TextMapStore(path)
+    assert len(store) == 0
+    assert store.get(1) is None
+
+
+def test_read_signature_of_invalid_files(tmp_path: Path) -> None:
+    assert text_maps._read_signature(str(tmp_path / "missing.bin")) is None
+    short = tmp_path / "short.bin"
+    short.write_bytes(b"GDTM")
+    assert text_maps._read_signature(str(short)) is None
+    other = tmp_path / "other.bin"
+    other.write_bytes(text_maps.HEADER.pack(b"GDTM", 0, 1, 0))
+    assert text_maps._read_signature(str(other)) is None
+
+
+def test_load_rebuilds_changed_sources(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source_dir = tmp_path / "TextMap"
+    source_dir.mkdir()
+    monkeypatch.setattr(text_maps, "TEXT_MAP_DIR", str(source_dir))
+    monkeypatch.setattr(text_maps, "STORE_DIR", str(tmp_path / "stores"))
+    write_source(source_dir / "TextMapEN.json", {"1": "one"}, 1_000_000_000)
+    write_source(source_dir / "TextMapCHS.json", {"1": "一"}, 1_000_000_000)
+    (source_dir / "README.md").write_text("", encoding="utf-8")
+
+    gd_text_map = text_maps.GDTextMap()
+    gd_text_map.load()
+    assert gd_text_map.get(1, "EN") == "one"
+    assert gd_text_map.get(1, "CHS") == "一"
+    assert gd_text_map.get(1, "JP") is None
+
+    built = []
+    build_store = text_maps.build_store
+    monkeypatch.setattr(
+        text_maps,
+        "build_store",
+        lambda source, *args: built.append(source) or build_store(source, *args),
+    )
+    write_source(source_dir / "TextMapEN.json", {"1": "uno"}, 2_000_000_000)
+    gd_text_map = text_maps.GDTextMap()
+    gd_text_map.load()
+    assert built == [str(source_dir / "TextMapEN.json")]
+    assert gd_text_map.get(1, "EN") == "uno"
@@ -0,0 +1,37 @@
+import asyncio
+import copy
+from typing import Any, Dict
+
+import pytest
+
+leaderboard_view = pytest.importorskip("ui.genshin.leaderboard_view")
+
+from ambr import AmbrTopAPI, client  # noqa: E402
+
+
+def make_cache(name: str) -> Dict[str, Any]:
+    character = {
+        "id": "10000002",
+        "name": name,
+        "rank": 5,
+        "element": "Ice",
+        "weaponType": "WEAPON_SWORD_ONE_HAND",
+        "icon": "UI_AvatarIcon_Ayaka",
+    }
+    return {"en": {"character": {"data": {"items": {"10000002": character}}}}}
+
+
+def test_characters_are_mapped_once_per_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(leaderboard_view, "_characters", {})
+    monkeypatch.setattr(client, "_memory_cache", make_cache("Ayaka"))
+    api = AmbrTopAPI(None, "en")  # type: ignore
+
+    first = asyncio.run(leaderboard_view.get_characters(api))
+    assert first["10000002"].name == "Ayaka"
+    assert asyncio.run(leaderboard_view.get_characters(api)) is first
+
+    # a refreshed ambr.top cache rebuilds the map
+    monkeypatch.setattr(client, "_memory_cache", copy.deepcopy(make_cache("Kamisato")))
+    assert (
+        asyncio.run(leaderboard_view.get_characters(api))["10000002"].name == "Kamisato"
+    )
@@ -0,0 +1,55 @@
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+pc_icons = pytest.importorskip("apps.db.tables.pc_icons")
+
+
+class FakePool:
+    """Keeps character_pc_icon rows in memory"""
+
+    def __init__(self, icons: Dict[str, str]) -> None:
+        self.icons = icons
+        self.reads = 0
+
+    async def fetch(self, query: str) -> List[Dict[str, Any]]:
+        assert "FROM character_pc_icon" in query
+        self.reads += 1
+        return [{"character_id": k, "icon": v} for k, v in self.icons.items()]
+
+    async def executemany(self, query: str, rows: List[Tuple[str, str]]) -> None:
+        assert "INSERT INTO character_pc_icon" in query
+        self.icons.update(rows)
+
+
+def test_icons_are_read_once() -> None:
+    pool = FakePool({"10000002": "ayaka.png"})
+    table = pc_icons.PCIconTable(pool)  # type: ignore
+
+    icons = asyncio.run(table.get_all())
+    assert icons == {"10000002": "ayaka.png"}
+    icons["x"] = "y"  # a copy is returned
+
+    asyncio.run(table.update({"10000066": "ayato.png"}))
+    assert asyncio.run(table.get_all()) == {
+        "10000002": "ayaka.png",
+        "10000066": "ayato.png",
+    }
+    assert pool.reads == 1
+
+
+def test_missing_icons_are_remembered_not_stored() -> None:
+    pool = FakePool({})
+    table = pc_icons.PCIconTable(pool)  # type: ignore
+
+    asyncio.run(
+        table.update(
+            {"10000002": "ayaka.png", "10000066": ""},
+            checked=["10000002", "10000066", "10000052"],
+        )
+    )
+    assert pool.icons == {"10000002": "ayaka.png"}
+    assert not table.is_missing("10000002")
+    assert table.is_missing("10000066")
+    assert table.is_missing("10000052")
@@ -0,0 +1,65 @@
+import pytest
+
+search_index = pytest.importorskip("apps.genshin.search_index")
+
+ITEM_MAPS = {
+    "character": {
+        "10000002": {"en": "Kamisato Ayaka", "chs": "神里绫华"},
+        "10000066": {"en": "Kamisato Ayato", "chs": "神里绫人"},
+        "10000005": {"en": "Traveler", "chs": "旅行者"},
+        "10000052": {"en": "Raiden Shogun", "chs": "雷电将军"},
+    },
+    "weapon": {
+        "11509": {"en": "Mistsplitter Reforged", "chs": "雾切之回光"},
+        "10000002": {"en": "Duplicate", "chs": ""},
+    },
+    "material": {"104301": {"en": "Teachings of Freedom", "chs": "「自由」的教导"}},
+}
+
+
+@pytest.fixture
+def index():
+    return search_index.SearchIndex(ITEM_MAPS)
+
+
+def test_normalize() -> None:
+    assert search_index.normalize("Ayakà") == "ayaka"
+    assert search_index.normalize("AYAKA") == "ayaka"
+
+
+def test_item_types_keep_the_first_type(index) -> None:
+    assert index.item_types["10000002"] == "character"
+    assert index.item_types["11509"] == "weapon"
+    assert index.item_types["10000005"] == "character"
+
+
+def test_search_ranks_prefix_matches_first(index) -> None:
+    assert index.search("kamisato aya", "en") == [
+        ("10000002", "Kamisato Ayaka"),
+        ("10000066", "Kamisato Ayato"),
+    ]
+    assert index.search("ayato", "en") == [("10000066", "Kamisato Ayato")]
+    assert index.search("ay", "en")[0][0] in ("10000002", "10000066")
+    assert index.search("shogun", "en") == [("10000052", "Raiden Shogun")]
+
+
+def test_search_excludes_the_traveler(index) -> None:
+    assert index.search("traveler", "en") == []
+    assert "10000005" not in {item_id for item_id, _ in index.search("", "en")}
+
+
+def test_search_other_languages(index) -> None:
+    assert index.search("绫华", "chs") == [("10000002", "神里绫华")]
+    assert index.search("自由", "chs") == [("104301", "「自由」的教导")]
+    assert index.search("ayaka", "jp") == []
+
+
+def test_fuzzy_search(index) -> None:
+    assert index.search("mistspliter", "en") == [("11509", "Mistsplitter Reforged")]
+    assert index.search("xyz", "en") == []
+
+
+def test_empty_query_samples(index) -> None:
+    results = index.search("", "en", limit=3)
+    assert len(results) == 3
+    assert len(index.search("  ", "en", limit=25)) == 5
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from dev import sessions as sessions_module  # noqa: E402
+from dev.sessions import UPSTREAMS, SessionFactory, UpstreamConfig  # noqa: E402
+
+
+def test_module_factory_uses_default_upstreams() -> None:
+    assert set(sessions_module.sessions.upstreams) == set(UPSTREAMS)
+    assert set(sessions_module.sessions.stats) == set(UPSTREAMS)
+
+
+def test_custom_upstreams_are_copied() -> None:
+    upstreams = {"default": UpstreamConfig(limit=1, limit_per_host=1, timeout=1)}
+    factory = SessionFactory(upstreams)
+    upstreams["other"] = UpstreamConfig(limit=1, limit_per_host=1, timeout=1)
+
+    assert list(factory.upstreams) == ["default"]
+    assert list(factory.stats) == ["default"]
+
+
+def test_sessions_are_reused_per_upstream() -> None:
+    async def run() -> None:
+        factory = SessionFactory()
+        try:
+            assert factory.assets is factory.get("assets")
+            assert factory.assets is not factory.default
+            assert factory.assets.connector.limit == UPSTREAMS["assets"].limit
+        finally:
+            await factory.close()
+        assert factory.assets is not None
+        await factory.close()
+
+    asyncio.run(run())
+
+
+def test_summary_has_a_line_per_upstream() -> None:
+    factory = SessionFactory()
+    assert len(factory.get_summary().splitlines()) == len(UPSTREAMS)
@@ -0,0 +1,118 @@
+import asyncio
+import datetime
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+talents = pytest.importorskip("apps.db.tables.talents")
+
+UID = 700000001
+SYNCED = datetime.datetime(2023, 6, 1)
+
+
+class FakePool:
+    """Keeps talent_sync, character_talent and talent_boost rows in memory"""
+
+    def __init__(self) -> None:
+        self.sync: Dict[int, datetime.datetime] = {}
+        self.talents: Dict[Tuple[int, int], str] = {}
+        self.boosts: Dict[str, str] = {}
+        self.boost_reads = 0
+
+    def acquire(self) -> "FakePool":
+        return self
+
+    def transaction(self) -> "FakePool":
+        return self
+
+    async def __aenter__(self) -> "FakePool":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+    async def execute(self, query: str, *args: Any) -> None:
+        if "INSERT INTO talent_sync" in query:
+            self.sync[args[0]] = args[1]
+        elif "DELETE FROM character_talent" in query:
+            self.talents = {k: v for k, v in self.talents.items() if k[0] != args[0]}
+        else:
+            raise AssertionError(query)
+
+    async def executemany(self, query: str, rows: List[Tuple[Any, ...]]) -> None:
+        for row in rows:
+            if "INSERT INTO character_talent" in query:
+                self.talents[(row[0], row[1])] = row[2]
+            elif "INSERT INTO talent_boost" in query:
+                self.boosts[row[0]] = row[1]
+            else:
+                raise AssertionError(query)
+
+    async def fetchval(self, query: str, *args: Any) -> Any:
+        assert "FROM talent_sync" in query
+        return self.sync.get(args[0])
+
+    async def fetch(self, query: str, *args: Any) -> List[Dict[str, Any]]:
+        if "FROM character_talent" in query:
+            return [
+                {"character_id": character_id, "talents": levels}
+                for (uid, character_id), levels in self.talents.items()
+                if uid == args[0]
+            ]
+        if "FROM talent_boost" in query:
+            self.boost_reads += 1
+            return [{"character_id": k, "boost": v} for k, v in self.boosts.items()]
+        raise AssertionError(query)
+
+
+@pytest.fixture
+def pool() -> FakePool:
+    return FakePool()
+
+
+def test_never_synced(pool: FakePool) -> None:
+    table = talents.TalentTable(pool)  # type: ignore
+    assert asyncio.run(table.get(UID)) is None
+
+
+def test_update_replaces_talents(pool: FakePool) -> None:
+    table = talents.TalentTable(pool)  # type: ignore
+    asyncio.run(table.update(UID, {"10000002": "9/9/9", "10000066": "1/1/1"}, SYNCED))
+    asyncio.run(table.update(UID, {"10000002": "10/10/10"}, SYNCED))
+
+    result = asyncio.run(table.get(UID))
+    assert result is not None
+    assert result.talents == {"10000002": "10/10/10"}
+    assert result.last_updated == SYNCED
+
+
+def test_empty_sync_keeps_talents(pool: FakePool) -> None:
+    table = talents.TalentTable(pool)  # type: ignore
+    asyncio.run(table.update(UID, {"10000002": "9/9/9"}, SYNCED))
+    later = SYNCED + datetime.timedelta(days=1)
+    asyncio.run(table.update(UID, {}, later))
+
+    result = asyncio.run(table.get(UID))
+    assert result is not None
+    assert result.talents == {"10000002": "9/9/9"}
+    assert result.last_updated == later
+
+    asyncio.run(table.update(UID + 1, {}, later))
+    other = asyncio.run(table.get(UID + 1))
+    assert other is not None and other.talents == {}
+
+
+def test_boosts_are_read_once(pool: FakePool) -> None:
+    pool.boosts = {"10000002": "Skill"}
+    table = talents.TalentTable(pool)  # type: ignore
+
+    boosts = asyncio.run(table.get_boosts())
+    assert boosts == {"10000002": "Skill"}
+    boosts["x"] = "y"  # a copy is returned
+
+    asyncio.run(table.add_boosts({"10000066": "Burst"}))
+    assert asyncio.run(table.get_boosts()) == {
+        "10000002": "Skill",
+        "10000066": "Burst",
+    }
+    assert pool.boost_reads == 1
@@ -0,0 +1,28 @@
+import pytest
+
+text_map_app = pytest.importorskip("apps.text_map.text_map_app")
+
+
+@pytest.fixture
+def text_map():
+    text_map = text_map_app.TextMap.__new__(text_map_app.TextMap)
+    text_map.tables = {"en-US": ["zero", "one", ""], "zh-TW": ["零", "one", ""]}
+    text_map._default = text_map.tables["en-US"]
+    return text_map
+
+
+def test_get(text_map) -> None:
+    assert text_map.get(0) == "zero"
+    assert text_map.get(0, "zh-TW") == "零"
+    assert text_map.get(0, "en-US", user_locale="zh-TW") == "零"
+    assert text_map.get(1, "ja") == "one"
+    assert text_map.get(2) == ""
+
+
+@pytest.mark.parametrize("map_hash", [3, -1, -3, "3", "-1", "abc", ""])
+def test_get_missing_hash(text_map, map_hash) -> None:
+    assert text_map.get(map_hash) == ""
+
+
+def test_get_string_hash(text_map) -> None:
+    assert text_map.get("1") == "one"  # type: ignore
@@ -45,7 +45,7 @@ class ElementButton(ui.Button):
 
     async def callback(self, i: models.Inter):
         lang = await i.client.db.settings.get(i.user.id, Settings.LANG) or str(i.locale)
-        ambr = AmbrTopAPI(i.client.session, to_ambr_top(lang))
+        ambr = AmbrTopAPI(i.client.sessions.ambr, to_ambr_top(lang))
         characters = await ambr.get_character()
         if not isinstance(characters, List):
             raise TypeError("characters is not a list")
@@ -394,7 +394,7 @@ class TargetLevelModal(BaseModal):
         init_q = self.init_levels[3]
         init_ascension = self.init_levels[4]
 
-        ambr = AmbrTopAPI(i.client.session, to_ambr_top(self.lang))
+        ambr = AmbrTopAPI(i.client.sessions.ambr, to_ambr_top(self.lang))
         character = await ambr.get_character_detail(self.character_id)
         if not isinstance(character, ambr_models.CharacterDetail):
             raise TypeError("character is not a ambr_models.Character")
@@ -497,7 +497,7 @@ class TargetLevelModal(BaseModal):
         fp = await main_funcs.draw_material_card(
             models.DrawInput(
                 loop=i.client.loop,
-                session=i.client.session,
+                session=i.client.sessions.assets,
                 lang=self.lang,
                 dark_mode=dark_mode,
             ),
@@ -48,7 +48,7 @@ class WeaponTypeButton(ui.Button):
         self.view: View
 
     async def callback(self, i: models.Inter):
-        ambr = AmbrTopAPI(i.client.session, to_ambr_top(self.view.lang))
+        ambr = AmbrTopAPI(i.client.sessions.ambr, to_ambr_top(self.view.lang))
         weapons = await ambr.get_weapon()
         if not isinstance(weapons, typing.List):
             raise TypeError("weapons is not a list")
@@ -146,7 +146,7 @@ class LevelModal(BaseModal):
                 ephemeral=True,
             )
 
-        ambr = AmbrTopAPI(i.client.session, to_ambr_top(self.lang))
+        ambr = AmbrTopAPI(i.client.sessions.ambr, to_ambr_top(self.lang))
         weapon = await ambr.get_weapon_detail(int(self.weapon_id))
         if not isinstance(weapon, WeaponDetail):
             raise TypeError("weapon is not a WeaponDetail")
@@ -278,7 +278,7 @@ class LevelModal(BaseModal):
         fp = await main_funcs.draw_material_card(
             models.DrawInput(
                 loop=i.client.loop,
-                session=i.client.session,
+                session=i.client.sessions.assets,
                 lang=self.lang,
                 dark_mode=await i.client.db.settings.get(i.user.id, Settings.DARK_MODE),
             ),
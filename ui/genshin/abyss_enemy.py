@@ -80,7 +80,7 @@ class BuffButton(ui.Button):
 
 async def select_callback(i: Inter, view: View, value: str):
     await image_gen_transition(i, view, view.lang)
-    ambr = AmbrTopAPI(i.client.session, to_ambr_top(view.lang))  # type: ignore
+    ambr = AmbrTopAPI(i.client.sessions.ambr, to_ambr_top(view.lang))  # type: ignore
     halfs = view.halfs[value]
     embeds = []
     attachments = []
@@ -113,7 +113,7 @@ async def select_callback(i: Inter, view: View, value: str):
         fp = await main_funcs.draw_material_card(
             DrawInput(
                 loop=i.client.loop,
-                session=i.client.session,
+                session=i.client.sessions.assets,
                 lang=view.lang,
                 dark_mode=await i.client.db.settings.get(i.user.id, Settings.DARK_MODE),
             ),
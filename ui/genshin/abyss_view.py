@@ -59,13 +59,13 @@ class FloorSelect(ui.Select):
             )
             await i.edit_original_response(embed=embed, attachments=[])
             cache = i.client.abyss_one_page_cache
-            key = self.abyss_result.genshin_user.info.nickname
+            key = self.abyss_result.uid
             fp = cache.get(key)
             if fp is None:
                 fp = await draw_abyss_one_page(
                     DrawInput(
                         loop=i.client.loop,
-                        session=i.client.session,
+                        session=i.client.sessions.assets,
                         lang=lang,
                         dark_mode=dark_mode,
                     ),
@@ -103,7 +103,7 @@ class FloorSelect(ui.Select):
                 fp = await main_funcs.draw_abyss_floor_card(
                     DrawInput(
                         loop=i.client.loop,
-                        session=i.client.session,
+                        session=i.client.sessions.assets,
                         dark_mode=dark_mode,
                     ),
                     self.abyss_result.abyss_floors[int(self.values[0])],
@@ -238,7 +238,7 @@ async def get_embeds_for_lineup(
     fp = await main_funcs.draw_lineup_card(
         DrawInput(
             loop=i.client.loop,
-            session=i.client.session,
+            session=i.client.sessions.assets,
             lang=lang,
             dark_mode=dark_mode,
         ),
@@ -73,14 +73,13 @@ class View(BaseView):
             now += relativedelta(months=month_offset)
         month = now.month
 
-        client = await self.user.client
-        client.lang = to_genshin_py(self.lang)
+        client = await self.user.get_client(to_genshin_py(self.lang))
         diary = await client.get_diary(self.user.uid, month=month)
 
         fp = await draw_diary_card(
             DrawInput(
                 loop=i.client.loop,
-                session=i.client.session,
+                session=i.client.sessions.assets,
                 lang=self.lang,
                 dark_mode=self.dark_mode,
             ),
@@ -71,7 +71,7 @@ async def return_farm_interaction(i: Inter, weekday: Optional[int] = None):
     fp = await main_funcs.draw_farm_domain_card(
         DrawInput(
             loop=i.client.loop,
-            session=session,
+            session=i.client.sessions.assets,
             lang=lang,
             dark_mode=await i.client.db.settings.get(i.user.id, Settings.DARK_MODE),
         ),
@@ -1,55 +1,80 @@
 import random
-from typing import Any, Dict, List
+from typing import Any, List, Optional, Union
 
 import aiohttp
 import discord
 import PIL
 from discord import ui, utils
-from pyppeteer import browser
+from pyppeteer.browser import BrowserContext
 
 import dev.asset as asset
 import dev.config as config
-import yelan.damage_calculator as damage_calc
+import yelan.damage_calculator as go_calc
 from apps.db.custom_image import get_user_custom_image
+from apps.genshin.browser import BrowserPool
 from apps.db.tables.user_settings import Settings
 from apps.draw import main_funcs
-from apps.genshin import get_browser
+from apps.genshin import damage_calc
 from apps.text_map import text_map
-from dev.base_ui import BaseView, EnkaView
+from dev.base_ui import BaseView, EnkaView, capture_exception
 from dev.exceptions import CardNotReady, NoCharacterFound
-from dev.models import DrawInput, ErrorEmbed, Inter
-from utils import divide_chunks, get_character_fanarts
+from dev.models import DefaultEmbed, DrawInput, ErrorEmbed, Inter
+from utils import add_bullet_points, divide_chunks, get_character_fanarts, log
 from yelan.data.GO_modes import HIT_MODE_TEXTS
 
 
 class View(BaseView):
+    """Damage calculator of a character
+
+    Damage is calculated by Genshin Optimizer in ``browser``, a context leased from
+    ``browser_pool`` that is given back when the view times out or the user goes
+    back to the profile. Without a browser,
+    e.g. when the browsers failed to launch, the in-process calculator is used,
+    which does not model weapon passives, artifact set effects, character passives
+    and team buffs.
+    """
+
     def __init__(
         self,
         enka_view: EnkaView,
         lang: discord.Locale | str,
-        browsers: Dict[str, browser.Browser],
+        session: aiohttp.ClientSession,
+        browser: Optional[BrowserContext] = None,
+        browser_pool: Optional[BrowserPool] = None,
     ):
         super().__init__(timeout=config.long_timeout)
 
         # defining damage calculation variables
         self.enka_view = enka_view
-        character_name = ""
+        self.lang = lang
+        self.browser = browser
+        self.browser_pool = browser_pool
         if enka_view.data.characters is None:
             raise NoCharacterFound
-        for character in enka_view.data.characters:
-            if str(character.id) == enka_view.character_id:
-                character_name = character.name
-                break
-
-        self.calculator = damage_calc.DamageCalculator(
-            character_name,
-            enka_view.en_data,
-            enka_view.character_id,
-            lang,
-            "critHit",
-            enka_view.member,
-            get_browser(browsers, str(lang)),
+        character = utils.get(
+            enka_view.data.characters, id=int(enka_view.character_id)
         )
+        if character is None:
+            raise NoCharacterFound
+
+        self.calculator: Union[go_calc.DamageCalculator, damage_calc.DamageCalculator]
+        if browser is not None:
+            self.calculator = go_calc.DamageCalculator(
+                character.name,
+                enka_view.en_data,
+                enka_view.character_id,
+                lang,
+                "critHit",
+                enka_view.member,
+                browser,
+            )
+        else:
+            self.calculator = damage_calc.DamageCalculator(
+                character,
+                enka_view.data.characters,
+                session,
+                str(lang),
+            )
 
         # producing select options
         reaction_mode_options = [
@@ -124,6 +149,16 @@ class View(BaseView):
         self.add_item(GoBack())
         self.add_item(RunCalc(text_map.get(502, lang)))
 
+    def release_browser(self) -> None:
+        """Give the browser context back to the pool"""
+        if self.browser is not None and self.browser_pool is not None:
+            self.browser_pool.release(self.browser)
+        self.browser = None
+
+    async def on_timeout(self) -> None:
+        self.release_browser()
+        await super().on_timeout()
+
 
 class GoBack(ui.Button):
     def __init__(self):
@@ -134,6 +169,9 @@ class GoBack(ui.Button):
         if isinstance(self.view, EnkaView):
             view = self.view
         else:
+            if isinstance(self.view, View):
+                self.view.release_browser()
+                self.view.stop()
             view = self.view.enka_view
         await go_back_callback(i, view)
 
@@ -172,7 +210,7 @@ async def go_back_callback(i: Inter, enka_view: EnkaView):
             card = await main_funcs.draw_profile_card_v2(
                 DrawInput(
                     loop=i.client.loop,
-                    session=i.client.session,
+                    session=i.client.sessions.assets,
                     lang=enka_view.lang,
                     dark_mode=dark_mode,
                 ),
@@ -183,7 +221,7 @@ async def go_back_callback(i: Inter, enka_view: EnkaView):
             card = await main_funcs.draw_profile_card_v1(
                 DrawInput(
                     loop=i.client.loop,
-                    session=i.client.session,
+                    session=i.client.sessions.assets,
                     lang=enka_view.lang,
                     dark_mode=dark_mode,
                 ),
@@ -215,7 +253,7 @@ class HitModeButton(ui.Button):
 
     async def callback(self, i: Inter) -> Any:
         self.view.calculator.hit_mode = self.hit_mode
-        await damage_calc.return_current_status(i, self.view)
+        await return_current_status(i, self.view)
 
 
 class ReactionModeSelect(ui.Select):
@@ -229,7 +267,7 @@ class ReactionModeSelect(ui.Select):
         self.view.calculator.reaction_mode = (
             "" if self.values[0] == "none" else self.values[0]
         )
-        await damage_calc.return_current_status(i, self.view)
+        await return_current_status(i, self.view)
 
 
 class InfusionAuraSelect(ui.Select):
@@ -243,7 +281,7 @@ class InfusionAuraSelect(ui.Select):
         self.view.calculator.infusion_aura = (
             "" if self.values[0] == "none" else self.values[0]
         )
-        await damage_calc.return_current_status(i, self.view)
+        await return_current_status(i, self.view)
 
 
 class TeamSelectView(BaseView):
@@ -261,7 +299,7 @@ class GoBackToCalc(ui.Button):
         view = self.view.prev_view
         view.author = i.user
         await i.response.edit_message(view=view)
-        await damage_calc.return_current_status(i, view, True)
+        await return_current_status(i, view, True)
         view.message = await i.original_response()
 
 
@@ -308,7 +346,7 @@ class TeamSelect(ui.Select):
 
     async def callback(self, i: Inter) -> Any:
         self.view.prev_view.calculator.team = self.values
-        await damage_calc.return_current_status(i, self.view.prev_view)
+        await return_current_status(i, self.view.prev_view)
 
 
 class RunCalc(ui.Button):
@@ -323,4 +361,77 @@ class RunCalc(ui.Button):
         self.view: View
 
     async def callback(self, i: Inter) -> Any:
-        await damage_calc.return_damage(i, self.view)
+        if isinstance(self.view.calculator, damage_calc.DamageCalculator):
+            return await return_damage(i, self.view)
+
+        if self.view.browser_pool is None:
+            raise AssertionError
+        async with self.view.browser_pool.job(str(self.view.lang)):
+            await go_calc.return_damage(i, self.view)
+
+
+def _status_embed(view: View) -> DefaultEmbed:
+    calculator = view.calculator
+    lang = view.lang
+    character = calculator.current_character
+
+    reaction_hashes = {"melt": 332, "vaporize": 333, "spread": 525, "aggravate": 526}
+    infusion_hashes = {"pyro": 339, "cryo": 340, "hydro": 360}
+    conditions = [
+        text_map.get(HIT_MODE_TEXTS[calculator.hit_mode], lang),
+        text_map.get(reaction_hashes.get(calculator.reaction_mode, 331), lang),
+        text_map.get(infusion_hashes.get(calculator.infusion_aura, 338), lang),
+    ]
+    team = [c.name for c in calculator.characters if str(c.id) in calculator.team]
+
+    embed = DefaultEmbed(character.name)
+    embed.add_field(name=text_map.get(346, lang), value=add_bullet_points(conditions))
+    if team:
+        embed.add_field(name=text_map.get(345, lang), value=add_bullet_points(team))
+    if character.image is not None:
+        embed.set_thumbnail(url=character.image.icon.url)
+    return embed
+
+
+async def return_current_status(i: Inter, view: View, responded: bool = False):
+    if not isinstance(view.calculator, damage_calc.DamageCalculator):
+        return await go_calc.return_current_status(i, view, responded)
+
+    embed = _status_embed(view)
+    if responded:
+        await i.edit_original_response(embed=embed, attachments=[], view=view)
+    else:
+        await i.response.edit_message(embed=embed, attachments=[], view=view)
+
+
+async def return_damage(i: Inter, view: View):
+    lang = view.lang
+    await i.response.edit_message(
+        embed=DefaultEmbed(text_map.get(329, lang), text_map.get(330, lang)),
+        attachments=[],
+        view=view,
+    )
+
+    try:
+        talents = await view.calculator.calculate()
+    except Exception as e:  # skipcq: PYL-W0703
+        log.warning(f"[{i.user.id}]return_damage: {e}", exc_info=e)
+        capture_exception(e)
+        return await i.edit_original_response(
+            embed=ErrorEmbed().set_author(
+                name=text_map.get(533, lang), icon_url=i.user.display_avatar.url
+            ),
+            view=view,
+        )
+
+    embed = _status_embed(view)
+    for talent in talents:
+        if not talent.rows:
+            continue
+        lines = [
+            f"{row.label}: **{' / '.join(format(d, ',') for d in row.damage)}**"
+            for row in talent.rows
+        ]
+        embed.add_field(name=talent.name, value="\n".join(lines)[:1024], inline=False)
+    embed.set_footer(text=text_map.get(814, lang))
+    await i.edit_original_response(embed=embed, view=view)
@@ -14,8 +14,7 @@ from dev.base_ui import EnkaView
 from dev.exceptions import FeatureDisabled
 from ui.genshin import enka_damage_calc, profile_settings
 from ui.others.settings import custom_image
-from utils import divide_chunks, get_dt_now
-from yelan.damage_calculator import return_current_status
+from utils import divide_chunks, get_dt_now, log
 
 
 class View(EnkaView):
@@ -170,9 +169,21 @@ class CalculateDamageButton(ui.Button):
         if now.month == 4 and now.day == 1:
             raise FeatureDisabled
 
-        view = enka_damage_calc.View(self.view, self.view.lang, i.client.browsers)
+        browser = None
+        if i.client.browser_pool is not None:
+            try:
+                browser = await i.client.browser_pool.acquire(str(self.view.lang))
+            except Exception as e:  # skipcq: PYL-W0703
+                log.warning(f"[{i.user.id}]CalculateDamageButton: {e}", exc_info=e)
+        view = enka_damage_calc.View(
+            self.view,
+            self.view.lang,
+            i.client.sessions.ambr,
+            browser,
+            i.client.browser_pool,
+        )
         view.author = i.user
-        await return_current_status(i, view)
+        await enka_damage_calc.return_current_status(i, view)
         view.message = await i.original_response()
 
 
@@ -197,7 +208,7 @@ class ShowArtifacts(ui.Button):
         fp = await draw_artifact_card(
             models.DrawInput(
                 loop=i.client.loop,
-                session=i.client.session,
+                session=i.client.sessions.assets,
                 lang=self.view.lang,
                 dark_mode=await i.client.db.settings.get(i.user.id, Settings.DARK_MODE),
             ),
@@ -2,7 +2,7 @@ import asyncio
 import io
 import typing
 from enum import Enum
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import aiohttp
 import discord
@@ -12,12 +12,13 @@ import dev.config as config
 import dev.models as models
 from ambr import AmbrTopAPI, Character
 from apps.db.tables.abyss_board import AbyssBoardEntry
-from apps.db.tables.abyss_chara_board import AbyssCharaBoardEntry
+from apps.db.tables.abyss_chara_board import AbyssCharaBoard, AbyssCharaUsage
 from apps.db.tables.user_settings import Settings
 from apps.draw import main_funcs
 from apps.text_map import text_map, to_ambr_top
 from dev.base_ui import BaseButton, BaseSelect, BaseView
 from dev.enum import Category
+from dev.sessions import SessionFactory
 from utils import get_abyss_season_date_range, get_character_emoji
 from utils.genshin import get_current_abyss_season
 
@@ -27,6 +28,23 @@ class Area(Enum):
     SERVER = "server"
 
 
+_characters: Dict[str, Tuple[Any, Dict[str, Character]]] = {}
+"""ambr.top language to the character cache a map was built from and the map"""
+
+
+async def get_characters(client: AmbrTopAPI) -> Dict[str, Character]:
+    """Character ID to character, built once per language and ambr.top cache refresh"""
+    data = client.get_cache("character")
+    cached = _characters.get(client.lang)
+    if cached is None or cached[0] is not data:
+        characters = await client.get_character()
+        if not isinstance(characters, list):
+            raise AssertionError
+        cached = (data, {c.id: c for c in characters})
+        _characters[client.lang] = cached
+    return cached[1]
+
+
 class View(BaseView):
     def __init__(self) -> None:
         super().__init__(timeout=config.mid_timeout)
@@ -58,6 +76,9 @@ class View(BaseView):
             discord.SelectOption(
                 label=text_map.get(160, self.lang), value="full_clear"
             ),
+            discord.SelectOption(
+                label=text_map.get(817, self.lang), value="team_usage"
+            ),
         ]
         return options
 
@@ -85,75 +106,62 @@ class View(BaseView):
         await i.followup.send(embed=embed, view=self)
         self.message = await i.original_response()
 
-    @staticmethod
-    def _filter_guild_members(
-        entries: Union[List[AbyssBoardEntry], List[AbyssCharaBoardEntry]],
-        guild: discord.Guild,
-    ):
-        """Filter out leaderboard entries that are not in the guild member list"""
-        for e in entries:
-            if guild.get_member(e.user_id) is None:
-                entries.remove(e)  # type: ignore
-
-        return entries
-
-    @staticmethod
-    async def _filter_invalid_entries(
-        entries: Union[List[AbyssBoardEntry], List[AbyssCharaBoardEntry]],
-        db: models.Database,
-    ):
-        for e in entries:
-            if isinstance(e, AbyssBoardEntry) and e.runs == 0:
-                entries.remove(e)  # type: ignore
-                await db.leaderboard.abyss.delete(e.uid, e.season)
-
-        return entries
-
     async def return_leaderboard(self, i: models.Inter):
         """Draw the leaderboard image and return leaderboard interaction"""
-        if i.guild and not i.guild.chunked:
-            await i.guild.chunk()
+        user_ids = None
+        if i.guild and self.area is Area.SERVER:
+            # members stay cached after the first chunk, the filtering is done in the query
+            if not i.guild.chunked:
+                await i.guild.chunk()
+            user_ids = [m.id for m in i.guild.members]
 
-        # get leaderboard entries
         season = None if self.season == 0 else self.season
-        if self.category is Category.SINGLE_STRIKE:
-            entries = await i.client.db.leaderboard.abyss.get_all(self.category, season)
-        elif self.category is Category.CHARACTER_USAGE_RATE:
-            entries = await i.client.db.leaderboard.abyss_character.get_all(season)
-        elif self.category is Category.FULL_CLEAR:
-            entries = await i.client.db.leaderboard.abyss.get_all(self.category, season)
-        else:
-            entries = []
-
-        # filter out invalid entries
-        entries = await self._filter_invalid_entries(entries, i.client.db)
-
-        # filter out users that are not in the guild
-        if i.guild and self.area is Area.SERVER:
-            entries = self._filter_guild_members(entries, i.guild)
+        fp: Optional[io.BytesIO] = None
+        if self.category is Category.CHARACTER_USAGE_RATE:
+            usage = await i.client.db.leaderboard.abyss_character.get_usage(
+                season, user_ids
+            )
+            if not usage.characters:
+                return await self._send_empty_board(i)
 
-        if not entries:
-            embed = models.ErrorEmbed()
-            embed.set_author(
-                name=text_map.get(620, self.lang), icon_url=i.user.display_avatar.url
+            embed, fp = await self.draw_character_usage(
+                usage, i.client.sessions, i.client.loop
+            )
+        elif self.category in (Category.SINGLE_STRIKE, Category.FULL_CLEAR):
+            page = await i.client.db.leaderboard.abyss.get_board(
+                self.category, self.uid, season, user_ids
             )
-            return await i.followup.send(embed=embed, ephemeral=True)
+            users = [
+                models.BoardUser(rank=e.rank, entry=e.entry) for e in page.entries
+            ]
+            current_user = next((u for u in users if u.entry.uid == self.uid), None)
+            if not users:
+                return await self._send_empty_board(i)
 
-        # draw leaderboards
-        if isinstance(entries[0], AbyssBoardEntry):
-            current_user, users = self.get_board_users(entries)  # type: ignore
             if self.category is Category.SINGLE_STRIKE:
                 embed, fp = await self.draw_single_strike(
-                    current_user, users, i.client.session, i.client.loop
+                    current_user,
+                    users,
+                    page.total,
+                    i.client.sessions.assets,
+                    i.client.loop,
                 )
             else:  # self.category is Category.FULL_CLEAR
                 embed, fp = await self.draw_full_clear(
-                    current_user, users, i.client.session, i.client.loop
+                    current_user,
+                    users,
+                    page.total,
+                    i.client.sessions.assets,
+                    i.client.loop,
                 )
-        else:
-            embed, fp = await self.draw_character_usage(
-                entries, i.client.session, i.client.loop  # type: ignore
+        elif self.category is Category.TEAM_USAGE:
+            embed = await self.get_team_usage_embed(
+                i.client.db.leaderboard.abyss_character, season, user_ids
             )
+            if embed is None:
+                return await self._send_empty_board(i)
+        else:
+            return await self._send_empty_board(i)
 
         # enable the global and server buttons
         glob: Global = self.get_item("global")
@@ -174,39 +182,24 @@ class View(BaseView):
         )
 
         # send leaderboard
-        fp.seek(0)
-        await i.edit_original_response(
-            embed=embed, attachments=[discord.File(fp, "board.png")], view=self
+        attachments = []
+        if fp is not None:
+            fp.seek(0)
+            attachments.append(discord.File(fp, "board.png"))
+        await i.edit_original_response(embed=embed, attachments=attachments, view=self)
+
+    async def _send_empty_board(self, i: models.Inter):
+        embed = models.ErrorEmbed()
+        embed.set_author(
+            name=text_map.get(620, self.lang), icon_url=i.user.display_avatar.url
         )
-
-    def get_board_users(
-        self, entries: List[AbyssBoardEntry]
-    ) -> Tuple[
-        Optional[models.BoardUser[AbyssBoardEntry]],
-        List[models.BoardUser[AbyssBoardEntry]],
-    ]:
-        current_user = None
-        rank = 1
-        uids: List[int] = []
-        users: List[models.BoardUser[AbyssBoardEntry]] = []
-        for e in entries:
-            if e.uid in uids:
-                continue
-
-            user = models.BoardUser(rank=rank, entry=e)
-            users.append(user)
-            uids.append(e.uid)
-
-            if e.uid == self.uid:
-                current_user = user
-            rank += 1
-
-        return current_user, users
+        return await i.followup.send(embed=embed, ephemeral=True)
 
     async def draw_single_strike(
         self,
         current_user: Optional[models.BoardUser[AbyssBoardEntry]],
         users: List[models.BoardUser[AbyssBoardEntry]],
+        total: int,
         session: aiohttp.ClientSession,
         loop: asyncio.AbstractEventLoop,
     ) -> Tuple[discord.Embed, io.BytesIO]:
@@ -225,7 +218,7 @@ class View(BaseView):
             text_map.get(80, self.lang),
             f"""
             {text_map.get(457, self.lang) if current_user is None else text_map.get(614, self.lang).format(rank=current_user.rank)}
-            {text_map.get(615, self.lang).format(num=len(users))}
+            {text_map.get(615, self.lang).format(num=total)}
             """,
         )
         embed.set_author(
@@ -241,6 +234,7 @@ class View(BaseView):
         self,
         current_user: Optional[models.BoardUser[AbyssBoardEntry]],
         users: List[models.BoardUser[AbyssBoardEntry]],
+        total: int,
         session: aiohttp.ClientSession,
         loop: asyncio.AbstractEventLoop,
     ) -> Tuple[discord.Embed, io.BytesIO]:
@@ -259,7 +253,7 @@ class View(BaseView):
             text_map.get(160, self.lang),
             f"""
             {text_map.get(457, self.lang) if current_user is None else text_map.get(614, self.lang).format(rank=current_user.rank)}
-            {text_map.get(615, self.lang).format(num=len(users))}
+            {text_map.get(615, self.lang).format(num=total)}
             """,
         )
         embed.set_author(
@@ -273,34 +267,26 @@ class View(BaseView):
 
     async def draw_character_usage(
         self,
-        entries: List[AbyssCharaBoardEntry],
-        session: aiohttp.ClientSession,
+        usage: AbyssCharaUsage,
+        sessions: SessionFactory,
         loop: asyncio.AbstractEventLoop,
     ) -> Tuple[discord.Embed, io.BytesIO]:
         uc_list: List[models.UsageCharacter] = []
-        temp_dict: Dict[int, int] = {}
-        for e in entries:
-            if e.character_ids is None:
-                continue
-            for c in e.character_ids:
-                if c in temp_dict:
-                    temp_dict[c] += 1
-                else:
-                    temp_dict[c] = 1
-
-        client = AmbrTopAPI(session, to_ambr_top(self.lang))
-        for key, value in temp_dict.items():
-            if key in asset.traveler_ids:
+        characters = await get_characters(
+            AmbrTopAPI(sessions.ambr, to_ambr_top(self.lang))
+        )
+        for c in usage.characters:
+            key = str(c.character_id)
+            if c.character_id in asset.traveler_ids:
                 key = f"{key}-anemo"
-            character = await client.get_character(str(key))
-            if not isinstance(character, Character):
-                raise AssertionError
-            uc_list.append(models.UsageCharacter(character=character, usage_num=value))
+            uc_list.append(
+                models.UsageCharacter(character=characters[key], usage_num=c.uses)
+            )
 
         result = await main_funcs.abyss_character_usage_card(
             models.DrawInput(
                 loop=loop,
-                session=session,
+                session=sessions.assets,
                 lang=self.lang,
                 dark_mode=self.dark_mode,
             ),
@@ -312,7 +298,7 @@ class View(BaseView):
         embed = models.DefaultEmbed(
             text_map.get(617, self.lang),
             f"{text_map.get(618, self.lang).format(name=character_name, num=result.uses, percent=round(result.percentage, 1))}\n"
-            f"{text_map.get(615, self.lang).format(num=len(entries))}",
+            f"{text_map.get(615, self.lang).format(num=usage.players)}",
         )
         embed.set_author(
             name=get_al_title(self.season, self.lang),
@@ -323,6 +309,38 @@ class View(BaseView):
 
         return embed, result.fp
 
+    async def get_team_usage_embed(
+        self,
+        board: AbyssCharaBoard,
+        season: Optional[int],
+        user_ids: Optional[List[int]],
+    ) -> Optional[discord.Embed]:
+        """The most used teams of each floor 12 chamber, None if there are none"""
+        embed = models.DefaultEmbed(text_map.get(817, self.lang))
+        for chamber in range(1, 4):
+            teams = await board.get_teams(season, chamber, user_ids, limit=5)
+            if not teams:
+                continue
+            lines = [
+                " ".join(get_character_emoji(str(c)) or str(c) for c in team.characters)
+                + f" - {text_map.get(612, self.lang).format(num=team.uses)}"
+                for team in teams
+            ]
+            embed.add_field(
+                name=text_map.get(177, self.lang).format(a=chamber),
+                value="\n".join(lines),
+                inline=False,
+            )
+        if not embed.fields:
+            return None
+
+        embed.set_author(
+            name=get_al_title(self.season, self.lang),
+            icon_url=self.author.display_avatar.url,
+        )
+        embed.set_footer(text=text_map.get(619, self.lang).format(command="/abyss"))
+        return embed
+
 
 class LeaderboardSelect(BaseSelect):
     def __init__(self, placeholder: str, options: List[discord.SelectOption]):
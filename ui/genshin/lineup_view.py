@@ -218,7 +218,7 @@ class LineupSelector(Select):
         fp = await main_funcs.draw_lineup_card(
             DrawInput(
                 loop=i.client.loop,
-                session=i.client.session,
+                session=i.client.sessions.assets,
                 lang=self.view.lang,
                 dark_mode=await i.client.db.settings.get(i.user.id, Settings.DARK_MODE),
             ),
@@ -52,7 +52,7 @@ class QuickNavigation(ui.Select):
             fp = await main_funcs.draw_material_card(
                 DrawInput(
                     loop=i.client.loop,
-                    session=i.client.session,
+                    session=i.client.sessions.assets,
                     lang=self.view.lang,
                     dark_mode=self.view.dark_mode,
                 ),
@@ -275,7 +275,7 @@ async def parse_weapon_wiki(
     fp = await main_funcs.draw_material_card(
         DrawInput(
             loop=i.client.loop,
-            session=i.client.session,
+            session=i.client.sessions.assets,
             lang=lang,
             dark_mode=dark_mode,
         ),
@@ -356,7 +356,7 @@ async def parse_material_wiki(
         fp = await main_funcs.draw_material_card(
             DrawInput(
                 loop=i.client.loop,
-                session=i.client.session,
+                session=i.client.sessions.assets,
                 lang=lang,
                 dark_mode=dark_mode,
             ),
@@ -414,7 +414,7 @@ async def parse_monster_wiki(
         fp = await main_funcs.draw_material_card(
             DrawInput(
                 loop=i.client.loop,
-                session=i.client.session,
+                session=i.client.sessions.assets,
                 lang=lang,
                 dark_mode=dark_mode,
             ),
@@ -456,7 +456,7 @@ async def parse_food_wiki(
             fp = await main_funcs.draw_material_card(
                 DrawInput(
                     loop=i.client.loop,
-                    session=i.client.session,
+                    session=i.client.sessions.assets,
                     lang=lang,
                     dark_mode=dark_mode,
                 ),
@@ -502,7 +502,7 @@ async def parse_furniture_wiki(
         fp = await main_funcs.draw_material_card(
             DrawInput(
                 loop=i.client.loop,
-                session=i.client.session,
+                session=i.client.sessions.assets,
                 lang=lang,
                 dark_mode=dark_mode,
             ),
@@ -4,20 +4,18 @@ from typing import List, Union
 
 import discord
 import genshin
-from dateutil import parser
 from discord import ui
 
 import ambr
 import data.game.elements as game_elements
 import dev.asset as asset
 import dev.config as config
-from apps.db.json import read_json
 from apps.db.tables.user_settings import Settings
 from apps.draw import main_funcs
 from apps.text_map import text_map
 from dev.base_ui import BaseView
 from dev.models import DefaultEmbed, DrawInput, ErrorEmbed, Inter
-from utils import get_dt_now, image_gen_transition, update_talents_json
+from utils import get_dt_now, image_gen_transition, update_talents
 
 
 class View(BaseView):
@@ -83,15 +81,18 @@ class View(BaseView):
     ) -> io.BytesIO:
         draw_input = DrawInput(
             loop=i.client.loop,
-            session=i.client.session,
+            session=i.client.sessions.assets,
             lang=self.lang,
             dark_mode=await i.client.db.settings.get(i.user.id, Settings.DARK_MODE),
         )
         uid = await i.client.db.users.get_uid(self.member.id)
-        talents = await read_json(i.client.pool, f"talents/{uid}.json")
+        talents = await i.client.db.talents.get(uid)
 
         fp = await main_funcs.character_summary_card(
-            draw_input, self.character_copy, talents or {}, i.client.pool
+            draw_input,
+            self.character_copy,
+            talents.talents if talents else {},
+            i.client.db.pc_icons,
         )
         return fp
 
@@ -206,12 +207,11 @@ class UpdateTalentsJson(ui.Button):
         )
 
         acc = await i.client.db.users.get(i.user.id)
-        talents = await read_json(i.client.pool, f"talents/{acc.uid}.json")
+        talents = await i.client.db.talents.get(acc.uid)
         if (
             talents
-            and "last_updated" in talents
-            and get_dt_now() - parser.parse(talents["last_updated"])  # type: ignore
-            < timedelta(hours=1)
+            and talents.last_updated
+            and get_dt_now() - talents.last_updated < timedelta(hours=1)
         ):
             return await i.edit_original_response(
                 embed=ErrorEmbed().set_author(
@@ -219,12 +219,12 @@ class UpdateTalentsJson(ui.Button):
                     icon_url=i.user.display_avatar.url,
                 )
             )
-        await update_talents_json(
+        await update_talents(
             self.view.characters,
             await acc.client,
-            i.client.pool,
+            i.client.db.talents,
             acc.uid,
-            i.client.session,
+            i.client.sessions.ambr,
         )
         await i.edit_original_response(
             embed=DefaultEmbed(description=text_map.get(763, lang)).set_title(
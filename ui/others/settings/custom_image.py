@@ -67,7 +67,7 @@ class GoBackCharacter(ui.Button):
 
 
 async def element_button_callback(i: Inter, view: View, element: str):
-    ambr = AmbrTopAPI(i.client.session, to_ambr_top(view.lang))
+    ambr = AmbrTopAPI(i.client.sessions.ambr, to_ambr_top(view.lang))
     characters = await ambr.get_character()
     if not isinstance(characters, List):
         raise TypeError("characters is not a list")
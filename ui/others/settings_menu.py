@@ -21,6 +21,7 @@ class View(BaseView):
         self.add_item(CustomProfileImage(lang))
         self.add_item(Notification(lang))
         self.add_item(AutoRedeem(lang))
+        self.add_item(AbyssBoardRefresh(lang))
 
         self.original_info: OriginalInfo
         self.lang = lang
@@ -175,6 +176,44 @@ class RedeemButton(ui.Button):
         await i.response.edit_message(embed=embed, view=view)
 
 
+class AbyssBoardRefresh(ui.Button):
+    def __init__(self, lang: str | discord.Locale):
+        super().__init__(emoji=asset.reload_emoji, label=text_map.get(815, lang), row=3)
+        self.lang = lang
+        self.view: View
+
+    async def callback(self, i: Inter):
+        refresh = await i.client.db.settings.get(
+            i.user.id, Settings.ABYSS_BOARD_REFRESH
+        )
+
+        embed = get_abyss_board_refresh_embed(i.user.display_avatar.url, self.lang)
+        view = get_abyss_board_refresh_view(self.view, refresh, self.lang)
+        await i.response.edit_message(embed=embed, view=view)
+
+
+class AbyssBoardRefreshButton(ui.Button):
+    def __init__(self, toggle: bool, current: bool, lang: discord.Locale | str):
+        super().__init__(
+            style=discord.ButtonStyle.blurple
+            if toggle == current
+            else discord.ButtonStyle.grey,
+            label=text_map.get(99 if toggle else 100, lang),
+        )
+        self.toggle = toggle
+        self.lang = lang
+        self.view: View
+
+    async def callback(self, i: Inter) -> Any:
+        await i.client.db.settings.update(
+            i.user.id, Settings.ABYSS_BOARD_REFRESH, self.toggle
+        )
+
+        embed = get_abyss_board_refresh_embed(i.user.display_avatar.url, self.lang)
+        view = get_abyss_board_refresh_view(self.view, self.toggle, self.lang)
+        await i.response.edit_message(embed=embed, view=view)
+
+
 async def return_settings(i: Inter, edit: bool = False):
     lang = await i.client.db.settings.get(i.user.id, Settings.LANG)
     lang = lang or i.locale
@@ -254,3 +293,21 @@ def get_redeem_view(view: View, auto_redeem: bool, lang: str | discord.Locale):
     view.add_item(RedeemButton(False, auto_redeem, lang))
 
     return view
+
+
+def get_abyss_board_refresh_embed(icon_url: str, lang: discord.Locale | str):
+    embed = DefaultEmbed(description=text_map.get(816, lang))
+    embed.set_author(name=text_map.get(815, lang), icon_url=icon_url)
+
+    return embed
+
+
+def get_abyss_board_refresh_view(
+    view: View, refresh: bool, lang: str | discord.Locale
+):
+    view.clear_items()
+    view.add_item(GoBackButton(view.original_info))
+    view.add_item(AbyssBoardRefreshButton(True, refresh, lang))
+    view.add_item(AbyssBoardRefreshButton(False, refresh, lang))
+
+    return view
@@ -82,7 +82,7 @@ class CharacterSelect(BaseSelect):
 
         dark_mode = await i.client.db.settings.get(i.user.id, Settings.DARK_MODE)
         draw_input = DrawInput(
-            i.client.loop, i.client.session, self.view.lang, dark_mode
+            i.client.loop, i.client.sessions.assets, self.view.lang, dark_mode
         )
         bytes_obj = await draw_hsr_profile_card_v1(draw_input, character)
 
@@ -257,7 +257,7 @@ async def return_todo(i: models.Inter):
         )
     else:
         dark_mode = await i.client.db.settings.get(i.user.id, Settings.DARK_MODE)
-        client = AmbrTopAPI(i.client.session, to_ambr_top(lang))
+        client = AmbrTopAPI(i.client.sessions.ambr, to_ambr_top(lang))
 
         for item in todo_items:
             if item.name.isdigit():
@@ -283,7 +283,7 @@ async def return_todo(i: models.Inter):
         fp = await main_funcs.draw_material_card(
             models.DrawInput(
                 loop=i.client.loop,
-                session=i.client.session,
+                session=i.client.sessions.assets,
                 lang=lang,
                 dark_mode=dark_mode,
             ),
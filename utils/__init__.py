@@ -1,5 +1,6 @@
 from .draw import *
 from .fetch_card import *
+from .fetcher import *
 from .general import *
 from .genshin import *
 from .genshin_data import *
@@ -6,13 +6,13 @@ import aiofiles
 import aiohttp
 import discord
 import enkanetwork as enka
-import yaml
 from fontTools.ttLib import TTFont
 from PIL import Image, ImageDraw, ImageFont
 
 import dev.asset as asset
 from apps.text_map import text_map
 from data.draw.fonts import FONTS
+from data.loader import LazyData
 from dev.exceptions import ImageDownloadError
 from dev.models import DefaultEmbed, DynamicBackgroundInput
 
@@ -338,8 +338,7 @@ def mask_image_with_color(image: Image.Image, color, recur: int = 0) -> Image.Im
     return Image.composite(color_bk, image, image)
 
 
-with open("yelan/star_rail/profile/1/data.yaml") as data_file:
-    hsr_card_data = yaml.safe_load(data_file)
+hsr_card_data = LazyData("yelan/star_rail/profile/1/data.yaml")
 
 
 def get_hsr_card_data(id: str) -> typing.Optional[typing.Dict[str, typing.Any]]:
@@ -1,7 +1,10 @@
+import asyncio
 from typing import Any, Dict, List
 
 import aiohttp
 
+from .fetcher import JSONFetcher
+
 BASE_URL = "https://genshin-db-api.vercel.app/api/{folder}?query=names&matchCategories=true&verboseCategories=true"
 
 FOLDERS = [
@@ -19,22 +22,22 @@ LANGUAGE_URL = "https://genshin-db-api.vercel.app/api/languages"
 async def fetch_cards(
     session: aiohttp.ClientSession,
 ) -> Dict[str, List[Dict[str, Any]]]:
-    result: Dict[str, List[Dict[str, Any]]] = {}
-
-    async with session.get(LANGUAGE_URL) as resp:
-        languages = await resp.json()
-
-    for lang in languages:
-        if lang not in result:
-            result[lang] = []
-
-        for folder in FOLDERS:
-            async with session.get(
-                BASE_URL.format(folder=folder) + f"&resultLanguage={lang}"
-            ) as resp:
-                cards: List[Dict[str, Any]] = await resp.json()
-                for card in cards:
-                    card["cardType"] = folder
-                    result[lang].append(card)
-
+    fetcher = JSONFetcher(session)
+    languages: List[str] = await fetcher.get(LANGUAGE_URL)
+
+    requests = [(lang, folder) for lang in languages for folder in FOLDERS]
+    responses: List[List[Dict[str, Any]]] = await asyncio.gather(
+        *(
+            fetcher.get(BASE_URL.format(folder=folder) + f"&resultLanguage={lang}")
+            for lang, folder in requests
+        )
+    )
+
+    result: Dict[str, List[Dict[str, Any]]] = {lang: [] for lang in languages}
+    for (lang, folder), cards in zip(requests, responses):
+        for card in cards:
+            card["cardType"] = folder
+            result[lang].append(card)
+
+    fetcher.report("Fetch Cards")
     return result
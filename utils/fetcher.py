@@ -0,0 +1,51 @@
+import asyncio
+import time
+from typing import Any
+
+import aiohttp
+
+from .general import log
+
+
+class JSONFetcher:
+    """Fetch JSON from many URLs through one session with a shared concurrency limit
+
+    Failed requests are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        max_concurrency: int = 8,
+        retries: int = 3,
+        backoff: float = 2.0,
+    ) -> None:
+        self.session = session
+        self.retries = retries
+        self.backoff = backoff
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self.requests = 0
+        self.retried = 0
+        self._start = time.perf_counter()
+
+    async def get(self, url: str) -> Any:
+        for attempt in range(self.retries + 1):
+            try:
+                async with self._semaphore:
+                    self.requests += 1
+                    async with self.session.get(url) as r:
+                        r.raise_for_status()
+                        return await r.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.retries:
+                    raise
+                self.retried += 1
+                log.warning(f"[JSONFetcher] Retrying {url}: {e}")
+                await asyncio.sleep(self.backoff * 2**attempt)
+
+    def report(self, name: str) -> None:
+        elapsed = time.perf_counter() - self._start
+        log.info(
+            f"[{name}] {self.requests} requests, {self.retried} retries in {elapsed:.1f}s"
+        )
@@ -1,11 +1,19 @@
+import asyncio
 import json
 import logging
 import re
-import zipfile
 from datetime import datetime
-from io import BytesIO
 from itertools import islice
-from typing import Any, Dict, Generator, List, TypeVar, Union
+from typing import (
+    Any,
+    Awaitable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    TypeVar,
+    Union,
+)
 
 import aiohttp
 import discord
@@ -139,35 +147,6 @@ async def dm_embed(
         return True
 
 
-def convert_dict_to_zipped_json(data_dict: Dict[str, str]) -> BytesIO:
-    """
-    Description:
-        This function takes a dictionary and returns a BytesIO object containing a zip file that contains a JSON file.
-        The JSON file contains the dictionary converted to a JSON string.
-
-    Arguments:
-        data_dict: A dictionary of strings to strings
-
-    Returns:
-        A BytesIO object containing a zip file that contains a JSON file.
-    """
-    # Convert dictionary to JSON string
-    json_str: str = json.dumps(data_dict)
-
-    # Create a BytesIO object to hold the zip file
-    zip_buffer: BytesIO = BytesIO()
-
-    # Create a zip archive containing the JSON file
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-        zip_file.writestr("data.json", json_str)
-
-    # Reset the buffer pointer to the beginning of the buffer
-    zip_buffer.seek(0)
-
-    # Return the BytesIO object containing the zipped file
-    return zip_buffer
-
-
 async def get_dc_user(bot: discord.Client, user_id: int) -> discord.User:
     """Get a discord user from their id. If the user is not cached, fetch them from the discord API"""
     return bot.get_user(user_id) or await bot.fetch_user(user_id)
@@ -205,3 +184,69 @@ def open_json(path: str) -> Dict[str, Any]:
 def write_json(path: str, data: Dict[str, Any]) -> None:
     with open(path, "w", encoding="utf-8") as f:  # skipcq: PTC-W6004
         json.dump(data, f)
+
+
+async def fan_out(
+    calls: Dict[str, Awaitable[Any]],
+    *,
+    timeout: float = 30.0,
+    optional: Iterable[str] = (),
+) -> Dict[str, Any]:
+    """Run independent calls concurrently under one shared timeout
+
+    Args:
+        calls (Dict[str, Awaitable[Any]]): Name to the call to run
+        timeout (float): Seconds to wait for all the calls
+        optional (Iterable[str]): Names of the calls whose failure is tolerated, their result is None
+
+    Raises:
+        Exception: The exception of the first required call that failed, the other calls are cancelled
+        asyncio.TimeoutError: If a required call did not finish within the timeout
+
+    Returns:
+        Dict[str, Any]: Name to the result of the call
+    """
+    optional = set(optional)
+    tasks = {name: asyncio.ensure_future(call) for name, call in calls.items()}
+    names = {task: name for name, task in tasks.items()}
+    results: Dict[str, Any] = {}
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    pending = set(tasks.values())
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=max(0, deadline - loop.time()),
+                return_when=asyncio.FIRST_EXCEPTION,
+            )
+            if not done:
+                break
+            for task in done:
+                name = names[task]
+                if task.cancelled():
+                    exception: BaseException = asyncio.CancelledError(
+                        f"{name} was cancelled"
+                    )
+                else:
+                    exception = task.exception()
+                if exception is None:
+                    results[name] = task.result()
+                elif name in optional:
+                    log.warning(f"[Fan Out] {name} failed: {exception}")
+                    results[name] = None
+                else:
+                    raise exception
+
+        for task in pending:
+            name = names[task]
+            if name not in optional:
+                raise asyncio.TimeoutError(f"{name} timed out")
+            log.warning(f"[Fan Out] {name} timed out")
+            results[name] = None
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+    return results
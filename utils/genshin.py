@@ -1,3 +1,4 @@
+import asyncio
 import json
 from calendar import monthrange
 from datetime import datetime, timedelta
@@ -5,7 +6,6 @@ from typing import Any, Dict, List, Optional
 
 import aiofiles
 import aiohttp
-import asyncpg
 import discord
 import genshin
 import yaml
@@ -17,18 +17,19 @@ import dev.enum as enum
 import dev.models as models
 from ambr import AmbrTopAPI, Character, Domain, Material, Weapon
 from ambr.models import CharacterDetail
-from apps.db.json import read_json, write_json
 from apps.db.tables.hoyo_account import HoyoAccount
+from apps.db.tables.talents import TalentTable
 from apps.enka.api_docs import get_character_skill_order
 from apps.text_map import cond_text, text_map, to_ambr_top
 from data.game.fight_prop import fight_prop
+from data.loader import LazyData
 
-from .general import get_dt_now, open_json
+from .general import get_dt_now
 from .text_map import get_city_name, translate_main_stat
 
-character_map = open_json("data/game/character_map.json")
-artifact_map = open_json("data/game/artifact_map.json")
-weapon_map = open_json("data/game/weapon_map.json")
+character_map = LazyData("data/game/character_map.json")
+artifact_map = LazyData("data/game/artifact_map.json")
+weapon_map = LazyData("data/game/weapon_map.json")
 
 
 def get_character_builds(
@@ -397,38 +398,69 @@ async def calc_e_q_boost(
     return enum.TalentBoost.BOOST_Q
 
 
-async def update_talents_json(
+async def update_talents(
     characters: List[genshin.models.Character],
     client: genshin.Client,
-    pool: asyncpg.Pool,
+    talent_db: TalentTable,
     uid: int,
     session: aiohttp.ClientSession,
-):
-    talents_: Dict[str, str] = {}
-    boost_dict = await read_json(pool, "genshin/talent_boost.json")
-    if boost_dict is None:
-        boost_dict = {}
+    max_concurrency: int = 4,
+) -> None:
+    """Sync the talent levels of a user's characters
+
+    Character details and the talent boosts that are not known yet are fetched with at
+    most ``max_concurrency`` requests at a time, and the results are written once at
+    the end.
+    """
     try:
         await client._enable_calculator_sync()  # skipcq: PYL-W0212
     except genshin.GenshinException:
         pass
 
-    for character in characters:
-        try:
-            details = await client.get_character_details(character.id)
-        except genshin.GenshinException:
-            break
-        character_id = str(character.id)
-        if character.id in asset.traveler_ids:
-            character_id = f"{character.id}-{character.element.lower()}"
-
-        if boost_dict is None or character_id not in boost_dict:
-            boost = await calc_e_q_boost(session, character_id)
-            if boost_dict is None:
-                boost_dict = {}
-            boost_dict[str(character_id)] = boost.value
-            await write_json(pool, "genshin/talent_boost.json", boost_dict)
-        boost = enum.TalentBoost(boost_dict[character_id])
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def get_boost(character_id: str) -> enum.TalentBoost:
+        async with semaphore:
+            return await calc_e_q_boost(session, character_id)
+
+    boosts = await talent_db.get_boosts()
+    missing = {
+        get_talent_boost_id(c)
+        for c in characters
+        if get_talent_boost_id(c) not in boosts
+    }
+    if missing:
+        missing_ids = list(missing)
+        results = await asyncio.gather(*(get_boost(c) for c in missing_ids))
+        new_boosts = {
+            character_id: boost.value
+            for character_id, boost in zip(missing_ids, results)
+        }
+        await talent_db.add_boosts(new_boosts)
+        boosts.update(new_boosts)
+
+    stopped = asyncio.Event()
+
+    async def get_details(
+        character: genshin.models.Character,
+    ) -> Optional[genshin.models.CalculatorCharacterDetails]:
+        async with semaphore:
+            # stop calling once the calculator refuses, like when it isn't enabled
+            if stopped.is_set():
+                return None
+            try:
+                return await client.get_character_details(character.id)
+            except genshin.GenshinException:
+                stopped.set()
+                return None
+
+    details_list = await asyncio.gather(*(get_details(c) for c in characters))
+
+    talents_: Dict[str, str] = {}
+    for character, details in zip(characters, details_list):
+        if details is None:
+            continue
+        boost = enum.TalentBoost(boosts[get_talent_boost_id(character)])
 
         skill_order = await get_character_skill_order(str(character.id))
         a_skill = details.talents[0]
@@ -455,8 +487,14 @@ async def update_talents_json(
                 q_skill += 3
             talents_[str(character.id)] = f"{a_skill}/{e_skill}/{q_skill}"
 
-    talents_["last_updated"] = get_dt_now().strftime("%Y-%m-%d %H:%M:%S")
-    await write_json(pool, f"talents/{uid}.json", talents_)
+    await talent_db.update(uid, talents_, get_dt_now())
+
+
+def get_talent_boost_id(character: genshin.models.Character) -> str:
+    """Travelers have a talent boost per element"""
+    if character.id in asset.traveler_ids:
+        return f"{character.id}-{character.element.lower()}"
+    return str(character.id)
 
 
 CHECKIN_URLS = {
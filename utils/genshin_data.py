@@ -1,8 +1,7 @@
-from typing import Dict
-
+from apps.genshin_data.text_maps import GDTextMap
 from apps.text_map import ENKA_LANGS
 
 
-def get_text(text_map: Dict[str, Dict[str, str]], lang: str, text_id: int) -> str:
+def get_text(text_map: GDTextMap, lang: str, text_id: int) -> str:
     genshin_db_lang = ENKA_LANGS.get(lang, "en").upper()
-    return text_map[genshin_db_lang].get(str(text_id), "Unknown")
+    return text_map.get(text_id, genshin_db_lang) or "Unknown"
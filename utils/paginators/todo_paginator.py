@@ -29,7 +29,7 @@ class TodoPaginatorView(GeneralPaginatorView):
         fp = await main_funcs.draw_material_card(
             DrawInput(
                 loop=i.client.loop,
-                session=i.client.session,
+                session=i.client.sessions.assets,
                 lang=self.lang,
                 dark_mode=self.dark_mode,
             ),
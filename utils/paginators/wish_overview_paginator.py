@@ -49,7 +49,7 @@ class WishOverviewPaginatorView(GeneralPaginatorView):
         fp = await main_funcs.draw_wish_overview_card(
             DrawInput(
                 loop=i.client.loop,
-                session=i.client.session,
+                session=i.client.sessions.assets,
                 lang=self.lang,
                 dark_mode=await i.client.db.settings.get(i.user.id, Settings.DARK_MODE),
             ),
@@ -63,7 +63,7 @@ class WishOverviewPaginatorView(GeneralPaginatorView):
         fp = await main_funcs.draw_wish_recents_card(
             DrawInput(
                 loop=i.client.loop,
-                session=i.client.session,
+                session=i.client.sessions.assets,
                 lang=self.lang,
                 dark_mode=await i.client.db.settings.get(i.user.id, Settings.DARK_MODE),
             ),
@@ -1,6 +1,6 @@
-from utils.general import open_json
+from data.loader import LazyData
 
-emoji_map = open_json("data/star_rail/emoji_map.json")
+emoji_map = LazyData("data/star_rail/emoji_map.json")
 
 
 def get_character_emoji(character_id: str) -> str: